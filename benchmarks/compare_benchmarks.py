@@ -0,0 +1,72 @@
+"""
+Compare two benchmark result files and fail on regressions.
+
+Benchmarks are matched by name. A benchmark regresses when the chosen
+statistic (the median by default) is slower than the baseline by more than
+``--threshold`` percent. The exit status is 1 if anything regressed, so the
+check can gate a release::
+
+    python benchmarks/compare_benchmarks.py baseline.json current.json --threshold 15
+
+Benchmarks present in only one of the files are listed but never fail the
+comparison.
+"""
+import argparse
+import json
+import sys
+
+STATS = ('min', 'median', 'mean', 'max')
+
+
+def load(path, stat):
+    with open(path) as f:
+        result = json.load(f)
+    return {benchmark['fullname']: benchmark['stats'][stat] for benchmark in result['benchmarks']}
+
+
+def compare(baseline, current, threshold):
+    """``(name, baseline, current, percent change, regressed)`` for every shared benchmark"""
+    rows = []
+    for name in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[name], current[name]
+        change = (after - before) / before * 100 if before else 0.0
+        rows.append((name, before, after, change, change > threshold))
+    return rows
+
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Allowed slowdown in percent (default: 10)')
+    parser.add_argument('--stat', choices=STATS, default='median', help='Statistic to compare (default: median)')
+    args = parser.parse_args(argv)
+
+    baseline = load(args.baseline, args.stat)
+    current = load(args.current, args.stat)
+    rows = compare(baseline, current, args.threshold)
+
+    width = max([len(row[0]) for row in rows] + [9])
+    print(f"{'Benchmark':<{width}}  {'Baseline':>10}  {'Current':>10}  {'Change':>8}")
+    for name, before, after, change, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f'{name:<{width}}  {format_time(before):>10}  {format_time(after):>10}  {change:>+7.1f}%{flag}')
+
+    for label, names in (('New', current.keys() - baseline.keys()), ('Missing', baseline.keys() - current.keys())):
+        for name in sorted(names):
+            print(f'{label}: {name}')
+
+    regressions = [row for row in rows if row[4]]
+    print(f'\n{len(regressions)} of {len(rows)} benchmarks slower than the baseline by more than {args.threshold:g}%')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Run the pytest-benchmark suite and write one JSON file of results.
+
+The suite is two pytest sessions, because the econ_software and
+econ_analysis projects both have an app called ``calculator`` and cannot
+share a process. The JSON written by each session is merged into one
+file, which ``compare_benchmarks.py`` checks against a baseline::
+
+    python benchmarks/run_suite.py --output benchmarks/results/baseline.json
+    python benchmarks/run_suite.py --output benchmarks/results/current.json
+    python benchmarks/compare_benchmarks.py benchmarks/results/baseline.json benchmarks/results/current.json
+
+Arguments after ``--`` are passed to both pytest sessions, e.g.
+``-- -k calculate --benchmark-min-rounds=10``.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUITE = os.path.join(ROOT, 'benchmarks', 'suite')
+SESSIONS = ('econ_software', 'econ_analysis')
+
+
+def run_session(session, pytest_args):
+    """Run one session; its pytest exit code and benchmark JSON (``None`` if none was written)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f'{session}.json')
+        command = [
+            sys.executable, '-m', 'pytest', '-p', 'no:cacheprovider',
+            f'--benchmark-json={path}', *pytest_args,
+        ]
+        returncode = subprocess.call(command, cwd=os.path.join(SUITE, session))
+        if not os.path.exists(path):
+            return returncode, None
+        with open(path) as f:
+            return returncode, json.load(f)
+
+
+def merge(results):
+    """One result document holding the benchmarks of every session"""
+    merged = None
+    for session, result in results:
+        if result is None:
+            continue
+        if merged is None:
+            merged = {key: value for key, value in result.items() if key != 'benchmarks'}
+            merged['benchmarks'] = []
+        for benchmark in result['benchmarks']:
+            benchmark['fullname'] = f"{session}/{benchmark['fullname']}"
+            merged['benchmarks'].append(benchmark)
+    return merged
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    pytest_args = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, pytest_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--output',
+        default=os.path.join(ROOT, 'benchmarks', 'results', time.strftime('%Y%m%d-%H%M%S') + '.json'),
+        help='Results file (default: benchmarks/results/<timestamp>.json)',
+    )
+    parser.add_argument('--session', choices=SESSIONS, action='append', help='Run only these sessions')
+    args = parser.parse_args(argv)
+
+    results = []
+    failed = False
+    for session in args.session or SESSIONS:
+        returncode, result = run_session(session, pytest_args)
+        failed = failed or returncode != 0
+        results.append((session, result))
+
+    merged = merge(results)
+    if merged is None:
+        print('No benchmarks were run', file=sys.stderr)
+        return 1
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(merged, f, indent=2)
+    print(f"{len(merged['benchmarks'])} benchmarks written to {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
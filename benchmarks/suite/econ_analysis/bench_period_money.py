@@ -0,0 +1,191 @@
+"""
+The fixed-point period generators against the Decimal formulas they replaced.
+
+Paired cases run the same synthetic analyses (unsaved, so no database is
+needed) through the previous Decimal periods and the fixed-point ones with
+the detail view's totals and display conversion. The factor and age caches
+are cleared before every round so each pays for building them, and the
+fixed-point case checks every value and total to the cent and every age to
+the float against the Decimal one.
+"""
+import random
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from dateutil.relativedelta import relativedelta
+from calculator import money, periods
+from calculator.models import EconomicAnalysis
+
+ANALYSES = 500
+ROUNDS = 5
+CENT = Decimal('0.01')
+
+
+def legacy_periods(start_date, end_date):
+    """The period loop and portion logic the Decimal methods used"""
+    current_date = start_date
+    while current_date <= end_date:
+        year = current_date.year
+        if year == start_date.year:
+            portion = ((date(year, 12, 31) - start_date).days + 1) / 365.25
+        elif year == end_date.year:
+            portion = ((end_date - date(year, 1, 1)).days + 1) / 365.25
+        else:
+            portion = 1.0
+        yield year, current_date, portion
+        current_date = date(year + 1, 1, 1)
+
+
+def legacy_age(date_of_birth, target_date):
+    age = relativedelta(target_date, date_of_birth)
+    return age.years + (age.days / 365.25)
+
+
+def decimal_exhibits(analysis):
+    """
+    The previous Decimal periods and detail-view totals for all three exhibits.
+
+    The float portions go through ``Decimal(str(portion))`` as the health
+    insurance periods already did; multiplying them into a ``Decimal``
+    directly raised ``TypeError``.
+    """
+    start = analysis.date_of_injury
+    pre = []
+    ages = []
+    pre_total = Decimal('0.0')
+    for year, current_date, portion in legacy_periods(start, analysis.date_of_report):
+        wage_base = analysis.pre_base_earnings * (1 + analysis.pre_growth_rate / 100) ** (year - start.year)
+        gross = Decimal(str(portion)) * wage_base
+        adjusted = gross * (analysis.pre_aif / Decimal('100.0'))
+        pre_total += adjusted
+        ages.append(legacy_age(analysis.date_of_birth, current_date))
+        pre.append((wage_base, gross, adjusted))
+
+    start = analysis.date_of_report
+    post = []
+    post_total = post_present_total = Decimal('0.0')
+    hi = []
+    hi_future_total = hi_present_total = Decimal('0.0')
+    for year, current_date, portion in legacy_periods(start, analysis.worklife_end_date):
+        index = year - start.year
+        portion = Decimal(str(portion))
+        wage_base = analysis.post_base_earnings * (1 + analysis.post_growth_rate / 100) ** index
+        gross = portion * wage_base
+        adjusted = gross * (analysis.post_aif / Decimal('100.0'))
+        present_value = wage_base * portion * (1 + analysis.post_discount_rate / 100) ** -index
+        post_total += adjusted
+        post_present_total += present_value
+        ages.append(legacy_age(analysis.date_of_birth, current_date))
+        post.append((wage_base, gross, adjusted, present_value))
+
+        premium = analysis.hi_base_premium * (1 + analysis.hi_growth_rate / 100) ** index
+        yearly_value = premium * portion
+        hi_present = yearly_value * (Decimal('1.0') / ((1 + analysis.hi_discount_rate / 100) ** index))
+        hi_future_total += yearly_value
+        hi_present_total += hi_present
+        hi.append((premium, yearly_value, hi_present))
+
+    totals = (pre_total, post_total, post_present_total, hi_future_total, hi_present_total)
+    return pre, post, hi, totals, ages
+
+
+def fixed_point_exhibits(analysis):
+    """The lazy fixed-point periods with the detail view's totals and display conversion"""
+    pre_total = post_total = post_present_total = hi_future_total = hi_present_total = 0
+
+    pre = []
+    ages = []
+    for p in analysis.get_pre_injury_periods():
+        pre_total += p.adjusted_earnings
+        ages.append(p.age)
+        pre.append((p.wage_base, p.gross_earnings, p.adjusted_earnings))
+    post = []
+    hi = []
+    for p, h in zip(analysis.get_post_injury_periods(), analysis.get_health_insurance_periods()):
+        post_total += p.adjusted_earnings
+        post_present_total += p.present_value
+        ages.append(p.age)
+        post.append((p.wage_base, p.gross_earnings, p.adjusted_earnings, p.present_value))
+        hi_future_total += h.yearly_value
+        hi_present_total += h.present_value
+        hi.append((h.premium, h.yearly_value, h.present_value))
+
+    totals = (pre_total, post_total, post_present_total, hi_future_total, hi_present_total)
+    pre, post, hi = ([tuple(map(money.to_decimal, row)) for row in rows] for rows in (pre, post, hi))
+    return pre, post, hi, tuple(map(money.to_decimal, totals)), ages
+
+
+EXHIBITS = {'decimal': decimal_exhibits, 'fixed-point': fixed_point_exhibits}
+
+
+def build_analyses(count, seed=0):
+    rng = random.Random(seed)
+
+    def percent():
+        return Decimal(rng.randint(0, 100000)).scaleb(-4)
+
+    def dollars(low, high):
+        return Decimal(rng.randint(low * 100, high * 100)).scaleb(-2)
+
+    analyses = []
+    for _ in range(count):
+        injury = date(rng.randint(2015, 2022), rng.randint(1, 12), rng.randint(1, 28))
+        report = date(injury.year + rng.randint(0, 4), rng.randint(1, 12), rng.randint(1, 28))
+        analyses.append(EconomicAnalysis(
+            date_of_birth=date.fromordinal(rng.randint(date(1950, 1, 1).toordinal(), date(1995, 12, 31).toordinal())),
+            date_of_injury=injury,
+            date_of_report=max(report, injury),
+            worklife_end_date=date(report.year + rng.randint(5, 45), rng.randint(1, 12), rng.randint(1, 28)),
+            pre_growth_rate=percent(),
+            pre_aif=percent(),
+            pre_base_earnings=dollars(20000, 200000),
+            post_growth_rate=percent(),
+            post_aif=percent(),
+            post_base_earnings=dollars(0, 100000),
+            post_discount_rate=percent(),
+            include_health_insurance=True,
+            hi_base_premium=dollars(2000, 20000),
+            hi_growth_rate=percent(),
+            hi_discount_rate=percent(),
+        ))
+    return analyses
+
+
+def clear_caches():
+    money.growth_factors.cache_clear()
+    money.discount_factors.cache_clear()
+    periods._age_parts.cache_clear()
+
+
+def assert_same_cents(expected, actual):
+    for expected_analysis, actual_analysis in zip(expected, actual, strict=True):
+        *expected_exhibits, expected_totals, expected_ages = expected_analysis
+        *actual_exhibits, actual_totals, actual_ages = actual_analysis
+        for expected_rows, actual_rows in zip(expected_exhibits, actual_exhibits, strict=True):
+            for expected_row, actual_row in zip(expected_rows, actual_rows, strict=True):
+                assert [v.quantize(CENT) for v in expected_row] == [v.quantize(CENT) for v in actual_row]
+        assert [v.quantize(CENT) for v in expected_totals] == [v.quantize(CENT) for v in actual_totals]
+        assert actual_ages == pytest.approx(expected_ages, abs=1e-9)
+
+
+@pytest.fixture(scope='module')
+def analyses():
+    return build_analyses(ANALYSES)
+
+
+@pytest.mark.parametrize('variant', list(EXHIBITS))
+def test_period_money(benchmark, analyses, variant):
+    exhibits = EXHIBITS[variant]
+
+    def setup():
+        clear_caches()
+        return (), {}
+
+    results = benchmark.pedantic(
+        lambda: [exhibits(analysis) for analysis in analyses], setup=setup, rounds=ROUNDS
+    )
+    benchmark.extra_info['periods'] = sum(len(exhibit) for result in results for exhibit in result[:3])
+
+    if variant == 'fixed-point':
+        assert_same_cents([decimal_exhibits(analysis) for analysis in analyses], results)
@@ -0,0 +1,59 @@
+"""
+The fixed-point period generators and the exhibit pass over them.
+
+Analyses are unsaved, so no database is needed. Analyses of one horizon
+repeat the same rates, so later rounds hit the ``money`` factor caches
+the way a busy server does.
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from calculator.models import EconomicAnalysis
+from calculator.views import AnalysisDetailView
+
+HORIZONS = (5, 20, 40, 60)
+
+
+def make_analysis(horizon):
+    return EconomicAnalysis(
+        date_of_birth=date(1985, 3, 15),
+        date_of_injury=date(2021, 7, 1),
+        date_of_report=date(2023, 12, 1),
+        worklife_end_date=date(2023 + horizon, 6, 30),
+        pre_growth_rate=Decimal('4.00'),
+        pre_aif=Decimal('75.40'),
+        pre_base_earnings=Decimal('50000.00'),
+        post_growth_rate=Decimal('4.20'),
+        post_aif=Decimal('75.00'),
+        post_base_earnings=Decimal('30000.00'),
+        post_discount_rate=Decimal('3.00'),
+        include_health_insurance=True,
+        hi_base_premium=Decimal('7001.05'),
+        hi_growth_rate=Decimal('7.00'),
+        hi_discount_rate=Decimal('3.00'),
+    )
+
+
+@pytest.fixture(params=HORIZONS, ids=lambda horizon: f'{horizon}y')
+def analysis(request):
+    return make_analysis(request.param)
+
+
+def consume_periods(analysis):
+    return (
+        len(list(analysis.get_pre_injury_periods())),
+        len(list(analysis.get_post_injury_periods())),
+        len(list(analysis.get_health_insurance_periods())),
+    )
+
+
+def test_period_generators(benchmark, analysis):
+    pre, post, hi = benchmark(consume_periods, analysis)
+    assert pre == 3
+    assert post == hi == analysis.worklife_end_date.year - 2023 + 1
+
+
+def test_exhibits_context(benchmark, analysis):
+    exhibits = benchmark(AnalysisDetailView().get_exhibits_context, analysis)
+    assert exhibits
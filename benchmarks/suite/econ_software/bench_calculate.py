@@ -0,0 +1,64 @@
+from django.urls import reverse
+from rest_framework.test import APIClient
+from calculator.aef import evaluate_aef_batch
+from calculator.models import CalculationResult
+
+ROUNDS = 20
+
+
+def test_calculate(benchmark, analysis):
+    client = APIClient()
+    url = reverse('analysis-calculate', kwargs={'pk': analysis.id})
+
+    def setup():
+        # Drop the stored result so every round recalculates
+        CalculationResult.objects.all().delete()
+        return (url,), {}
+
+    response = benchmark.pedantic(client.get, setup=setup, rounds=ROUNDS)
+    assert response.status_code == 200
+
+
+def test_calculate_cached(benchmark, analysis):
+    client = APIClient()
+    url = reverse('analysis-calculate', kwargs={'pk': analysis.id})
+    client.get(url)
+    response = benchmark(client.get, url)
+    assert response.status_code == 200
+
+
+def test_sensitivity(benchmark, analysis):
+    response = benchmark(
+        APIClient().get,
+        reverse('analysis-sensitivity', kwargs={'pk': analysis.id}),
+        {'discount_rates': '0.01,0.02,0.03,0.04,0.05', 'growth_rates': '0.02,0.03,0.04'},
+    )
+    assert response.status_code == 200
+
+
+def test_discount_conventions(benchmark, analysis):
+    response = benchmark(APIClient().get, reverse('analysis-discount-conventions', kwargs={'pk': analysis.id}))
+    assert response.status_code == 200
+
+
+def test_simulate(benchmark, analysis):
+    response = benchmark(
+        APIClient().post,
+        reverse('analysis-simulate', kwargs={'pk': analysis.id}),
+        {
+            'draws': 10000,
+            'seed': 1,
+            'distributions': {
+                'growth_rate': {'distribution': 'normal', 'mean': 0.03, 'std': 0.005},
+                'discount_rate': {'distribution': 'uniform', 'low': 0.02, 'high': 0.05},
+            },
+        },
+        format='json',
+    )
+    assert response.status_code == 200
+
+
+def test_aef_batch(benchmark):
+    vectors = [{'income_tax_rate': 10 + i % 20, 'personal_consumption': 20 + i % 15} for i in range(10000)]
+    results = benchmark(evaluate_aef_batch, vectors)
+    assert len(results) == len(vectors)
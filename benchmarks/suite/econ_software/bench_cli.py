@@ -0,0 +1,37 @@
+import io
+
+from cases import cli_record
+from economic_analysis import (
+    compute_exhibits,
+    parse_case,
+    render_health_insurance_table,
+    render_pre_post_table,
+    run_batch,
+)
+
+BATCH_CASES = 200
+
+
+def test_compute_exhibits(benchmark, horizon):
+    case = parse_case(cli_record(horizon))
+    exhibits = benchmark(compute_exhibits, case)
+    assert len(exhibits.post_injury.rows) == horizon
+    assert len(exhibits.health_insurance.rows) == horizon + 1
+
+
+def test_render_tables(benchmark, horizon):
+    case = parse_case(cli_record(horizon))
+    exhibits = compute_exhibits(case)
+
+    def render():
+        render_pre_post_table(1, exhibits.pre_injury, case['pre_growth_rate'], 'Pre-Injury')
+        render_pre_post_table(2, exhibits.post_injury, case['post_growth_rate'], 'Post-Injury')
+        render_health_insurance_table(exhibits.health_insurance, case['hi_growth_rate'])
+
+    benchmark(render)
+
+
+def test_run_batch(benchmark):
+    cases = [(str(i), cli_record(5 + i % 56)) for i in range(BATCH_CASES)]
+    counts = benchmark(lambda: run_batch(cases, io.StringIO(), 'jsonl'))
+    assert counts == {'cases': BATCH_CASES, 'failed': 0}
@@ -0,0 +1,124 @@
+"""
+The bulk workbook: the previous in-memory export against the write-only stream.
+
+Both variants export the same 500 analyses. Each case also renders once
+in a forked child and records that child's peak RSS growth and time to the
+first response byte in ``extra_info``; the streaming case checks that its
+workbook holds the same values as the in-memory one.
+"""
+import io
+import multiprocessing
+import resource
+import time
+
+import pytest
+from cases import create_analysis, create_evaluee
+from django.http import HttpResponse
+from openpyxl import Workbook, load_workbook
+from calculator.excel_export import (
+    EXHIBIT_HEADERS, PERSONAL_INFO_HEADERS, _personal_info, streaming_workbook_response, write_bulk_workbook,
+)
+from calculator.models import EconomicAnalysis
+from calculator.projection import project_analysis
+
+BULK_ANALYSES = 500
+BULK_HORIZON = 40
+ROUNDS = 3
+
+
+def legacy_export(analyses):
+    """The previous approach: a full in-memory Workbook saved into HttpResponse"""
+    workbook = Workbook()
+    ws_info = workbook.active
+    ws_info.title = "Personal Info"
+    ws_pre = workbook.create_sheet("Pre-Injury Earnings")
+    ws_post = workbook.create_sheet("Post-Injury Earnings")
+    ws_info.append(["Analysis"] + PERSONAL_INFO_HEADERS)
+    ws_pre.append(["Analysis"] + EXHIBIT_HEADERS)
+    ws_post.append(["Analysis"] + EXHIBIT_HEADERS)
+    for analysis in analyses:
+        ws_info.append([analysis.id] + _personal_info(analysis))
+        pre, post = project_analysis(analysis)
+        for row in pre.row_dicts():
+            ws_pre.append([analysis.id] + list(row.values()))
+        for row in post.row_dicts():
+            ws_post.append([analysis.id] + list(row.values()))
+    response = HttpResponse()
+    workbook.save(response)
+    return [response.content]
+
+
+def streaming_export(analyses):
+    response = streaming_workbook_response(
+        lambda fileobj: write_bulk_workbook(analyses, fileobj), 'analyses.xlsx'
+    )
+    return response.streaming_content
+
+
+EXPORTS = {'in-memory': legacy_export, 'streaming': streaming_export}
+
+
+def stored_analyses():
+    return (
+        EconomicAnalysis.objects.select_related('evaluee')
+        .prefetch_related('pre_injury_rows', 'post_injury_rows')
+        .order_by('pk')
+        .iterator(chunk_size=100)
+    )
+
+
+def export_bytes(export):
+    return b''.join(export(stored_analyses()))
+
+
+def measure_export(export, conn):
+    """Peak RSS growth and time to first byte of one export, sent over ``conn``"""
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    chunks = iter(export(stored_analyses()))
+    next(chunks)
+    first_byte = time.perf_counter() - start
+    for _ in chunks:
+        pass
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    conn.send({'peak_rss_growth_mb': (peak_kb - baseline_kb) / 1024, 'time_to_first_byte_s': first_byte})
+    conn.close()
+
+
+def measure_in_child(export):
+    # A forked child starts from this process' memory, so its RSS high-water
+    # mark is not inflated by whatever ran earlier in the session
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=measure_export, args=(export, sender))
+    process.start()
+    result = receiver.recv()
+    process.join()
+    assert process.exitcode == 0
+    return result
+
+
+def workbook_values(data):
+    workbook = load_workbook(io.BytesIO(data), read_only=True)
+    return {ws.title: list(ws.values) for ws in workbook.worksheets}
+
+
+@pytest.fixture
+def bulk_analyses(db):
+    evaluee = create_evaluee()
+    return [create_analysis(BULK_HORIZON, evaluee) for _ in range(BULK_ANALYSES)]
+
+
+@pytest.mark.parametrize('variant', list(EXPORTS))
+def test_export_excel_bulk(benchmark, bulk_analyses, variant):
+    export = EXPORTS[variant]
+    benchmark.extra_info.update(measure_in_child(export))
+    benchmark.extra_info['analyses'] = BULK_ANALYSES
+
+    data = benchmark.pedantic(export_bytes, args=(export,), rounds=ROUNDS, iterations=1)
+    benchmark.extra_info['bytes'] = len(data)
+
+    if variant == 'streaming':
+        values = workbook_values(data)
+        assert values == workbook_values(export_bytes(legacy_export))
+        assert len(values['Personal Info']) == BULK_ANALYSES + 1
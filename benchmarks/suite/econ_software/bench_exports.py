@@ -0,0 +1,30 @@
+from cases import create_analysis
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+BULK_ANALYSES = 10
+
+
+def fetch(client, method, url, *args, **kwargs):
+    """The response with its body read, streamed or not"""
+    response = getattr(client, method)(url, *args, **kwargs)
+    assert response.status_code == 200
+    if response.streaming:
+        return b''.join(response.streaming_content)
+    return response.content
+
+
+def test_export_excel(benchmark, analysis):
+    url = reverse('analysis-export-excel', kwargs={'pk': analysis.id})
+    assert benchmark(fetch, APIClient(), 'get', url)
+
+
+def test_export_word(benchmark, analysis):
+    url = reverse('analysis-export-word', kwargs={'pk': analysis.id})
+    assert benchmark(fetch, APIClient(), 'get', url)
+
+
+def test_bulk_export(benchmark, settings, analysis, horizon):
+    settings.BULK_EXPORT_PROCESSES = 0
+    ids = [analysis.id] + [create_analysis(horizon, analysis.evaluee).id for _ in range(BULK_ANALYSES - 1)]
+    assert benchmark(fetch, APIClient(), 'post', reverse('analysis-bulk-export'), {'ids': ids}, format='json')
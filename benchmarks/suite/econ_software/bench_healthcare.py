@@ -0,0 +1,19 @@
+from django.urls import reverse
+from rest_framework.test import APIClient
+from calculator.models import HealthcarePlan
+
+ROUNDS = 10
+
+
+def test_calculate_costs(benchmark, analysis_with_plans):
+    client = APIClient()
+    url = reverse('analysis-healthcare-plans-calculate-costs', kwargs={'analysis_pk': analysis_with_plans.id})
+
+    def setup():
+        # Clear the fingerprints so every plan's schedule is rebuilt
+        HealthcarePlan.objects.update(costs_fingerprint='')
+        return (url,), {}
+
+    response = benchmark.pedantic(client.post, setup=setup, rounds=ROUNDS)
+    assert response.status_code == 200
+    assert len(response.data['recalculated_plans']) == analysis_with_plans.healthcare_plans.count()
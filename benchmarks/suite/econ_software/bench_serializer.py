@@ -0,0 +1,14 @@
+from cases import analysis_data, create_evaluee
+from calculator.serializers import EconomicAnalysisSerializer
+
+
+def test_create_analysis(benchmark, db, horizon):
+    evaluee = create_evaluee()
+
+    def create():
+        serializer = EconomicAnalysisSerializer(data=analysis_data(horizon))
+        serializer.is_valid(raise_exception=True)
+        return serializer.save(evaluee=evaluee)
+
+    analysis = benchmark(create)
+    assert analysis.post_injury_rows.count() == horizon + 1
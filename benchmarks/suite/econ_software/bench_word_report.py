@@ -0,0 +1,80 @@
+"""
+The exhibit Word report: building from scratch against cloning the skeleton.
+
+The legacy variant creates a new ``Document`` per report and fills each
+exhibit cell through ``table.add_row().cells``; the template variant is the
+current ``write_analysis_document``. Both render in memory, and each case
+checks that its body text and tables match the other variant's.
+"""
+import io
+
+import pytest
+from docx import Document
+from calculator.excel_export import EXHIBIT_HEADERS
+from calculator.models import EconomicAnalysis
+from calculator.projection import project_analysis
+from calculator.reports import write_analysis_document
+
+
+def legacy_document(analysis, fileobj):
+    """The previous approach: a fresh Document with per-cell ``.text`` writes"""
+    doc = Document()
+    doc.add_heading('Economic Analysis Report', 0)
+    doc.add_heading('Personal Information', level=1)
+    doc.add_paragraph(f'Name: {analysis.evaluee.first_name} {analysis.evaluee.last_name}')
+    doc.add_paragraph(f'Date of Birth: {analysis.evaluee.date_of_birth}')
+    doc.add_paragraph(f'Date of Injury: {analysis.date_of_injury}')
+    doc.add_paragraph(f'Date of Report: {analysis.date_of_report}')
+
+    pre, post = project_analysis(analysis)
+    for title, exhibit in (('Pre-Injury Earnings', pre), ('Post-Injury Earnings', post)):
+        doc.add_heading(title, level=1)
+        table = doc.add_table(rows=1, cols=8)
+        table.style = 'Table Grid'
+        header_cells = table.rows[0].cells
+        for i, header in enumerate(EXHIBIT_HEADERS):
+            header_cells[i].text = header
+        for row in exhibit.row_dicts():
+            row_cells = table.add_row().cells
+            row_cells[0].text = str(row['year'])
+            row_cells[1].text = row['portion_of_year']
+            row_cells[2].text = f"{row['age']:.1f}"
+            row_cells[3].text = f"${row['wage_base_years']:,.2f}"
+            row_cells[4].text = f"${row['gross_earnings']:,.2f}"
+            row_cells[5].text = f"${row['adjusted_earnings']:,.2f}"
+            row_cells[6].text = f"${row['benefits_loss']:,.2f}"
+            row_cells[7].text = f"${row['insurance_loss']:,.2f}"
+
+    doc.save(fileobj)
+
+
+WRITERS = {'legacy': legacy_document, 'template': write_analysis_document}
+
+
+def render(writer, analysis):
+    fileobj = io.BytesIO()
+    writer(analysis, fileobj)
+    return fileobj.getvalue()
+
+
+def document_contents(data):
+    doc = Document(io.BytesIO(data))
+    paragraphs = [(p.style.name, p.text) for p in doc.paragraphs]
+    tables = [[[cell.text for cell in row.cells] for row in table.rows] for table in doc.tables]
+    return paragraphs, tables
+
+
+@pytest.mark.parametrize('variant', list(WRITERS))
+def test_word_report(benchmark, analysis, variant):
+    analysis = (
+        EconomicAnalysis.objects.select_related('evaluee')
+        .prefetch_related('pre_injury_rows', 'post_injury_rows')
+        .get(pk=analysis.pk)
+    )
+    # The first template render builds the skeleton; keep it out of the timings
+    other = render(WRITERS['template' if variant == 'legacy' else 'legacy'], analysis)
+    render(write_analysis_document, analysis)
+
+    data = benchmark(render, WRITERS[variant], analysis)
+    benchmark.extra_info['bytes'] = len(data)
+    assert document_contents(data) == document_contents(other)
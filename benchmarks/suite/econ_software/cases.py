@@ -0,0 +1,79 @@
+"""
+Synthetic cases for the benchmark suite.
+
+Every generator is deterministic, so a case of a given horizon or plan
+count does the same work on every run and results stay comparable.
+"""
+from datetime import date
+
+from calculator.models import Evaluee, HealthcareCategory, HealthcarePlan
+from calculator.serializers import EconomicAnalysisSerializer
+
+# Post-injury years, from a short claim to a full working life
+HORIZONS = (5, 20, 40, 60)
+PLAN_COUNTS = (1, 10, 100)
+
+CATEGORY_RATES = ((0.03, 1), (0.045, 0.5), (0.05, 2), (0.035, 1), (0.06, 5))
+
+
+def analysis_data(horizon):
+    return {
+        'date_of_injury': '2021-07-01',
+        'date_of_report': '2023-12-01',
+        'worklife_expectancy': horizon + 0.5,
+        'years_to_final_separation': horizon + 0.5,
+        'life_expectancy': horizon + 10.0,
+        'pre_injury_base_wage': 50000,
+        'post_injury_base_wage': 30000,
+        'growth_rate': 0.03,
+        'discount_rate': 0.02,
+    }
+
+
+def create_evaluee():
+    return Evaluee.objects.create(first_name='Bench', last_name='Case', date_of_birth=date(1985, 3, 15))
+
+
+def create_analysis(horizon, evaluee=None):
+    """An analysis with its earnings rows, created the way the API creates one"""
+    serializer = EconomicAnalysisSerializer(data=analysis_data(horizon))
+    serializer.is_valid(raise_exception=True)
+    return serializer.save(evaluee=evaluee or create_evaluee())
+
+
+def create_plans(analysis, count):
+    """``count`` active plans spread over categories with different growth and frequency"""
+    categories = [
+        HealthcareCategory.objects.create(name=f'Category {i}', growth_rate=rate, frequency_years=frequency)
+        for i, (rate, frequency) in enumerate(CATEGORY_RATES)
+    ]
+    return HealthcarePlan.objects.bulk_create([
+        HealthcarePlan(
+            analysis=analysis,
+            category=categories[i % len(categories)],
+            base_cost=500 + 25 * i,
+            is_active=True,
+        )
+        for i in range(count)
+    ])
+
+
+def cli_record(horizon):
+    """A batch record for ``economic_analysis.py`` with ``horizon`` post-injury rows"""
+    post_rows = [
+        [2023 + year, 1.0 if year else 0.0849, 38.7 + year, round(30000 * 1.042 ** year, 2)]
+        for year in range(horizon)
+    ]
+    post_rows[-1][1] = 0.5
+    return {
+        'pre_table_rows': [
+            [2021, 0.5041, 36.3, 50000.0],
+            [2022, 1.0, 37.3, 52000.0],
+            [2023, 0.9151, 38.3, 54080.0],
+        ],
+        'post_table_rows': post_rows,
+        'hi_start_year': 2024,
+        'hi_end_year': 2024 + horizon,
+        'worklife_expectancy': horizon + 0.5,
+        'years_to_final_separation': horizon + 0.5,
+    }
@@ -0,0 +1,23 @@
+import pytest
+from cases import HORIZONS, PLAN_COUNTS, create_analysis, create_plans
+
+
+@pytest.fixture(params=HORIZONS, ids=lambda horizon: f'{horizon}y')
+def horizon(request):
+    return request.param
+
+
+@pytest.fixture(params=PLAN_COUNTS, ids=lambda count: f'{count}plans')
+def plan_count(request):
+    return request.param
+
+
+@pytest.fixture
+def analysis(db, horizon):
+    return create_analysis(horizon)
+
+
+@pytest.fixture
+def analysis_with_plans(analysis, plan_count):
+    create_plans(analysis, plan_count)
+    return analysis
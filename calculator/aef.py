@@ -0,0 +1,113 @@
+"""
+Adjusted Earnings Factor (AEF) calculation.
+
+Mirrors ``calculateAEF`` in the frontend's ``AEFCalculator``: the gross
+earnings base is reduced in turn for worklife, unemployment and income tax,
+grossed up for fringe benefits and, optionally, reduced for personal
+consumption. Inputs and every intermediate step are percentages.
+
+A batch of input vectors is laid out as one array per input, so any number
+of factors is evaluated in a single NumPy pass. Nothing here imports Django.
+"""
+import numpy as np
+
+AEF_DEFAULTS = {
+    'base': 100.0,
+    'worklife_adjustment': 85.7,
+    'unemployment_factor': 4.2,
+    'income_tax_rate': 22.0,
+    'personal_consumption': 30.0,
+    'apply_personal_consumption': True,
+    'fringe_benefits': 23.5,
+}
+PERCENT_INPUTS = tuple(name for name in AEF_DEFAULTS if name != 'apply_personal_consumption')
+AEF_STEPS = (
+    'worklife_adjusted',
+    'unemployment_adjusted',
+    'tax_adjusted',
+    'fringe_benefits_adjusted',
+    'final_aef',
+)
+
+
+def calculate_aef(base, worklife_adjustment, unemployment_factor, income_tax_rate,
+                  personal_consumption, apply_personal_consumption, fringe_benefits):
+    """
+    Every AEF step, as percentages, for scalar or array inputs.
+
+    Personal consumption is only deducted where ``apply_personal_consumption``
+    is true.
+    """
+    personal_consumption = np.where(apply_personal_consumption, personal_consumption / 100, 0.0)
+
+    worklife_adjusted = base / 100 * (worklife_adjustment / 100)
+    unemployment_adjusted = worklife_adjusted * (1 - unemployment_factor / 100)
+    tax_adjusted = unemployment_adjusted * (1 - income_tax_rate / 100)
+    fringe_benefits_adjusted = tax_adjusted * (1 + fringe_benefits / 100)
+    final_aef = fringe_benefits_adjusted * (1 - personal_consumption)
+
+    return {
+        'worklife_adjusted': worklife_adjusted * 100,
+        'unemployment_adjusted': unemployment_adjusted * 100,
+        'tax_adjusted': tax_adjusted * 100,
+        'fringe_benefits_adjusted': fringe_benefits_adjusted * 100,
+        'final_aef': final_aef * 100,
+    }
+
+
+def aef_arrays(vectors):
+    """
+    Validate a sequence of AEF input mappings into one array per input.
+
+    Missing inputs take their ``AEF_DEFAULTS`` value. Raises ``ValueError``
+    naming the first offending vector, under the same rules as the
+    frontend form: no negative inputs and at most 100% personal consumption.
+    """
+    columns = {name: [] for name in AEF_DEFAULTS}
+    for index, vector in enumerate(vectors):
+        if not isinstance(vector, dict):
+            raise ValueError(f'inputs[{index}] must be an object')
+        unknown = set(vector) - set(AEF_DEFAULTS)
+        if unknown:
+            raise ValueError(f"inputs[{index}] has unknown fields: {', '.join(sorted(unknown))}")
+        for name, values in columns.items():
+            values.append(vector.get(name, AEF_DEFAULTS[name]))
+
+    arrays = {}
+    for name in PERCENT_INPUTS:
+        try:
+            values = np.array(columns[name], dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError(f'{name} must be a number in every input') from None
+        invalid = np.flatnonzero(~np.isfinite(values) | (values < 0))
+        if invalid.size:
+            raise ValueError(f'inputs[{invalid[0]}].{name} must be a non-negative number')
+        arrays[name] = values
+
+    flags = columns['apply_personal_consumption']
+    if not all(isinstance(flag, bool) for flag in flags):
+        raise ValueError('apply_personal_consumption must be true or false in every input')
+    arrays['apply_personal_consumption'] = np.array(flags, dtype=bool)
+
+    too_high = np.flatnonzero(arrays['apply_personal_consumption'] & (arrays['personal_consumption'] > 100))
+    if too_high.size:
+        raise ValueError(f'inputs[{too_high[0]}].personal_consumption cannot exceed 100%')
+    return arrays
+
+
+def evaluate_aef_batch(vectors):
+    """Every AEF step for each input mapping, in input order"""
+    steps = calculate_aef(**aef_arrays(vectors))
+    columns = [steps[name].tolist() for name in AEF_STEPS]
+    return [dict(zip(AEF_STEPS, values)) for values in zip(*columns)]
+
+
+def normalize_aef_inputs(inputs):
+    """One validated input mapping with defaults filled in"""
+    arrays = aef_arrays([inputs])
+    return {name: arrays[name][0].item() for name in AEF_DEFAULTS}
+
+
+def adjustment_factor_from_aef(inputs):
+    """The final AEF of one input mapping as a fraction, e.g. 0.5536 for 55.36%"""
+    return evaluate_aef_batch([inputs])[0]['final_aef'] / 100
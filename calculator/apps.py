@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CalculatorConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "calculator"
+
+    def ready(self):
+        from django.conf import settings
+        from . import signals  # noqa: F401
+        from .factor_tables import DEFAULT_MAXSIZE, factor_tables
+
+        factor_tables.maxsize = getattr(settings, 'FACTOR_TABLE_MAXSIZE', DEFAULT_MAXSIZE)
@@ -0,0 +1,159 @@
+"""
+Bulk export of many analyses' reports as one streamed ZIP archive.
+
+Reports are rendered from analyses whose evaluee and rows were loaded in
+bulk up front, so rendering needs no database access and runs in a spawned
+process pool (``settings.BULK_EXPORT_PROCESSES``, 0 renders inline). Each
+document is added to the archive as soon as it finishes and the archive
+bytes written so far are handed to the response, so neither the archive
+nor more than a window of finished documents is ever held in memory.
+
+The documents are already compressed, so entries are stored, not deflated.
+A document that fails to render is listed in an ``errors.txt`` entry
+instead of aborting an archive that is already being streamed. When a
+worker process dies, the documents it took down are listed the same way,
+and the broken pool is replaced so later exports are unaffected. When the
+client disconnects, documents submitted but not yet started are cancelled
+rather than rendered for nobody.
+"""
+import multiprocessing
+import os
+import threading
+import zipfile
+from contextlib import closing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+
+from django.conf import settings
+
+from .reports import REPORT_FORMATS
+from .workers import init_worker, render_export
+
+ZIP_CONTENT_TYPE = 'application/zip'
+DEFAULT_EXPORT_FORMATS = ('export_excel', 'export_word')
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def export_filename(report_type, analysis_id):
+    """Archive entry name; unique per analysis and report type"""
+    return f'analysis_{analysis_id}/{report_type}.{REPORT_FORMATS[report_type].extension}'
+
+
+def export_processes():
+    return getattr(settings, 'BULK_EXPORT_PROCESSES', os.cpu_count())
+
+
+def _get_pool(processes):
+    """One spawned pool per web process and pool size, created on first use"""
+    with _pools_lock:
+        pool = _pools.get(processes)
+        if pool is None:
+            context = multiprocessing.get_context('spawn')
+            pool = _pools[processes] = ProcessPoolExecutor(
+                processes, mp_context=context, initializer=init_worker
+            )
+        return pool
+
+
+def _discard_pool(processes, pool):
+    """Drop a pool broken by a dead worker so the next use starts a new one"""
+    with _pools_lock:
+        if _pools.get(processes) is pool:
+            del _pools[processes]
+    pool.shutdown(wait=False)
+
+
+def _submit(processes, *args):
+    """Submit to the shared pool, replacing it once if it turns out to be broken"""
+    pool = _get_pool(processes)
+    try:
+        return pool, pool.submit(*args)
+    except BrokenProcessPool:
+        _discard_pool(processes, pool)
+        pool = _get_pool(processes)
+        return pool, pool.submit(*args)
+
+
+def render_exports(analyses, report_types, processes=None):
+    """
+    Yield ``(analysis, report_type, data, error)`` as each report finishes.
+
+    ``data`` is the document's bytes, or None with ``error`` set when it
+    failed. With a pool, at most twice its size in documents are in flight
+    or waiting to be consumed at once.
+    """
+    processes = export_processes() if processes is None else processes
+    tasks = ((analysis, report_type) for analysis in analyses for report_type in report_types)
+
+    if processes == 0:
+        for analysis, report_type in tasks:
+            try:
+                yield analysis, report_type, render_export(analysis, report_type), None
+            except Exception as e:
+                yield analysis, report_type, None, str(e)
+        return
+
+    pending = {}
+
+    def submit(count):
+        for analysis, report_type in islice(tasks, count):
+            pool, future = _submit(processes, render_export, analysis, report_type)
+            pending[future] = (analysis, report_type, pool)
+
+    try:
+        submit(2 * processes)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                analysis, report_type, pool = pending.pop(future)
+                error = future.exception()
+                if isinstance(error, BrokenProcessPool):
+                    _discard_pool(processes, pool)
+                if error is None:
+                    yield analysis, report_type, future.result(), None
+                else:
+                    yield analysis, report_type, None, str(error)
+            submit(len(done))
+    finally:
+        # Only reached with work pending when the consumer stopped early
+        for future in pending:
+            future.cancel()
+
+
+class _ChunkBuffer:
+    """Write-only sink that hands back what was written since the last drain"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_export_zip(analyses, report_types, processes=None):
+    """Yield the bytes of a ZIP of every report as the reports finish"""
+    buffer = _ChunkBuffer()
+    errors = []
+    rendered = render_exports(analyses, report_types, processes)
+    with closing(rendered), zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for analysis, report_type, data, error in rendered:
+            if error is not None:
+                errors.append(f'{export_filename(report_type, analysis.id)}: {error}')
+                continue
+            archive.writestr(export_filename(report_type, analysis.id), data)
+            yield buffer.drain()
+        if errors:
+            archive.writestr('errors.txt', '\n'.join(errors) + '\n')
+    yield buffer.drain()
@@ -0,0 +1,97 @@
+"""
+Streaming Excel export of analysis exhibits.
+
+Workbooks are built with openpyxl's write-only mode, which spools each
+worksheet's rows to a temporary file as they are appended, and the saved
+file is streamed back in blocks through a ``FileResponse``. Memory stays
+bounded by one analysis' projection regardless of how many analyses or
+rows the workbook holds.
+"""
+import tempfile
+
+from django.http import FileResponse
+from openpyxl import Workbook
+
+from .projection import project_analysis
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+EXHIBIT_HEADERS = [
+    "Year", "Portion of Year", "Age", "Wage Base", "Gross Earnings",
+    "Adjusted Earnings", "Benefits Loss", "Insurance Loss",
+]
+
+PERSONAL_INFO_HEADERS = [
+    "First Name", "Last Name", "Date of Birth", "Date of Injury", "Date of Report",
+    "Age at Injury", "Worklife Expectancy", "Life Expectancy",
+]
+
+
+def _personal_info(analysis):
+    return [
+        analysis.evaluee.first_name,
+        analysis.evaluee.last_name,
+        analysis.evaluee.date_of_birth,
+        analysis.date_of_injury,
+        analysis.date_of_report,
+        (analysis.date_of_injury - analysis.evaluee.date_of_birth).days / 365.25,
+        analysis.worklife_expectancy,
+        analysis.life_expectancy,
+    ]
+
+
+def write_analysis_workbook(analysis, fileobj):
+    """Write the single-analysis workbook: personal info plus both exhibits"""
+    workbook = Workbook(write_only=True)
+    ws = workbook.create_sheet("Personal Info")
+    for label, value in zip(PERSONAL_INFO_HEADERS, _personal_info(analysis)):
+        ws.append([label, value])
+
+    pre, post = project_analysis(analysis)
+    for title, exhibit in (("Pre-Injury Earnings", pre), ("Post-Injury Earnings", post)):
+        ws = workbook.create_sheet(title)
+        ws.append(EXHIBIT_HEADERS)
+        for row in exhibit.row_dicts():
+            ws.append(list(row.values()))
+
+    workbook.save(fileobj)
+
+
+def write_bulk_workbook(analyses, fileobj):
+    """
+    Write many analyses into one workbook with an ``Analysis`` key column.
+
+    ``analyses`` may be any iterable, including ``QuerySet.iterator()``;
+    each analysis is projected and written before the next one is read.
+    """
+    workbook = Workbook(write_only=True)
+    ws_info = workbook.create_sheet("Personal Info")
+    ws_pre = workbook.create_sheet("Pre-Injury Earnings")
+    ws_post = workbook.create_sheet("Post-Injury Earnings")
+    ws_info.append(["Analysis"] + PERSONAL_INFO_HEADERS)
+    ws_pre.append(["Analysis"] + EXHIBIT_HEADERS)
+    ws_post.append(["Analysis"] + EXHIBIT_HEADERS)
+
+    for analysis in analyses:
+        ws_info.append([analysis.id] + _personal_info(analysis))
+        pre, post = project_analysis(analysis)
+        for row in pre.row_dicts():
+            ws_pre.append([analysis.id] + list(row.values()))
+        for row in post.row_dicts():
+            ws_post.append([analysis.id] + list(row.values()))
+
+    workbook.save(fileobj)
+
+
+def streaming_workbook_response(write, filename):
+    """Run ``write(fileobj)`` against a temporary file and stream it back"""
+    fileobj = tempfile.TemporaryFile()
+    try:
+        write(fileobj)
+    except Exception:
+        fileobj.close()
+        raise
+    fileobj.seek(0)
+    response = FileResponse(fileobj, content_type=XLSX_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
@@ -0,0 +1,105 @@
+"""
+Shared tables of cumulative growth and discount factors.
+
+The same few rates (0.03, 0.042, 0.07, ...) are raised to the same year
+offsets by every exhibit, export and healthcare schedule. A table holds
+``(1 + rate) ** k`` for ``k`` in ``range(horizon)`` under one compounding
+convention, and tables are kept in a bounded LRU keyed by
+``(rate, horizon, compounding)``. Horizons are rounded up to a multiple of
+``HORIZON_STEP`` so analyses of similar length share one table, and callers
+take the offsets they need from it.
+
+Hits, misses and evictions are counted so the cache can be sized from
+``factor_tables.stats()``. Nothing here imports Django.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+COMPOUNDING = ('annual', 'continuous')
+HORIZON_STEP = 32
+DEFAULT_MAXSIZE = 256
+
+
+class FactorTables:
+    """A bounded LRU of read-only ``(1 + rate) ** k`` factor vectors"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._tables = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def table(self, rate, horizon, compounding='annual'):
+        """Growth factors for offsets ``0`` up to at least ``horizon - 1``"""
+        if compounding not in COMPOUNDING:
+            raise ValueError(f"Unknown compounding '{compounding}'; expected one of: {', '.join(COMPOUNDING)}")
+        horizon = max(-(-int(horizon) // HORIZON_STEP) * HORIZON_STEP, HORIZON_STEP)
+        key = (float(rate), horizon, compounding)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return table
+            self.misses += 1
+
+        table = _build_table(key[0], horizon, compounding)
+        with self._lock:
+            self._tables[key] = table
+            self._tables.move_to_end(key)
+            while len(self._tables) > self.maxsize:
+                self._tables.popitem(last=False)
+                self.evictions += 1
+        return table
+
+    def growth_factors(self, rate, horizon, compounding='annual'):
+        """``(1 + rate) ** k`` for ``k`` in ``range(horizon)``"""
+        return self.table(rate, horizon, compounding)[:horizon]
+
+    def discount_factors(self, rate, horizon, compounding='annual'):
+        """``(1 + rate) ** -k`` for ``k`` in ``range(horizon)``"""
+        return self.factors(rate, -np.arange(horizon), compounding)
+
+    def factors(self, rate, exponents, compounding='annual'):
+        """``(1 + rate) ** e`` for an array of integer exponents of either sign"""
+        exponents = np.asarray(exponents, dtype=np.int64)
+        if exponents.size == 0:
+            return np.empty(exponents.shape)
+        reach = int(np.abs(exponents).max()) + 1
+        growth = self.table(rate, reach, compounding)
+        magnitude = growth[np.abs(exponents)]
+        if exponents.min() >= 0:
+            return magnitude
+        return np.where(exponents >= 0, magnitude, 1 / magnitude)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._tables),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else None,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+def _build_table(rate, horizon, compounding):
+    offsets = np.arange(horizon, dtype=np.float64)
+    if compounding == 'continuous':
+        table = np.exp(rate * offsets)
+    else:
+        table = (1 + rate) ** offsets
+    table.flags.writeable = False
+    return table
+
+
+factor_tables = FactorTables()
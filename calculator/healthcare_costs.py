@@ -0,0 +1,91 @@
+"""
+Generation of the yearly ``HealthcareCost`` schedules of an analysis.
+
+Every active plan shares the analysis' year range, so the schedules are laid
+out as one ``(plans, years)`` matrix: costs grow by each category's rate from
+the injury year and fall only in years that match its frequency.
+
+Each plan records a fingerprint of the inputs its stored costs came from, so
+recalculation only replaces the costs of plans whose inputs have changed.
+Inactive plans keep no schedule: deactivating a plan changes its fingerprint
+and drops its stored costs, and reactivating it rebuilds them.
+"""
+import hashlib
+import json
+
+import numpy as np
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .factor_tables import factor_tables
+from .models import HealthcareCost, HealthcarePlan
+from .profiling import profiled
+
+
+def plan_fingerprint(analysis, plan):
+    """Stable SHA-256 of everything a plan's cost schedule depends on"""
+    inputs = [
+        plan.is_active,
+        plan.base_cost,
+        plan.category.growth_rate,
+        plan.category.frequency_years,
+        analysis.date_of_injury,
+        analysis.life_expectancy,
+        analysis.evaluee.date_of_birth,
+    ]
+    payload = json.dumps(inputs, cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@profiled('calculation')
+def build_plan_costs(analysis, plans):
+    """Return unsaved ``HealthcareCost`` rows for ``plans`` (categories selected)"""
+    plans = list(plans)
+    start_year = analysis.date_of_injury.year
+    end_year = start_year + int(analysis.life_expectancy)
+    age_at_start = (analysis.date_of_injury - analysis.evaluee.date_of_birth).days / 365.25
+    if not plans or end_year < start_year:
+        return []
+
+    years_from_start = np.arange(end_year - start_year + 1)
+    base_cost = np.array([plan.base_cost for plan in plans], dtype=np.float64)[:, np.newaxis]
+    # Whole-year frequencies; anything more frequent than yearly is booked every year
+    frequency = np.array([max(int(plan.category.frequency_years), 1) for plan in plans])[:, np.newaxis]
+
+    growth = np.vstack([
+        factor_tables.growth_factors(plan.category.growth_rate, len(years_from_start)) for plan in plans
+    ])
+    costs = base_cost * growth
+    plan_index, offset = np.nonzero(years_from_start % frequency == 0)
+    years = (start_year + offset).tolist()
+    ages = (age_at_start + offset).tolist()
+    return [
+        HealthcareCost(plan=plans[p], year=year, age=age, cost=cost)
+        for p, year, age, cost in zip(
+            plan_index.tolist(), years, ages, costs[plan_index, offset].tolist()
+        )
+    ]
+
+
+def replace_plan_costs(analysis, plans):
+    """
+    Regenerate the costs of the ``plans`` whose inputs changed, atomically.
+
+    Changed active plans get a fresh schedule and changed inactive plans lose
+    theirs; plans whose fingerprint still matches keep their stored rows.
+    Returns the plans whose stored costs were replaced or dropped.
+    """
+    plans = list(plans.select_related('category'))
+    fingerprints = {plan.pk: plan_fingerprint(analysis, plan) for plan in plans}
+    changed = [plan for plan in plans if plan.costs_fingerprint != fingerprints[plan.pk]]
+    if not changed:
+        return []
+
+    costs = build_plan_costs(analysis, [plan for plan in changed if plan.is_active])
+    for plan in changed:
+        plan.costs_fingerprint = fingerprints[plan.pk]
+    with transaction.atomic():
+        HealthcareCost.objects.filter(plan__in=changed).delete()
+        HealthcareCost.objects.bulk_create(costs, batch_size=1000)
+        HealthcarePlan.objects.bulk_update(changed, ['costs_fingerprint'])
+    return changed
@@ -0,0 +1,89 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+
+from calculator.models import EconomicAnalysis
+from calculator.recalculation import analysis_inputs, recalculate_batch, write_rows
+from calculator.workers import init_worker, recalculate_rows
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = "Regenerate the pre/post-injury rows of stored analyses"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'analysis_ids', nargs='*', type=int,
+            help="Analyses to recalculate (default: all)"
+        )
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count() or 1,
+            help="Worker processes; 0 recalculates in this process"
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help="Analyses fetched per database round trip"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=200,
+            help="Analyses per worker task and per write transaction"
+        )
+
+    def handle(self, *args, **options):
+        queryset = EconomicAnalysis.objects.all()
+        if options['analysis_ids']:
+            queryset = queryset.filter(id__in=options['analysis_ids'])
+        records = analysis_inputs(queryset).iterator(chunk_size=options['chunk_size'])
+        batches = _batches(records, options['batch_size'])
+
+        self._started = time.perf_counter()
+        self._done = 0
+        self._skipped = 0
+        if options['processes'] == 0:
+            for batch in batches:
+                self._write(recalculate_batch(batch))
+        else:
+            self._run_pool(batches, options['processes'])
+
+        elapsed = time.perf_counter() - self._started
+        rate = self._done / elapsed if elapsed else 0.0
+        summary = f"Recalculated {self._done} analyses in {elapsed:.1f}s ({rate:.0f} analyses/s)"
+        if self._skipped:
+            self.stdout.write(self.style.WARNING(f"{summary}; skipped {self._skipped} invalid analyses"))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
+
+    def _write(self, batch_result):
+        results, failures = batch_result
+        for analysis_id, message in failures:
+            self.stderr.write(f"Skipped analysis {analysis_id}: {message}")
+        self._skipped += len(failures)
+        if results:
+            self._done += write_rows(results)
+        elapsed = time.perf_counter() - self._started
+        self.stdout.write(f"{self._done} analyses ({self._done / elapsed:.0f}/s)")
+
+    def _run_pool(self, batches, processes):
+        # Keep a bounded number of batches in flight so memory stays flat
+        # however many analyses are streamed from the database.
+        max_pending = processes * 2
+        pending = set()
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(processes, mp_context=context, initializer=init_worker) as executor:
+            for batch in batches:
+                pending.add(executor.submit(recalculate_rows, batch))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._write(future.result())
+            for future in pending:
+                self._write(future.result())
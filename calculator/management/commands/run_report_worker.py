@@ -0,0 +1,123 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+
+from calculator.report_jobs import claim_pending_jobs, fail_job, requeue_stale_jobs, run_report_job
+from calculator.workers import init_worker, render_report
+
+
+class Command(BaseCommand):
+    help = "Render queued report jobs in a local process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count() or 1,
+            help="Worker processes; 0 renders jobs in this process"
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help="Seconds to wait between checks for new jobs"
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=600,
+            help="Requeue jobs left running for longer than this many seconds"
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Exit once the queue is empty instead of polling forever"
+        )
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs(options['stale_after'])
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s)")
+
+        started = time.perf_counter()
+        if options['processes'] == 0:
+            completed, failed = self._run_inline(options)
+        else:
+            completed, failed = self._run_pool(options)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {completed} report(s), {failed} failed, in {elapsed:.1f}s"
+        ))
+
+    def _run_inline(self, options):
+        completed = failed = 0
+        while True:
+            claimed = claim_pending_jobs(1)
+            if not claimed:
+                if options['once']:
+                    return completed, failed
+                time.sleep(options['poll_interval'])
+                continue
+            try:
+                ok = run_report_job(claimed[0])
+            except Exception as e:
+                ok = False
+                self._job_crashed(claimed[0], e)
+            if ok:
+                completed += 1
+            else:
+                failed += 1
+
+    def _run_pool(self, options):
+        processes = options['processes']
+        completed = failed = 0
+        running = {}
+        executor = self._start_pool(processes)
+        try:
+            while True:
+                for job_id in claim_pending_jobs(processes - len(running)):
+                    try:
+                        future = executor.submit(render_report, job_id)
+                    except BrokenProcessPool:
+                        executor = self._restart_pool(executor, processes)
+                        future = executor.submit(render_report, job_id)
+                    running[future] = job_id
+
+                if not running:
+                    if options['once']:
+                        return completed, failed
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                done, _ = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    job_id = running.pop(future)
+                    try:
+                        ok = future.result()
+                    except Exception as e:
+                        ok = False
+                        broken = broken or isinstance(e, BrokenProcessPool)
+                        self._job_crashed(job_id, e)
+                    if ok:
+                        completed += 1
+                    else:
+                        failed += 1
+                if broken:
+                    executor = self._restart_pool(executor, processes)
+        finally:
+            executor.shutdown()
+
+    def _start_pool(self, processes):
+        context = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(processes, mp_context=context, initializer=init_worker)
+
+    def _restart_pool(self, executor, processes):
+        """Replace a pool broken by a dead worker process"""
+        self.stderr.write("A worker process died; starting a new pool")
+        executor.shutdown(wait=False, cancel_futures=True)
+        return self._start_pool(processes)
+
+    def _job_crashed(self, job_id, error):
+        """Fail a job whose rendering raised outside ``run_report_job``'s own handling"""
+        message = str(error) or type(error).__name__
+        self.stderr.write(f"Job {job_id} crashed: {message}")
+        fail_job(job_id, message)
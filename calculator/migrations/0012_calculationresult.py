@@ -0,0 +1,30 @@
+# Generated by Django 5.0 on 2026-10-16 10:12
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calculator', '0011_healthcarecategory_healthcareplan_healthcarecost'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalculationResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(help_text='Hash of the analysis inputs the result was calculated from', max_length=64)),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('analysis', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='calculation_result', to='calculator.economicanalysis')),
+            ],
+            options={
+                'verbose_name': 'Calculation Result',
+                'verbose_name_plural': 'Calculation Results',
+            },
+        ),
+    ]
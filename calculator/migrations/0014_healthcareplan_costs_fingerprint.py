@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-16 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calculator', '0013_reportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='healthcareplan',
+            name='costs_fingerprint',
+            field=models.CharField(blank=True, editable=False, help_text='Fingerprint of the inputs the stored costs were generated from', max_length=64),
+        ),
+    ]
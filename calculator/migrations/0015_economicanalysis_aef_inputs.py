@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-16 22:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calculator', '0014_healthcareplan_costs_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='economicanalysis',
+            name='aef_inputs',
+            field=models.JSONField(blank=True, help_text='AEF inputs the adjustment factor is computed from, if not entered directly', null=True),
+        ),
+    ]
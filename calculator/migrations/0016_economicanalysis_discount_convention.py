@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-16 22:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calculator', '0015_economicanalysis_aef_inputs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='economicanalysis',
+            name='discount_convention',
+            field=models.CharField(choices=[('end_of_year', 'End of Year'), ('mid_year', 'Mid-Year'), ('continuous', 'Continuous'), ('exact_day', 'Exact Day')], default='end_of_year', help_text='When in each year post-injury earnings are discounted from', max_length=20),
+        ),
+    ]
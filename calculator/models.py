@@ -1,5 +1,6 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.core.serializers.json import DjangoJSONEncoder
 from datetime import timedelta
 
 class Evaluee(models.Model):
@@ -66,6 +67,11 @@ class EconomicAnalysis(models.Model):
         help_text="Adjustment factor for calculations",
         default=0.754  # 75.4%
     )
+    aef_inputs = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="AEF inputs the adjustment factor is computed from, if not entered directly"
+    )
 
     # Benefits and Insurance
     benefits_rate = models.FloatField(
@@ -152,6 +158,17 @@ class EconomicAnalysis(models.Model):
         help_text="Annual discount rate",
         default=0.04  # 4%
     )
+    discount_convention = models.CharField(
+        max_length=20,
+        choices=[
+            ('end_of_year', 'End of Year'),
+            ('mid_year', 'Mid-Year'),
+            ('continuous', 'Continuous'),
+            ('exact_day', 'Exact Day'),
+        ],
+        default='end_of_year',
+        help_text="When in each year post-injury earnings are discounted from"
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -241,6 +258,12 @@ class HealthcarePlan(models.Model):
         default=True,
         help_text="Whether this healthcare plan is included in the analysis"
     )
+    costs_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="Fingerprint of the inputs the stored costs were generated from"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -341,3 +364,73 @@ class PostInjuryRow(models.Model):
 
     class Meta:
         ordering = ['year']
+
+class CalculationResult(models.Model):
+    analysis = models.OneToOneField(
+        EconomicAnalysis,
+        on_delete=models.CASCADE,
+        related_name='calculation_result'
+    )
+    fingerprint = models.CharField(
+        max_length=64,
+        help_text="Hash of the analysis inputs the result was calculated from"
+    )
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Calculation result for {self.analysis}"
+
+    class Meta:
+        verbose_name = "Calculation Result"
+        verbose_name_plural = "Calculation Results"
+
+class ReportJob(models.Model):
+    REPORT_TYPE_CHOICES = [
+        ('export_excel', 'Excel Exhibits'),
+        ('export_word', 'Word Exhibits'),
+        ('excel', 'Excel Summary'),
+        ('word', 'Word Summary'),
+    ]
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    analysis = models.ForeignKey(
+        EconomicAnalysis,
+        on_delete=models.CASCADE,
+        related_name='report_jobs'
+    )
+    report_type = models.CharField(max_length=20, choices=REPORT_TYPE_CHOICES)
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        db_index=True
+    )
+    progress = models.PositiveSmallIntegerField(
+        default=0,
+        validators=[MaxValueValidator(100)],
+        help_text="Percent complete"
+    )
+    artifact_path = models.CharField(max_length=500, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_report_type_display()} for {self.analysis} ({self.status})"
+
+    class Meta:
+        verbose_name = "Report Job"
+        verbose_name_plural = "Report Jobs"
+        ordering = ['created_at']
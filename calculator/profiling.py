@@ -0,0 +1,234 @@
+"""
+Opt-in per-request profiling.
+
+``RequestProfilingMiddleware`` profiles every request when
+``REQUEST_PROFILING`` is on, and otherwise only requests from
+session-authenticated staff users that send the
+``REQUEST_PROFILING_HEADER`` header. A profiled request
+records:
+- wall time;
+- database query count and time, through a connection execute wrapper;
+- time spent in ``profiled_section`` blocks, such as ``serializer`` (see
+  ``ProfiledSerializerMixin``) and ``calculation`` (functions decorated
+  with ``profiled('calculation')``).
+
+Sections can overlap. Serializer time includes the queries and
+calculations run while saving.
+
+The last ``REQUEST_PROFILING_WINDOW`` requests of each URL name are kept in
+memory (requests that resolve to no URL share one ``<unresolved>`` entry, so
+404s and probes cannot grow the store) and summarised as a wall-time histogram at ``/api/profiling/``.
+With ``REQUEST_PROFILE_KEEP`` above zero, requests also run under cProfile,
+and the stats of the slowest ones are kept in ``REQUEST_PROFILE_ROOT``.
+
+When a request is not profiled, the cost is one header lookup in the
+middleware and one context variable read per section.
+"""
+import contextvars
+import cProfile
+import functools
+import heapq
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+HISTOGRAM_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+UNRESOLVED_ROUTE = '<unresolved>'
+
+_current = contextvars.ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """Timings gathered while handling one request"""
+
+    def __init__(self):
+        self.sections = defaultdict(float)
+        self.depth = defaultdict(int)
+        self.query_count = 0
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sections['db'] += time.perf_counter() - start
+            self.query_count += 1
+
+
+@contextmanager
+def profiled_section(name):
+    """Add the time spent in the block to ``name`` on the current request profile"""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    # Only the outermost block of a section counts, so nesting never double counts
+    profile.depth[name] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.depth[name] -= 1
+        if not profile.depth[name]:
+            profile.sections[name] += time.perf_counter() - start
+
+
+def profiled(name):
+    """Decorator form of ``profiled_section``"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return function(*args, **kwargs)
+            with profiled_section(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ProfiledSerializerMixin:
+    """Count a serializer's validation and representation as ``serializer`` time"""
+
+    def run_validation(self, *args, **kwargs):
+        with profiled_section('serializer'):
+            return super().run_validation(*args, **kwargs)
+
+    def to_representation(self, instance):
+        with profiled_section('serializer'):
+            return super().to_representation(instance)
+
+    def save(self, **kwargs):
+        with profiled_section('serializer'):
+            return super().save(**kwargs)
+
+
+def _percentile(ordered, q):
+    return ordered[min(int(q / 100 * len(ordered)), len(ordered) - 1)]
+
+
+class ProfileStore:
+    """Rolling per-route timings and the cProfile dumps of the slowest requests"""
+
+    def __init__(self, window):
+        self.window = window
+        self._routes = defaultdict(lambda: deque(maxlen=self.window))
+        self._slowest = []
+        self._lock = threading.Lock()
+
+    def record(self, route, timings):
+        with self._lock:
+            self._routes[route].append(timings)
+
+    def keep_profile(self, route, wall, profiler, root, keep):
+        """Dump ``profiler`` if the request is among the ``keep`` slowest seen"""
+        with self._lock:
+            if len(self._slowest) >= keep and wall <= self._slowest[0][0]:
+                return None
+            root = Path(root)
+            root.mkdir(parents=True, exist_ok=True)
+            slug = re.sub(r'[^\w.-]+', '_', route).strip('_') or 'root'
+            path = root / f'{wall * 1000:010.1f}ms-{slug}-{time.time_ns()}.prof'
+            profiler.dump_stats(path)
+            heapq.heappush(self._slowest, (wall, str(path)))
+            while len(self._slowest) > keep:
+                _, evicted = heapq.heappop(self._slowest)
+                Path(evicted).unlink(missing_ok=True)
+            return path
+
+    def summary(self):
+        with self._lock:
+            routes = {route: list(records) for route, records in self._routes.items()}
+            slowest = sorted(self._slowest, reverse=True)
+
+        result = {}
+        for route, records in routes.items():
+            walls = sorted(record['wall'] for record in records)
+            histogram = dict.fromkeys([f'<={bucket}ms' for bucket in HISTOGRAM_BUCKETS_MS] + ['slower'], 0)
+            for wall in walls:
+                label = next((f'<={b}ms' for b in HISTOGRAM_BUCKETS_MS if wall * 1000 <= b), 'slower')
+                histogram[label] += 1
+            sections = sorted({name for record in records for name in record['sections']})
+            result[route] = {
+                'count': len(records),
+                'wall_ms': {
+                    'mean': sum(walls) / len(walls) * 1000,
+                    'p50': _percentile(walls, 50) * 1000,
+                    'p95': _percentile(walls, 95) * 1000,
+                    'max': walls[-1] * 1000,
+                },
+                'histogram': histogram,
+                'mean_queries': sum(record['queries'] for record in records) / len(records),
+                'mean_section_ms': {
+                    name: sum(record['sections'].get(name, 0.0) for record in records) / len(records) * 1000
+                    for name in sections
+                },
+            }
+        return {
+            'routes': result,
+            'slowest_profiles': [{'wall_ms': wall * 1000, 'path': path} for wall, path in slowest],
+        }
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+            self._slowest.clear()
+
+
+profile_store = ProfileStore(window=1000)
+
+
+class RequestProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'REQUEST_PROFILING', False)
+        header = getattr(settings, 'REQUEST_PROFILING_HEADER', 'X-Profile')
+        self.header = 'HTTP_' + header.upper().replace('-', '_')
+        self.keep = getattr(settings, 'REQUEST_PROFILE_KEEP', 0)
+        self.root = getattr(settings, 'REQUEST_PROFILE_ROOT', None)
+        profile_store.window = getattr(settings, 'REQUEST_PROFILING_WINDOW', profile_store.window)
+
+    def __call__(self, request):
+        if self.enabled or (self.header in request.META and request.user.is_staff):
+            return self._profile(request)
+        return self.get_response(request)
+
+    def _profile(self, request):
+        profile = RequestProfile()
+        token = _current.set(profile)
+        profiler = cProfile.Profile() if self.keep and self.root else None
+        start = time.perf_counter()
+        try:
+            if profiler is not None:
+                try:
+                    profiler.enable()
+                except ValueError:
+                    # Another profiler is already running in this process
+                    profiler = None
+            with connections['default'].execute_wrapper(profile.execute_wrapper):
+                response = self.get_response(request)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            wall = time.perf_counter() - start
+            _current.reset(token)
+
+        match = request.resolver_match
+        route = match.view_name if match is not None else UNRESOLVED_ROUTE
+        profile_store.record(route, {
+            'wall': wall,
+            'queries': profile.query_count,
+            'sections': dict(profile.sections),
+        })
+        if profiler is not None:
+            profile_store.keep_profile(route, wall, profiler, self.root, self.keep)
+        response['Server-Timing'] = ', '.join(
+            [f'total;dur={wall * 1000:.1f}']
+            + [f'{name};dur={seconds * 1000:.1f}' for name, seconds in sorted(profile.sections.items())]
+        )
+        return response
@@ -0,0 +1,401 @@
+"""
+Vectorized projection engine for the pre- and post-injury exhibits.
+
+Every exhibit column (gross and adjusted earnings, benefits, insurance and
+discounting) is computed for all rows of an exhibit in one batched NumPy pass,
+so ``calculate``, ``export_excel`` and ``export_word`` share a single
+implementation of the exhibit math.
+"""
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+
+from .factor_tables import factor_tables
+from .profiling import profiled
+
+ROW_FIELDS = ('year', 'portion_of_year', 'age', 'wage_base_years')
+DISCOUNT_CONVENTIONS = ('end_of_year', 'mid_year', 'continuous', 'exact_day')
+DAYS_PER_YEAR = 365.25
+
+
+def benefits_loss(base_earnings, benefits_rate):
+    """Benefits loss on base earnings; ``benefits_rate`` is a percentage"""
+    return base_earnings * (benefits_rate / 100)
+
+
+def _geometric_sum(base_amount, growth_rate, years):
+    """``sum(base_amount * (1 + growth_rate / 100) ** k for k in range(years))``"""
+    years = np.clip(np.asarray(years, dtype=np.float64), 0, None)
+    rate = growth_rate / 100
+    if rate == 0:
+        return base_amount * years
+    return base_amount * np.expm1(years * np.log1p(rate)) / rate
+
+
+def insurance_loss(base_amount, growth_rate, years, cumulative=False):
+    """
+    Insurance loss with growth over years, evaluated in closed form.
+
+    The loss is the geometric series of ``base_amount`` growing by
+    ``growth_rate`` percent a year, summed over ``years`` years. With
+    ``cumulative=True`` the running totals for every horizon from 1 to
+    ``years`` are returned as an array instead.
+    """
+    if cumulative:
+        return _geometric_sum(base_amount, growth_rate, np.arange(1, max(int(years), 0) + 1))
+    if years <= 0:
+        return 0.0
+    return float(_geometric_sum(base_amount, growth_rate, years))
+
+
+def _geometric_sums(base_amount, growth_rates, years):
+    """``_geometric_sum`` for every rate of ``growth_rates`` (axis 0) at once"""
+    years = np.clip(np.asarray(years, dtype=np.float64), 0, None)
+    rates = np.asarray(growth_rates, dtype=np.float64)[:, np.newaxis] / 100
+    growth = np.expm1(years * np.log1p(rates))
+    nonzero = rates != 0
+    sums = np.divide(growth, rates, out=np.zeros_like(growth), where=nonzero)
+    return base_amount * np.where(nonzero, sums, years)
+
+
+def format_portion(portion_of_year):
+    """Render a portion of year as a percentage label, e.g. ``91.7%``"""
+    percentage = Decimal(portion_of_year * 100).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)
+    return f"{percentage}%"
+
+
+@dataclass(frozen=True)
+class ProjectionParameters:
+    """Analysis inputs that drive the exhibit math"""
+    adjustment_factor: float
+    benefits_rate: float
+    health_insurance_base: float
+    growth_rate: float
+    report_year: int
+    apply_discounting: bool = False
+    discount_rate: float = None
+    injury_year: int = None
+    report_date: date = None
+    discount_convention: str = 'end_of_year'
+
+    @classmethod
+    def from_analysis(cls, analysis):
+        return cls(
+            adjustment_factor=analysis.adjustment_factor,
+            benefits_rate=analysis.benefits_rate,
+            health_insurance_base=analysis.health_insurance_base,
+            growth_rate=analysis.growth_rate,
+            report_year=analysis.date_of_report.year,
+            apply_discounting=analysis.apply_discounting,
+            discount_rate=analysis.discount_rate,
+            injury_year=analysis.date_of_injury.year,
+            report_date=analysis.date_of_report,
+            discount_convention=analysis.discount_convention,
+        )
+
+    @property
+    def discounted(self):
+        return bool(self.apply_discounting and self.discount_rate)
+
+
+@dataclass
+class RowArrays:
+    """Column arrays for the rows of one exhibit"""
+    year: np.ndarray
+    portion_of_year: np.ndarray
+    age: np.ndarray
+    wage_base_years: np.ndarray
+
+    @classmethod
+    def from_records(cls, records):
+        """Build from ``(year, portion_of_year, age, wage_base_years)`` tuples"""
+        records = list(records)
+        if not records:
+            return cls(
+                year=np.empty(0, dtype=np.int64),
+                portion_of_year=np.empty(0),
+                age=np.empty(0),
+                wage_base_years=np.empty(0),
+            )
+        year, portion, age, wage_base = zip(*records)
+        return cls(
+            year=np.asarray(year, dtype=np.int64),
+            portion_of_year=np.asarray(portion, dtype=np.float64),
+            age=np.asarray(age, dtype=np.float64),
+            wage_base_years=np.asarray(wage_base, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_queryset(cls, queryset):
+        return cls.from_records(queryset.values_list(*ROW_FIELDS))
+
+    @classmethod
+    def from_related(cls, analysis, related_name):
+        """Read an analysis' rows, reusing them when they were prefetched"""
+        prefetched = getattr(analysis, '_prefetched_objects_cache', {})
+        if related_name in prefetched:
+            return cls.from_records(
+                tuple(getattr(row, name) for name in ROW_FIELDS)
+                for row in prefetched[related_name]
+            )
+        return cls.from_queryset(getattr(analysis, related_name).all())
+
+    def __len__(self):
+        return len(self.year)
+
+
+@dataclass
+class ExhibitProjection:
+    """Every column and the totals of one projected exhibit"""
+    rows: RowArrays
+    gross_earnings: np.ndarray
+    adjusted_earnings: np.ndarray
+    benefits_loss: np.ndarray
+    insurance_loss: np.ndarray
+    discount_factor: np.ndarray
+    present_value: np.ndarray
+    totals: dict
+
+    def __len__(self):
+        return len(self.rows)
+
+    def row_dicts(self):
+        """Exhibit rows in the shape returned by the ``calculate`` endpoint"""
+        return [
+            {
+                'year': year,
+                'portion_of_year': format_portion(portion),
+                'age': age,
+                'wage_base_years': wage_base,
+                'gross_earnings': gross,
+                'adjusted_earnings': adjusted,
+                'benefits_loss': benefits,
+                'insurance_loss': insurance,
+            }
+            for year, portion, age, wage_base, gross, adjusted, benefits, insurance in zip(
+                self.rows.year.tolist(),
+                self.rows.portion_of_year.tolist(),
+                self.rows.age.tolist(),
+                self.rows.wage_base_years.tolist(),
+                self.gross_earnings.tolist(),
+                self.adjusted_earnings.tolist(),
+                self.benefits_loss.tolist(),
+                self.insurance_loss.tolist(),
+            )
+        ]
+
+
+def _project_earnings(params, rows):
+    gross = rows.wage_base_years * rows.portion_of_year
+    adjusted = gross * params.adjustment_factor
+    return gross, adjusted, benefits_loss(gross, params.benefits_rate)
+
+
+def project_pre_injury(params, rows):
+    """Project Exhibit 1; pre-injury rows carry one year of insurance each"""
+    gross, adjusted, benefits = _project_earnings(params, rows)
+    insurance = np.full(len(rows), float(insurance_loss(params.health_insurance_base, params.growth_rate, 1)))
+    discount_factor = np.ones(len(rows))
+    return ExhibitProjection(
+        rows=rows,
+        gross_earnings=gross,
+        adjusted_earnings=adjusted,
+        benefits_loss=benefits,
+        insurance_loss=insurance,
+        discount_factor=discount_factor,
+        present_value=adjusted,
+        totals={
+            'total_future_value': float(adjusted.sum()),
+            'total_benefits': float(benefits.sum()),
+            'total_insurance': float(insurance.sum()),
+        },
+    )
+
+
+def discount_offsets(params, rows, convention=None):
+    """
+    Years each row is discounted over under a discounting convention.
+
+    ``end_of_year`` and ``continuous`` use whole years from the report year;
+    ``mid_year`` takes every later year's earnings half a year sooner;
+    ``exact_day`` counts the days from the report date to the middle of the
+    part of the year a row covers. ``convention`` defaults to the analysis'.
+    """
+    convention = convention or params.discount_convention
+    years_from_report = rows.year - params.report_year
+    if convention in ('end_of_year', 'continuous'):
+        return years_from_report
+    if convention == 'mid_year':
+        return np.where(years_from_report > 0, years_from_report - 0.5, years_from_report)
+    if convention == 'exact_day':
+        if params.report_date is None:
+            raise ValueError('The exact_day convention needs the report date')
+        report_day = np.datetime64(params.report_date, 'D')
+        year_start = (rows.year - 1970).astype('datetime64[Y]').astype('datetime64[D]')
+        next_year_start = (rows.year - 1969).astype('datetime64[Y]').astype('datetime64[D]')
+        days_in_year = (next_year_start - year_start).astype(np.float64)
+        days_to_start = (np.maximum(year_start, report_day) - report_day).astype(np.float64)
+        return (days_to_start + rows.portion_of_year * days_in_year / 2) / DAYS_PER_YEAR
+    raise ValueError(
+        f"Unknown discount convention '{convention}'; expected one of: {', '.join(DISCOUNT_CONVENTIONS)}"
+    )
+
+
+def discount_factors(rate, offsets, convention):
+    """
+    Divisors taking each row back ``offsets`` years at ``rate``.
+
+    Whole-year offsets at a single rate come from the shared factor tables;
+    anything else is raised directly. ``rate`` may also be an array that
+    broadcasts against ``offsets``, such as one rate per simulated draw.
+    """
+    compounding = 'continuous' if convention == 'continuous' else 'annual'
+    if np.ndim(rate) == 0 and offsets.dtype.kind == 'i':
+        return factor_tables.factors(rate, offsets, compounding)
+    if compounding == 'continuous':
+        return np.exp(rate * offsets)
+    return (1 + rate) ** offsets
+
+
+def _post_injury_insurance(params, rows):
+    """Running insurance loss from the report year for each row"""
+    horizons = np.clip(rows.year - params.report_year + 1, 0, None)
+    running = insurance_loss(
+        params.health_insurance_base, params.growth_rate, horizons.max(initial=0), cumulative=True
+    )
+    return np.concatenate(([0.0], running))[horizons]
+
+
+def project_post_injury(params, rows):
+    """
+    Project Exhibit 2, discounting from the report year when enabled under
+    the analysis' discounting convention.
+
+    Once discounting applies the benefits and insurance totals are stated at
+    present value and the present value total takes the place of the future
+    value total, which stays at zero.
+    """
+    gross, adjusted, benefits = _project_earnings(params, rows)
+    insurance = _post_injury_insurance(params, rows)
+
+    if params.discounted:
+        discount_factor = discount_factors(
+            params.discount_rate, discount_offsets(params, rows), params.discount_convention
+        )
+        present_value = adjusted / discount_factor
+        totals = {
+            'total_future_value': 0.0,
+            'total_present_value': float(present_value.sum()),
+            'total_benefits': float((benefits / discount_factor).sum()),
+            'total_insurance': float((insurance / discount_factor).sum()),
+        }
+    else:
+        discount_factor = np.ones(len(rows))
+        present_value = adjusted
+        totals = {
+            'total_future_value': float(adjusted.sum()),
+            'total_present_value': 0.0,
+            'total_benefits': float(benefits.sum()),
+            'total_insurance': float(insurance.sum()),
+        }
+
+    return ExhibitProjection(
+        rows=rows,
+        gross_earnings=gross,
+        adjusted_earnings=adjusted,
+        benefits_loss=benefits,
+        insurance_loss=insurance,
+        discount_factor=discount_factor,
+        present_value=present_value,
+        totals=totals,
+    )
+
+
+@profiled('calculation')
+def project_analysis(analysis):
+    """Project both exhibits of a saved ``EconomicAnalysis``"""
+    params = ProjectionParameters.from_analysis(analysis)
+    pre = project_pre_injury(params, RowArrays.from_related(analysis, 'pre_injury_rows'))
+    post = project_post_injury(params, RowArrays.from_related(analysis, 'post_injury_rows'))
+    return pre, post
+
+
+@profiled('calculation')
+def convention_totals(params, rows):
+    """
+    Post-injury present value totals under every discounting convention.
+
+    The undiscounted columns are projected once and divided by the stacked
+    discount factors of all conventions in one pass, so comparing
+    conventions costs about as much as a single projection.
+    """
+    if not params.discounted:
+        raise ValueError('Discounting is not enabled for this analysis')
+    _, adjusted, benefits = _project_earnings(params, rows)
+    # (column, row)
+    columns = np.vstack([adjusted, benefits, _post_injury_insurance(params, rows)])
+    # (convention, row)
+    divisors = np.vstack([
+        discount_factors(params.discount_rate, discount_offsets(params, rows, convention), convention)
+        for convention in DISCOUNT_CONVENTIONS
+    ])
+    # (convention, column)
+    totals = (columns / divisors[:, np.newaxis, :]).sum(axis=2)
+    return {
+        convention: {
+            'total_present_value': float(present_value),
+            'total_benefits': float(benefits_total),
+            'total_insurance': float(insurance_total),
+            'total_loss': float(present_value + benefits_total + insurance_total),
+        }
+        for convention, (present_value, benefits_total, insurance_total) in zip(DISCOUNT_CONVENTIONS, totals)
+    }
+
+
+@profiled('calculation')
+def sensitivity_grid(params, rows, discount_rates, growth_rates, adjustment_factors):
+    """
+    Post-injury totals for every discount, growth and adjustment combination.
+
+    Stored rows were grown at ``params.growth_rate`` from the injury year, so
+    each alternative growth rate rescales them by the ratio of the growth
+    factors instead of regenerating them. All combinations are evaluated in
+    one broadcast pass; each returned array is indexed
+    ``[discount_rate, growth_rate, adjustment_factor]``.
+    """
+    discount_rates = np.asarray(discount_rates, dtype=np.float64)
+    growth_rates = np.asarray(growth_rates, dtype=np.float64)
+    adjustment_factors = np.asarray(adjustment_factors, dtype=np.float64)
+
+    years_from_injury = (rows.year - params.injury_year).astype(np.float64)
+    years_from_report = rows.year - params.report_year
+    # (growth, row)
+    regrowth = ((1 + growth_rates[:, np.newaxis]) / (1 + params.growth_rate)) ** years_from_injury
+    gross = rows.wage_base_years * rows.portion_of_year * regrowth
+    insurance = _geometric_sums(
+        params.health_insurance_base, growth_rates, np.clip(years_from_report + 1, 0, None)
+    )
+    # (discount, row), under the analysis' discounting convention
+    offsets = discount_offsets(params, rows).astype(np.float64)
+    if params.discount_convention == 'continuous':
+        discount = np.exp(-discount_rates[:, np.newaxis] * offsets)
+    else:
+        discount = (1 + discount_rates[:, np.newaxis]) ** -offsets
+
+    # (discount, growth)
+    discounted_gross = discount @ gross.T
+    benefits = benefits_loss(discounted_gross, params.benefits_rate)
+    insurance = discount @ insurance.T
+
+    shape = (len(discount_rates), len(growth_rates), len(adjustment_factors))
+    present_value = discounted_gross[:, :, np.newaxis] * adjustment_factors
+    benefits = np.broadcast_to(benefits[:, :, np.newaxis], shape)
+    insurance = np.broadcast_to(insurance[:, :, np.newaxis], shape)
+    return {
+        'total_present_value': present_value,
+        'total_benefits': benefits,
+        'total_insurance': insurance,
+        'total_loss': present_value + benefits + insurance,
+    }
@@ -0,0 +1,107 @@
+"""
+Regeneration of stored pre/post-injury rows for existing analyses.
+
+The row math is the same ``build_injury_rows`` used when an analysis is
+created. Generation works from plain ``values()`` records so it can run in
+worker processes without touching the database; the results come back as
+tuples and are written by the caller with ``bulk_update``/``bulk_create``.
+Analyses whose inputs the row math rejects, such as legacy analyses with a
+report dated before the injury, are returned as failures and left as stored.
+"""
+from django.db import transaction
+
+from .models import EconomicAnalysis, Evaluee, PreInjuryRow, PostInjuryRow
+from .result_cache import invalidate_calculation
+from .row_generation import build_injury_rows
+
+ROW_INPUT_FIELDS = (
+    'id',
+    'date_of_injury',
+    'date_of_report',
+    'worklife_expectancy',
+    'growth_rate',
+    'pre_injury_base_wage',
+    'post_injury_base_wage',
+)
+EVALUEE_INPUT_FIELDS = ('evaluee__date_of_birth',)
+ROW_VALUE_FIELDS = ('portion_of_year', 'age', 'wage_base_years')
+
+
+def analysis_inputs(queryset):
+    """Stream the inputs ``rows_from_values`` needs, one dict per analysis"""
+    return queryset.order_by('pk').values(*ROW_INPUT_FIELDS, *EVALUEE_INPUT_FIELDS)
+
+
+def _row_tuples(rows):
+    return [(row.year, row.portion_of_year, row.age, row.wage_base_years) for row in rows]
+
+
+def rows_from_values(values):
+    """Return ``(analysis_id, pre_rows, post_rows)`` with rows as plain tuples"""
+    inputs = {name: values[name] for name in ROW_INPUT_FIELDS}
+    analysis = EconomicAnalysis(**inputs)
+    analysis.evaluee = Evaluee(date_of_birth=values['evaluee__date_of_birth'])
+    pre, post = build_injury_rows(analysis)
+    return values['id'], _row_tuples(pre), _row_tuples(post)
+
+
+def recalculate_batch(records):
+    """Return ``(results, failures)``, failures as ``(analysis_id, message)``"""
+    results = []
+    failures = []
+    for values in records:
+        try:
+            results.append(rows_from_values(values))
+        except ValueError as e:
+            failures.append((values['id'], str(e)))
+    return results, failures
+
+
+def _sync_rows(model, generated):
+    """
+    Make the stored rows of each analysis match ``generated``.
+
+    Existing rows are matched by year and updated in place; missing years
+    are created and years no longer produced are deleted.
+    """
+    existing = {}
+    stale = []
+    for row in model.objects.filter(analysis_id__in=list(generated)).order_by('pk'):
+        if existing.setdefault((row.analysis_id, row.year), row) is not row:
+            stale.append(row.pk)
+
+    to_update = []
+    to_create = []
+    for analysis_id, rows in generated.items():
+        for year, portion_of_year, age, wage_base_years in rows:
+            row = existing.pop((analysis_id, year), None)
+            if row is None:
+                to_create.append(model(
+                    analysis_id=analysis_id,
+                    year=year,
+                    portion_of_year=portion_of_year,
+                    age=age,
+                    wage_base_years=wage_base_years,
+                ))
+                continue
+            row.portion_of_year = portion_of_year
+            row.age = age
+            row.wage_base_years = wage_base_years
+            to_update.append(row)
+
+    stale.extend(row.pk for row in existing.values())
+    model.objects.bulk_update(to_update, ROW_VALUE_FIELDS, batch_size=500)
+    model.objects.bulk_create(to_create, batch_size=500)
+    if stale:
+        model.objects.filter(pk__in=stale).delete()
+
+
+def write_rows(results):
+    """Persist a batch of ``rows_from_values`` results in one transaction"""
+    analysis_ids = [analysis_id for analysis_id, _, _ in results]
+    with transaction.atomic():
+        _sync_rows(PreInjuryRow, {analysis_id: pre for analysis_id, pre, _ in results})
+        _sync_rows(PostInjuryRow, {analysis_id: post for analysis_id, _, post in results})
+        # Bulk writes skip the row signals, so drop cached results explicitly
+        invalidate_calculation(*analysis_ids)
+    return len(analysis_ids)
@@ -0,0 +1,90 @@
+"""
+Background rendering of analysis reports.
+
+Jobs are queued as ``ReportJob`` rows and claimed with a conditional UPDATE,
+so the database itself acts as the broker and any number of worker
+processes can poll it without Redis or Celery. Finished artifacts are
+written under ``settings.REPORT_JOB_ROOT``.
+"""
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ReportJob
+from .reports import REPORT_FORMATS, report_filename
+
+
+def report_job_root():
+    return Path(getattr(settings, 'REPORT_JOB_ROOT', Path(settings.BASE_DIR) / 'report_jobs'))
+
+
+def enqueue_report(analysis, report_type):
+    if report_type not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report type: {report_type}")
+    return ReportJob.objects.create(analysis=analysis, report_type=report_type)
+
+
+def claim_job(job_id):
+    """Mark a pending job as running; False if another worker claimed it first"""
+    return ReportJob.objects.filter(id=job_id, status=ReportJob.STATUS_PENDING).update(
+        status=ReportJob.STATUS_RUNNING,
+        started_at=timezone.now(),
+        progress=0,
+    ) == 1
+
+
+def claim_pending_jobs(limit):
+    """Claim up to ``limit`` pending jobs, oldest first, and return their ids"""
+    if limit <= 0:
+        return []
+    pending = ReportJob.objects.filter(status=ReportJob.STATUS_PENDING).values_list('id', flat=True)
+    return [job_id for job_id in pending[:limit] if claim_job(job_id)]
+
+
+def requeue_stale_jobs(older_than):
+    """Return jobs left running by a crashed worker to the queue"""
+    return ReportJob.objects.filter(
+        status=ReportJob.STATUS_RUNNING,
+        started_at__lt=timezone.now() - timedelta(seconds=older_than),
+    ).update(status=ReportJob.STATUS_PENDING, started_at=None, progress=0)
+
+
+def _update_job(job_id, **fields):
+    ReportJob.objects.filter(id=job_id).update(**fields)
+
+
+def fail_job(job_id, error):
+    """Record a job as failed with ``error``"""
+    _update_job(job_id, status=ReportJob.STATUS_FAILED, error=error, finished_at=timezone.now())
+
+
+def run_report_job(job_id):
+    """Render a claimed job's report to disk and record the outcome"""
+    job = ReportJob.objects.select_related('analysis__evaluee').get(id=job_id)
+    try:
+        report_format = REPORT_FORMATS[job.report_type]
+        directory = report_job_root()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{job.id}_{report_filename(job.report_type, job.analysis_id)}'
+        partial_path = path.with_name(path.name + '.part')
+        _update_job(job_id, progress=10)
+
+        with open(partial_path, 'wb') as fileobj:
+            report_format.writer(job.analysis, fileobj)
+        _update_job(job_id, progress=90)
+        os.replace(partial_path, path)
+    except Exception as e:
+        fail_job(job_id, str(e))
+        return False
+
+    _update_job(
+        job_id,
+        status=ReportJob.STATUS_COMPLETED,
+        progress=100,
+        artifact_path=str(path),
+        finished_at=timezone.now(),
+    )
+    return True
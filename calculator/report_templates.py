@@ -0,0 +1,82 @@
+"""
+Precompiled Word report templates.
+
+Building a ``docx.Document`` from scratch loads and parses python-docx's
+default template, and filling a table through ``table.add_row().cells``
+re-walks the table for every row. Instead, each report layout is built once
+per process into a skeleton holding its static headings and table headers,
+with ``{placeholder}`` paragraphs for the per-analysis text. Reports
+deep-copy the skeleton, format the placeholders, and append exhibit rows to
+its tables as copies of a prebuilt row element.
+"""
+import copy
+import threading
+
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+
+class ReportTemplate:
+    """A document skeleton built on first use by ``build()`` and cloned per report"""
+
+    def __init__(self, build):
+        self._build = build
+        self._document = None
+        self._lock = threading.Lock()
+
+    def clone(self):
+        if self._document is None:
+            with self._lock:
+                if self._document is None:
+                    self._document = self._build()
+        # Copy the part rather than the Document proxy, which caches its body
+        # element; lxml copies that element apart from the copied document tree
+        return copy.deepcopy(self._document.part).document
+
+
+def fill_placeholders(document, values):
+    """Format every body paragraph that holds a placeholder with ``values``"""
+    for paragraph in document.paragraphs:
+        if '{' not in paragraph.text:
+            continue
+        # Skeleton placeholders are written as a single run
+        run = paragraph.runs[0]
+        run.text = run.text.format_map(values)
+
+
+def _row_prototype(table):
+    """An empty row whose cells copy the properties of the table's first row"""
+    tr = OxmlElement('w:tr')
+    for tc in table._tbl.tr_lst[0].tc_lst:
+        cell = OxmlElement('w:tc')
+        if tc.tcPr is not None:
+            cell.append(copy.deepcopy(tc.tcPr))
+        paragraph = OxmlElement('w:p')
+        run = OxmlElement('w:r')
+        run.append(OxmlElement('w:t'))
+        paragraph.append(run)
+        cell.append(paragraph)
+        tr.append(cell)
+    return tr
+
+
+def append_table_rows(table, rows):
+    """
+    Append rows of cell strings to a table.
+
+    Each row is a copy of one prototype row element with its text nodes
+    set, the same markup ``table.add_row()`` plus ``cell.text`` produces.
+    """
+    if not rows:
+        return
+    prototype = _row_prototype(table)
+    text_tag = qn('w:t')
+    space = qn('xml:space')
+    tbl = table._tbl
+    for cells in rows:
+        tr = copy.deepcopy(prototype)
+        for t, text in zip(tr.iter(text_tag), cells):
+            t.text = text
+            if text != text.strip():
+                t.set(space, 'preserve')
+        tbl.append(tr)
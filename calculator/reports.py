@@ -0,0 +1,220 @@
+"""
+Report writers for an analysis, keyed by report type.
+
+Each writer renders one report into a binary file object, so the same code
+serves the synchronous export actions and background ``ReportJob`` workers.
+Word reports are cloned from skeletons in ``report_templates``.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+from docx import Document
+from openpyxl import Workbook
+
+from .excel_export import EXHIBIT_HEADERS, XLSX_CONTENT_TYPE, write_analysis_workbook
+from .projection import project_analysis
+from .report_templates import ReportTemplate, append_table_rows, fill_placeholders
+
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+
+def _exhibit_cells(exhibit):
+    """One list of formatted cell strings per projected exhibit row"""
+    return [
+        [
+            str(row['year']),
+            row['portion_of_year'],
+            f"{row['age']:.1f}",
+            f"${row['wage_base_years']:,.2f}",
+            f"${row['gross_earnings']:,.2f}",
+            f"${row['adjusted_earnings']:,.2f}",
+            f"${row['benefits_loss']:,.2f}",
+            f"${row['insurance_loss']:,.2f}",
+        ]
+        for row in exhibit.row_dicts()
+    ]
+
+
+def _add_exhibit_table(doc):
+    table = doc.add_table(rows=1, cols=8)
+    table.style = 'Table Grid'
+    for cell, header in zip(table.rows[0].cells, EXHIBIT_HEADERS):
+        cell.text = header
+
+
+def _build_analysis_document():
+    doc = Document()
+    doc.add_heading('Economic Analysis Report', 0)
+
+    # Add personal information section
+    doc.add_heading('Personal Information', level=1)
+    doc.add_paragraph('Name: {first_name} {last_name}')
+    doc.add_paragraph('Date of Birth: {date_of_birth}')
+    doc.add_paragraph('Date of Injury: {date_of_injury}')
+    doc.add_paragraph('Date of Report: {date_of_report}')
+
+    # Add pre-injury and post-injury earnings sections
+    doc.add_heading('Pre-Injury Earnings', level=1)
+    _add_exhibit_table(doc)
+    doc.add_heading('Post-Injury Earnings', level=1)
+    _add_exhibit_table(doc)
+    return doc
+
+
+ANALYSIS_DOCUMENT = ReportTemplate(_build_analysis_document)
+
+
+def write_analysis_document(analysis, fileobj):
+    """Word report with personal information and both exhibit tables"""
+    doc = ANALYSIS_DOCUMENT.clone()
+    fill_placeholders(doc, {
+        'first_name': analysis.evaluee.first_name,
+        'last_name': analysis.evaluee.last_name,
+        'date_of_birth': analysis.evaluee.date_of_birth,
+        'date_of_injury': analysis.date_of_injury,
+        'date_of_report': analysis.date_of_report,
+    })
+
+    pre, post = project_analysis(analysis)
+    pre_table, post_table = doc.tables
+    append_table_rows(pre_table, _exhibit_cells(pre))
+    append_table_rows(post_table, _exhibit_cells(post))
+
+    doc.save(fileobj)
+
+
+def write_summary_workbook(analysis, fileobj):
+    """One-sheet Excel summary of the analysis inputs"""
+    # Create workbook
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Economic Analysis"
+
+    # Add headers
+    ws['A1'] = "Economic Analysis Report"
+    ws['A2'] = f"Evaluee: {analysis.evaluee.first_name} {analysis.evaluee.last_name}"
+    ws['A3'] = f"Date of Injury: {analysis.date_of_injury}"
+    ws['A4'] = f"Date of Report: {analysis.date_of_report}"
+
+    # Add analysis details
+    ws['A6'] = "Pre-Injury Base Wage"
+    ws['B6'] = analysis.pre_injury_base_wage
+    ws['A7'] = "Post-Injury Base Wage"
+    ws['B7'] = analysis.post_injury_base_wage
+    ws['A8'] = "Growth Rate"
+    ws['B8'] = f"{analysis.growth_rate * 100}%"
+    ws['A9'] = "Adjustment Factor"
+    ws['B9'] = analysis.adjustment_factor
+
+    if analysis.include_health_insurance:
+        ws['A11'] = "Health Insurance"
+        ws['B11'] = analysis.health_insurance_base
+        ws['A12'] = "Health Cost Inflation Rate"
+        ws['B12'] = f"{analysis.health_cost_inflation_rate * 100}%"
+
+    if analysis.include_pension:
+        ws['A14'] = "Pension Information"
+        ws['B14'] = analysis.pension_type
+        if analysis.pension_type == 'defined_benefit':
+            ws['A15'] = "Final Average Salary"
+            ws['B15'] = analysis.final_average_salary
+            ws['A16'] = "Years of Service"
+            ws['B16'] = analysis.years_of_service
+            ws['A17'] = "Benefit Multiplier"
+            ws['B17'] = f"{analysis.benefit_multiplier * 100}%"
+        else:
+            ws['A15'] = "Annual Contribution"
+            ws['B15'] = analysis.annual_contribution
+            ws['A16'] = "Expected Return Rate"
+            ws['B16'] = f"{analysis.expected_return_rate * 100}%"
+
+    wb.save(fileobj)
+
+
+@lru_cache(maxsize=None)
+def _summary_document(include_health_insurance, defined_benefit):
+    """
+    Summary skeleton for one layout; ``defined_benefit`` is None without a
+    pension, otherwise whether the pension is a defined benefit plan.
+    """
+    def build():
+        doc = Document()
+        doc.add_heading('Economic Analysis Report', 0)
+
+        # Add evaluee information
+        doc.add_paragraph("Evaluee: {first_name} {last_name}")
+        doc.add_paragraph("Date of Injury: {date_of_injury}")
+        doc.add_paragraph("Date of Report: {date_of_report}")
+
+        # Add analysis details
+        doc.add_heading('Analysis Details', level=1)
+        doc.add_paragraph("Pre-Injury Base Wage: ${pre_injury_base_wage:,.2f}")
+        doc.add_paragraph("Post-Injury Base Wage: ${post_injury_base_wage:,.2f}")
+        doc.add_paragraph("Growth Rate: {growth_rate_percent}%")
+        doc.add_paragraph("Adjustment Factor: {adjustment_factor}")
+
+        if include_health_insurance:
+            doc.add_heading('Health Insurance', level=1)
+            doc.add_paragraph("Base Amount: ${health_insurance_base:,.2f}")
+            doc.add_paragraph("Inflation Rate: {health_cost_inflation_percent}%")
+
+        if defined_benefit is not None:
+            doc.add_heading('Pension Information', level=1)
+            doc.add_paragraph("Pension Type: {pension_type}")
+            if defined_benefit:
+                doc.add_paragraph("Final Average Salary: ${final_average_salary:,.2f}")
+                doc.add_paragraph("Years of Service: {years_of_service}")
+                doc.add_paragraph("Benefit Multiplier: {benefit_multiplier_percent}%")
+            else:
+                doc.add_paragraph("Annual Contribution: ${annual_contribution:,.2f}")
+                doc.add_paragraph("Expected Return Rate: {expected_return_percent}%")
+        return doc
+
+    return ReportTemplate(build)
+
+
+def write_summary_document(analysis, fileobj):
+    """Word summary of the analysis inputs"""
+    values = {
+        'first_name': analysis.evaluee.first_name,
+        'last_name': analysis.evaluee.last_name,
+        'date_of_injury': analysis.date_of_injury,
+        'date_of_report': analysis.date_of_report,
+        'pre_injury_base_wage': analysis.pre_injury_base_wage,
+        'post_injury_base_wage': analysis.post_injury_base_wage,
+        'growth_rate_percent': analysis.growth_rate * 100,
+        'adjustment_factor': analysis.adjustment_factor,
+    }
+    if analysis.include_health_insurance:
+        values['health_insurance_base'] = analysis.health_insurance_base
+        values['health_cost_inflation_percent'] = analysis.health_cost_inflation_rate * 100
+
+    defined_benefit = None
+    if analysis.include_pension:
+        defined_benefit = analysis.pension_type == 'defined_benefit'
+        values['pension_type'] = analysis.pension_type
+        if defined_benefit:
+            values['final_average_salary'] = analysis.final_average_salary
+            values['years_of_service'] = analysis.years_of_service
+            values['benefit_multiplier_percent'] = analysis.benefit_multiplier * 100
+        else:
+            values['annual_contribution'] = analysis.annual_contribution
+            values['expected_return_percent'] = analysis.expected_return_rate * 100
+
+    doc = _summary_document(bool(analysis.include_health_insurance), defined_benefit).clone()
+    fill_placeholders(doc, values)
+    doc.save(fileobj)
+
+
+ReportFormat = namedtuple('ReportFormat', ['writer', 'extension', 'content_type'])
+
+REPORT_FORMATS = {
+    'export_excel': ReportFormat(write_analysis_workbook, 'xlsx', XLSX_CONTENT_TYPE),
+    'export_word': ReportFormat(write_analysis_document, 'docx', DOCX_CONTENT_TYPE),
+    'excel': ReportFormat(write_summary_workbook, 'xlsx', XLSX_CONTENT_TYPE),
+    'word': ReportFormat(write_summary_document, 'docx', DOCX_CONTENT_TYPE),
+}
+
+
+def report_filename(report_type, analysis_id):
+    return f'analysis_{analysis_id}.{REPORT_FORMATS[report_type].extension}'
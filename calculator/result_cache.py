@@ -0,0 +1,57 @@
+"""
+Persisted cache of ``calculate`` results.
+
+A stored ``CalculationResult`` is served as long as the fingerprint of the
+analysis and evaluee inputs still matches. Changes to the yearly rows are
+not part of the lookup (reading them would cost the queries the cache is
+meant to save); instead the save/delete signals in ``calculator.signals``
+drop the stored result, and bulk writers call ``invalidate_calculation``.
+
+Stored results never expire, so bump ``CALCULATION_VERSION`` whenever the
+projection math or the shape of the ``calculate`` response changes; it is
+hashed into every fingerprint, so results from the old code stop matching.
+"""
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import CalculationResult
+
+EXCLUDED_FIELDS = {'id', 'created_at', 'updated_at'}
+EVALUEE_FIELDS = ('first_name', 'last_name', 'date_of_birth')
+CALCULATION_VERSION = 1
+
+
+def analysis_fingerprint(analysis):
+    """Stable SHA-256 of the analysis inputs, the evaluee details and ``CALCULATION_VERSION``"""
+    inputs = {
+        field.attname: getattr(analysis, field.attname)
+        for field in analysis._meta.concrete_fields
+        if field.attname not in EXCLUDED_FIELDS
+    }
+    inputs['evaluee'] = {name: getattr(analysis.evaluee, name) for name in EVALUEE_FIELDS}
+    inputs['calculation_version'] = CALCULATION_VERSION
+    payload = json.dumps(inputs, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_cached_calculation(analysis, fingerprint):
+    """Return the stored result data, or None when missing or stale"""
+    return (
+        CalculationResult.objects
+        .filter(analysis_id=analysis.pk, fingerprint=fingerprint)
+        .values_list('data', flat=True)
+        .first()
+    )
+
+
+def store_calculation(analysis, fingerprint, data):
+    CalculationResult.objects.update_or_create(
+        analysis_id=analysis.pk,
+        defaults={'fingerprint': fingerprint, 'data': data},
+    )
+
+
+def invalidate_calculation(*analysis_ids):
+    CalculationResult.objects.filter(analysis_id__in=analysis_ids).delete()
@@ -0,0 +1,99 @@
+"""
+Generation of the yearly pre- and post-injury rows of an analysis.
+
+``build_injury_rows`` is a pure function of the analysis inputs: it returns
+unsaved ``PreInjuryRow``/``PostInjuryRow`` instances so callers can persist
+them with ``bulk_create`` in a single transaction. Growth factors are indexed
+by years from the injury, so a report dated before the injury is rejected.
+"""
+from datetime import date
+
+from .factor_tables import factor_tables
+from .models import PreInjuryRow, PostInjuryRow
+from .profiling import profiled
+
+
+def _days_in_year(year):
+    return (date(year + 1, 1, 1) - date(year, 1, 1)).days
+
+
+def build_pre_injury_rows(analysis, age_at_injury):
+    """Rows from the injury date to the report date"""
+    injury_date = analysis.date_of_injury
+    report_date = analysis.date_of_report
+    growth = factor_tables.growth_factors(
+        analysis.growth_rate, max(report_date.year - injury_date.year + 1, 0)
+    ).tolist()
+
+    rows = []
+    for current_year in range(injury_date.year, report_date.year + 1):
+        # For first year, calculate portion of year from injury date
+        if current_year == injury_date.year:
+            days_remaining = (date(current_year + 1, 1, 1) - injury_date).days
+            portion_of_year = days_remaining / _days_in_year(current_year)
+        # For last year, calculate portion of year until report date
+        elif current_year == report_date.year:
+            days_elapsed = (report_date - date(current_year, 1, 1)).days
+            portion_of_year = days_elapsed / _days_in_year(current_year)
+        else:
+            portion_of_year = 1.0
+
+        years_from_injury = current_year - injury_date.year
+        rows.append(PreInjuryRow(
+            analysis=analysis,
+            year=current_year,
+            portion_of_year=portion_of_year,
+            age=age_at_injury + years_from_injury,
+            wage_base_years=analysis.pre_injury_base_wage * growth[years_from_injury],
+        ))
+    return rows
+
+
+def build_post_injury_rows(analysis, age_at_injury):
+    """Rows from the report date to the end of worklife"""
+    injury_date = analysis.date_of_injury
+    report_date = analysis.date_of_report
+    worklife_expectancy = analysis.worklife_expectancy
+    end_year = report_date.year + int(worklife_expectancy)
+    growth = factor_tables.growth_factors(
+        analysis.growth_rate, max(end_year - injury_date.year + 1, 0)
+    ).tolist()
+
+    rows = []
+    for current_year in range(report_date.year, end_year + 1):
+        # For first year, calculate portion of year from report date
+        if current_year == report_date.year:
+            days_remaining = (date(current_year + 1, 1, 1) - report_date).days
+            portion_of_year = days_remaining / _days_in_year(current_year)
+        # For last year, calculate portion until end of worklife
+        elif current_year == end_year:
+            portion_of_year = worklife_expectancy % 1
+            if portion_of_year == 0:
+                portion_of_year = 1.0
+        else:
+            portion_of_year = 1.0
+
+        # Wage base years represents the loss (difference between pre and post injury wages)
+        years_from_injury = current_year - injury_date.year
+        pre_wage = analysis.pre_injury_base_wage * growth[years_from_injury]
+        post_wage = analysis.post_injury_base_wage * growth[years_from_injury]
+        rows.append(PostInjuryRow(
+            analysis=analysis,
+            year=current_year,
+            portion_of_year=portion_of_year,
+            age=age_at_injury + years_from_injury,
+            wage_base_years=pre_wage - post_wage,
+        ))
+    return rows
+
+
+@profiled('calculation')
+def build_injury_rows(analysis):
+    """Return unsaved ``(pre_injury_rows, post_injury_rows)`` for an analysis"""
+    if analysis.date_of_report < analysis.date_of_injury:
+        raise ValueError('Date of report cannot be before the date of injury')
+    age_at_injury = (analysis.date_of_injury - analysis.evaluee.date_of_birth).days / 365.25
+    return (
+        build_pre_injury_rows(analysis, age_at_injury),
+        build_post_injury_rows(analysis, age_at_injury),
+    )
@@ -1,8 +1,11 @@
 from rest_framework import serializers
-from .models import EconomicAnalysis, PreInjuryRow, PostInjuryRow, Evaluee, HealthcareCategory, HealthcarePlan, HealthcareCost
-from datetime import date
+from django.db import transaction
+from .models import EconomicAnalysis, PreInjuryRow, PostInjuryRow, Evaluee, HealthcareCategory, HealthcarePlan, HealthcareCost, ReportJob
+from .aef import adjustment_factor_from_aef, normalize_aef_inputs
+from .profiling import ProfiledSerializerMixin
+from .row_generation import build_injury_rows
 
-class EvalueeSerializer(serializers.ModelSerializer):
+class EvalueeSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     date_of_birth = serializers.DateField(format='%Y-%m-%d')
     created_at = serializers.DateTimeField(format='%Y-%m-%d %H:%M:%S', read_only=True)
     updated_at = serializers.DateTimeField(format='%Y-%m-%d %H:%M:%S', read_only=True)
@@ -11,17 +14,17 @@ class EvalueeSerializer(serializers.ModelSerializer):
         model = Evaluee
         fields = ['id', 'first_name', 'last_name', 'date_of_birth', 'notes', 'created_at', 'updated_at']
 
-class PreInjuryRowSerializer(serializers.ModelSerializer):
+class PreInjuryRowSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = PreInjuryRow
         fields = ['year', 'portion_of_year', 'age', 'wage_base_years']
 
-class PostInjuryRowSerializer(serializers.ModelSerializer):
+class PostInjuryRowSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = PostInjuryRow
         fields = ['year', 'portion_of_year', 'age', 'wage_base_years']
 
-class EconomicAnalysisSerializer(serializers.ModelSerializer):
+class EconomicAnalysisSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     pre_injury_rows = PreInjuryRowSerializer(many=True, required=False)
     post_injury_rows = PostInjuryRowSerializer(many=True, required=False)
     evaluee = EvalueeSerializer(read_only=True)
@@ -44,8 +47,10 @@ class EconomicAnalysisSerializer(serializers.ModelSerializer):
             'post_injury_base_wage',
             'growth_rate',
             'adjustment_factor',
+            'aef_inputs',
             'apply_discounting',
             'discount_rate',
+            'discount_convention',
             'pre_injury_rows',
             'post_injury_rows',
             'age_at_injury',
@@ -63,114 +68,72 @@ class EconomicAnalysisSerializer(serializers.ModelSerializer):
             'updated_at'
         ]
 
+    def validate(self, attrs):
+        date_of_injury = attrs.get('date_of_injury', getattr(self.instance, 'date_of_injury', None))
+        date_of_report = attrs.get('date_of_report', getattr(self.instance, 'date_of_report', None))
+        if date_of_injury and date_of_report and date_of_report < date_of_injury:
+            raise serializers.ValidationError(
+                {'date_of_report': 'Date of report cannot be before the date of injury'}
+            )
+
+        # AEF inputs, when given, replace a typed-in adjustment factor; a typed-in
+        # factor without them drops any AEF the analysis referenced before
+        aef_inputs = attrs.get('aef_inputs')
+        if aef_inputs is not None:
+            try:
+                attrs['aef_inputs'] = normalize_aef_inputs(aef_inputs)
+            except ValueError as e:
+                raise serializers.ValidationError({'aef_inputs': str(e)})
+            adjustment_factor = adjustment_factor_from_aef(attrs['aef_inputs'])
+            if not 0.0 <= adjustment_factor <= 2.0:
+                raise serializers.ValidationError(
+                    {'aef_inputs': f'Computed adjustment factor {adjustment_factor:.4f} is outside 0 to 2'}
+                )
+            attrs['adjustment_factor'] = adjustment_factor
+        elif 'adjustment_factor' in attrs and 'aef_inputs' not in attrs:
+            attrs['aef_inputs'] = None
+        return attrs
+
     def create(self, validated_data):
-        pre_injury_rows_data = validated_data.pop('pre_injury_rows', [])
-        post_injury_rows_data = validated_data.pop('post_injury_rows', [])
+        validated_data.pop('pre_injury_rows', [])
+        validated_data.pop('post_injury_rows', [])
         
         try:
-            # Create the analysis instance
-            analysis = EconomicAnalysis.objects.create(**validated_data)
-            
-            injury_date = validated_data['date_of_injury']
-            report_date = validated_data['date_of_report']
-            worklife_expectancy = validated_data['worklife_expectancy']
-            
-            # Calculate ages using the evaluee object
-            evaluee = validated_data['evaluee']
-            age_at_injury = (injury_date - evaluee.date_of_birth).days / 365.25
-            
-            # Generate pre-injury rows (from injury date to report date)
-            current_year = injury_date.year
-            end_year = report_date.year
-            
-            while current_year <= end_year:
-                # For first year, calculate portion of year from injury date
-                if current_year == injury_date.year:
-                    days_in_year = (date(current_year + 1, 1, 1) - date(current_year, 1, 1)).days
-                    days_remaining = (date(current_year + 1, 1, 1) - injury_date).days
-                    portion_of_year = days_remaining / days_in_year
-                # For last year, calculate portion of year until report date
-                elif current_year == report_date.year:
-                    days_in_year = (date(current_year + 1, 1, 1) - date(current_year, 1, 1)).days
-                    days_elapsed = (report_date - date(current_year, 1, 1)).days
-                    portion_of_year = days_elapsed / days_in_year
-                else:
-                    portion_of_year = 1.0
-                
-                # Calculate wage base with growth
-                years_from_injury = current_year - injury_date.year
-                wage_base = validated_data['pre_injury_base_wage'] * (1 + validated_data['growth_rate']) ** years_from_injury
-                
-                PreInjuryRow.objects.create(
-                    analysis=analysis,
-                    year=current_year,
-                    portion_of_year=portion_of_year,
-                    age=age_at_injury + years_from_injury,
-                    wage_base_years=wage_base
-                )
-                
-                current_year += 1
-            
-            # Generate post-injury rows (from report date to retirement)
-            current_year = report_date.year
-            end_year = current_year + int(worklife_expectancy)
-            
-            while current_year <= end_year:
-                # For first year, calculate portion of year from report date
-                if current_year == report_date.year:
-                    days_in_year = (date(current_year + 1, 1, 1) - date(current_year, 1, 1)).days
-                    days_remaining = (date(current_year + 1, 1, 1) - report_date).days
-                    portion_of_year = days_remaining / days_in_year
-                # For last year, calculate portion until end of worklife
-                elif current_year == end_year:
-                    portion_of_year = worklife_expectancy % 1
-                    if portion_of_year == 0:
-                        portion_of_year = 1.0
-                else:
-                    portion_of_year = 1.0
-                
-                # Calculate pre and post injury wages with growth
-                years_from_injury = current_year - injury_date.year
-                pre_wage = validated_data['pre_injury_base_wage'] * (1 + validated_data['growth_rate']) ** years_from_injury
-                post_wage = validated_data['post_injury_base_wage'] * (1 + validated_data['growth_rate']) ** years_from_injury
-                
-                # Wage base years represents the loss (difference between pre and post injury wages)
-                wage_base = pre_wage - post_wage
-                
-                PostInjuryRow.objects.create(
-                    analysis=analysis,
-                    year=current_year,
-                    portion_of_year=portion_of_year,
-                    age=age_at_injury + years_from_injury,
-                    wage_base_years=wage_base
-                )
-                
-                current_year += 1
-
+            with transaction.atomic():
+                analysis = EconomicAnalysis.objects.create(**validated_data)
+                pre_injury_rows, post_injury_rows = build_injury_rows(analysis)
+                PreInjuryRow.objects.bulk_create(pre_injury_rows)
+                PostInjuryRow.objects.bulk_create(post_injury_rows)
             return analysis
             
         except Exception as e:
-            # If anything fails during creation, delete the analysis and re-raise
-            if 'analysis' in locals():
-                analysis.delete()
+            # The transaction has rolled back the analysis and any rows
             raise serializers.ValidationError(f"Failed to calculate analysis: {str(e)}")
 
-class HealthcareCategorySerializer(serializers.ModelSerializer):
+class HealthcareCategorySerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = HealthcareCategory
         fields = ['id', 'name', 'description', 'growth_rate', 'frequency_years', 'created_at', 'updated_at']
 
-class HealthcarePlanSerializer(serializers.ModelSerializer):
+class HealthcarePlanSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     category = HealthcareCategorySerializer(read_only=True)
-    category_id = serializers.IntegerField(write_only=True)
+    category_id = serializers.PrimaryKeyRelatedField(
+        source='category', queryset=HealthcareCategory.objects.all(), write_only=True
+    )
 
     class Meta:
         model = HealthcarePlan
         fields = ['id', 'analysis', 'category', 'category_id', 'base_cost', 'is_active', 'created_at', 'updated_at']
         read_only_fields = ['analysis']
 
-class HealthcareCostSerializer(serializers.ModelSerializer):
+class HealthcareCostSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = HealthcareCost
         fields = ['id', 'plan', 'year', 'age', 'cost', 'created_at', 'updated_at']
         read_only_fields = ['plan']
+
+class ReportJobSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ReportJob
+        fields = ['id', 'analysis', 'report_type', 'status', 'progress', 'error', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import EconomicAnalysis, PreInjuryRow, PostInjuryRow
+from .result_cache import invalidate_calculation
+
+
+@receiver([post_save, post_delete], sender=EconomicAnalysis)
+def invalidate_analysis_calculation(sender, instance, **kwargs):
+    """Drop the stored calculation when the analysis itself changes"""
+    if kwargs.get('created'):
+        return
+    invalidate_calculation(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=PreInjuryRow)
+@receiver([post_save, post_delete], sender=PostInjuryRow)
+def invalidate_row_calculation(sender, instance, **kwargs):
+    """Drop the stored calculation when one of its rows changes"""
+    # Rows cascade-deleted with their analysis (or evaluee) take the result with them
+    origin = kwargs.get('origin')
+    if origin is not None and getattr(origin, 'model', type(origin)) is not sender:
+        return
+    invalidate_calculation(instance.analysis_id)
@@ -0,0 +1,238 @@
+"""
+Monte Carlo simulation of the post-injury present value.
+
+Growth rate, discount rate, worklife expectancy and adjustment factor are
+sampled from configurable distributions. Each chunk of draws lays out the
+post-injury rows of every draw as one ``(draws, years)`` matrix, built the
+same way as ``build_post_injury_rows``. The matrix is discounted with
+``projection.discount_offsets`` and ``projection.discount_factors`` under the
+analysis' discounting convention, so a chunk is evaluated in a single NumPy
+pass.
+
+Chunks are seeded from ``SeedSequence(seed).spawn`` so results depend only on
+the seed and chunk size, not on how many processes evaluate them. Nothing here
+reads Django settings or the database, so chunks can run in spawned workers
+without ``django.setup``.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from .projection import ProjectionParameters, RowArrays, discount_factors, discount_offsets
+
+SAMPLED_FIELDS = ('growth_rate', 'discount_rate', 'worklife_expectancy', 'adjustment_factor')
+DISTRIBUTION_PARAMETERS = {
+    'fixed': ('value',),
+    'uniform': ('low', 'high'),
+    'normal': ('mean', 'std'),
+    'triangular': ('low', 'mode', 'high'),
+}
+RATE_FIELDS = ('growth_rate', 'discount_rate')
+# Sampled rates are clipped here, so normal tails never reach -100%
+RATE_FLOOR = -0.99
+PERCENTILES = (5, 50, 95)
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """A sampling distribution, e.g. ``Distribution('normal', {'mean': 0.03, 'std': 0.005})``"""
+    kind: str
+    parameters: dict
+
+    def __post_init__(self):
+        if self.kind not in DISTRIBUTION_PARAMETERS:
+            raise ValueError(f"Unknown distribution '{self.kind}'; expected one of: {', '.join(DISTRIBUTION_PARAMETERS)}")
+        required = DISTRIBUTION_PARAMETERS[self.kind]
+        if set(self.parameters) != set(required):
+            raise ValueError(f"A {self.kind} distribution takes: {', '.join(required)}")
+        object.__setattr__(self, 'parameters', {name: float(self.parameters[name]) for name in required})
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Build from a number (fixed value) or ``{'distribution': kind, **parameters}``"""
+        if isinstance(spec, (int, float)):
+            return cls('fixed', {'value': spec})
+        spec = dict(spec)
+        return cls(spec.pop('distribution', 'fixed'), spec)
+
+    @property
+    def mean(self):
+        p = self.parameters
+        if self.kind == 'fixed':
+            return p['value']
+        if self.kind == 'uniform':
+            return (p['low'] + p['high']) / 2
+        if self.kind == 'normal':
+            return p['mean']
+        return (p['low'] + p['mode'] + p['high']) / 3
+
+    @property
+    def lower_bound(self):
+        """The smallest value the distribution can draw; the mean for a normal"""
+        p = self.parameters
+        if self.kind == 'fixed':
+            return p['value']
+        if self.kind == 'normal':
+            return p['mean']
+        return p['low']
+
+    def sample(self, rng, size):
+        p = self.parameters
+        if self.kind == 'fixed':
+            return np.full(size, p['value'])
+        if self.kind == 'uniform':
+            return rng.uniform(p['low'], p['high'], size)
+        if self.kind == 'normal':
+            return rng.normal(p['mean'], p['std'], size)
+        return rng.triangular(p['low'], p['mode'], p['high'], size)
+
+
+@dataclass(frozen=True)
+class SimulationModel:
+    """The fixed inputs of an analysis plus a distribution per sampled field"""
+    annual_wage_loss: float
+    first_portion_of_year: float
+    params: ProjectionParameters
+    distributions: dict
+
+    @classmethod
+    def from_analysis(cls, analysis, specs=None):
+        """
+        Model an analysis; ``specs`` maps sampled fields to distribution specs.
+
+        Fields without a spec stay fixed at the analysis' own value; the
+        discount rate is zero when the analysis does not apply discounting.
+        Rate specs that can draw -100% or less are rejected.
+        """
+        specs = dict(specs or {})
+        unknown = set(specs) - set(SAMPLED_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot sample: {', '.join(sorted(unknown))}")
+        report_date = analysis.date_of_report
+        next_year = date(report_date.year + 1, 1, 1)
+        days_in_year = (next_year - date(report_date.year, 1, 1)).days
+        defaults = {name: getattr(analysis, name) or 0.0 for name in SAMPLED_FIELDS}
+        if not analysis.apply_discounting:
+            defaults['discount_rate'] = 0.0
+        distributions = {
+            name: Distribution.from_spec(specs.get(name, defaults[name]))
+            for name in SAMPLED_FIELDS
+        }
+        for name in RATE_FIELDS:
+            if distributions[name].lower_bound <= -1:
+                raise ValueError(f'{name} must stay above -1 (-100%)')
+        return cls(
+            annual_wage_loss=analysis.pre_injury_base_wage - analysis.post_injury_base_wage,
+            first_portion_of_year=(next_year - report_date).days / days_in_year,
+            params=ProjectionParameters.from_analysis(analysis),
+            distributions=distributions,
+        )
+
+    def present_values(self, growth_rate, discount_rate, worklife_expectancy, adjustment_factor):
+        """Total post-injury present value for each draw of the input arrays"""
+        worklife_expectancy = np.clip(worklife_expectancy, 0, None)
+        whole_years = worklife_expectancy.astype(np.int64)[:, np.newaxis]
+        years_from_report = np.arange(int(whole_years.max(initial=0)) + 1)
+
+        # Portion of each year worked: partial first and last years, zero past retirement
+        last_portion = (worklife_expectancy % 1)[:, np.newaxis]
+        portion = np.where(years_from_report < whole_years, 1.0, 0.0)
+        portion = np.where(years_from_report == whole_years, np.where(last_portion == 0, 1.0, last_portion), portion)
+        portion[:, 0] = self.first_portion_of_year
+
+        years_from_injury = years_from_report + (self.params.report_year - self.params.injury_year)
+        growth = (1 + growth_rate[:, np.newaxis]) ** years_from_injury
+        rows = RowArrays(
+            year=np.broadcast_to(self.params.report_year + years_from_report, portion.shape),
+            portion_of_year=portion,
+            age=None,
+            wage_base_years=self.annual_wage_loss * growth,
+        )
+        convention = self.params.discount_convention
+        discount = discount_factors(
+            discount_rate[:, np.newaxis], discount_offsets(self.params, rows, convention), convention
+        )
+        gross = rows.wage_base_years * rows.portion_of_year
+        return adjustment_factor * (gross / discount).sum(axis=1)
+
+    def simulate_chunk(self, seed, size):
+        """Draw ``size`` samples from one child seed and evaluate them"""
+        rng = np.random.default_rng(seed)
+        draws = {name: self.distributions[name].sample(rng, size) for name in SAMPLED_FIELDS}
+        for name in RATE_FIELDS:
+            np.clip(draws[name], RATE_FLOOR, None, out=draws[name])
+        return self.present_values(**draws)
+
+    def point_estimate(self):
+        """Present value with every input at the mean of its distribution"""
+        draws = {name: np.array([self.distributions[name].mean]) for name in SAMPLED_FIELDS}
+        return float(self.present_values(**draws)[0])
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    draws: int
+    seed: int
+    mean: float
+    std: float
+    percentiles: dict
+    point_estimate: float
+
+    def as_dict(self):
+        return {
+            'draws': self.draws,
+            'seed': self.seed,
+            'mean': self.mean,
+            'std': self.std,
+            'percentiles': self.percentiles,
+            'point_estimate': self.point_estimate,
+        }
+
+
+def _chunk_sizes(draws, chunk_size):
+    full, remainder = divmod(draws, chunk_size)
+    return [chunk_size] * full + ([remainder] if remainder else [])
+
+
+def _simulate_chunk(model, seed, size):
+    return model.simulate_chunk(seed, size)
+
+
+def run_simulation(model, draws, seed=None, chunk_size=50000, processes=0):
+    """
+    Run ``draws`` samples of ``model`` and summarise total present value.
+
+    ``processes=0`` evaluates chunks in this process; otherwise they are
+    spread over a spawned process pool. Leaving ``seed`` out draws fresh
+    entropy, which is returned in the result so the run can be repeated.
+    """
+    if draws < 1:
+        raise ValueError('draws must be at least 1')
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    seed_sequence = np.random.SeedSequence(seed)
+    sizes = _chunk_sizes(draws, chunk_size)
+    seeds = seed_sequence.spawn(len(sizes))
+
+    if processes == 0:
+        chunks = [model.simulate_chunk(s, size) for s, size in zip(seeds, sizes)]
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(processes, mp_context=context) as executor:
+            chunks = list(executor.map(_simulate_chunk, [model] * len(sizes), seeds, sizes))
+
+    values = np.concatenate(chunks)
+    return SimulationResult(
+        draws=draws,
+        seed=seed_sequence.entropy,
+        mean=float(values.mean()),
+        std=float(values.std()),
+        percentiles={
+            f'p{q}': float(value)
+            for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))
+        },
+        point_estimate=model.point_estimate(),
+    )
@@ -0,0 +1,75 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from calculator.aef import AEF_DEFAULTS, adjustment_factor_from_aef, calculate_aef, evaluate_aef_batch
+from calculator.models import EconomicAnalysis
+
+
+class TestCalculateAEF:
+    def test_default_steps(self):
+        steps = calculate_aef(**AEF_DEFAULTS)
+        assert steps['worklife_adjusted'] == pytest.approx(85.7)
+        assert steps['unemployment_adjusted'] == pytest.approx(85.7 * 0.958)
+        assert steps['tax_adjusted'] == pytest.approx(85.7 * 0.958 * 0.78)
+        assert steps['fringe_benefits_adjusted'] == pytest.approx(85.7 * 0.958 * 0.78 * 1.235)
+        assert steps['final_aef'] == pytest.approx(85.7 * 0.958 * 0.78 * 1.235 * 0.7)
+
+    def test_batch_matches_single_evaluations(self):
+        vectors = [
+            {},
+            {'apply_personal_consumption': False},
+            {'base': 90, 'income_tax_rate': 15, 'fringe_benefits': 0},
+        ]
+        results = evaluate_aef_batch(vectors)
+        for vector, result in zip(vectors, results):
+            expected = calculate_aef(**{**AEF_DEFAULTS, **vector})
+            assert result == pytest.approx({name: float(value) for name, value in expected.items()})
+        assert results[1]['final_aef'] == results[1]['fringe_benefits_adjusted']
+
+    @pytest.mark.parametrize('vector, message', [
+        ({'income_tax_rate': -1}, r'inputs\[1\]\.income_tax_rate'),
+        ({'personal_consumption': 120}, 'cannot exceed 100%'),
+        ({'tax': 20}, 'unknown fields: tax'),
+        ({'base': 'abc'}, 'base must be a number'),
+    ])
+    def test_invalid_inputs(self, vector, message):
+        with pytest.raises(ValueError, match=message):
+            evaluate_aef_batch([{}, vector])
+
+    def test_personal_consumption_over_100_ignored_when_not_applied(self):
+        result = evaluate_aef_batch([{'personal_consumption': 120, 'apply_personal_consumption': False}])
+        assert result[0]['final_aef'] > 0
+
+
+@pytest.mark.django_db
+class TestAEFAPI:
+    def test_batch_endpoint(self):
+        response = APIClient().post(
+            reverse('aef-batch'), {'inputs': [{}, {'base': 50}] * 500}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 1000
+        first, second = response.data['results'][:2]
+        assert set(first) == set(response.data['steps'])
+        assert second['final_aef'] == pytest.approx(first['final_aef'] / 2)
+
+    def test_batch_endpoint_invalid(self):
+        response = APIClient().post(reverse('aef-batch'), {'inputs': [{'base': -5}]}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'inputs[0].base' in response.data['detail']
+
+    def test_analysis_references_computed_aef(self, analysis):
+        url = reverse('analysis-detail', kwargs={'pk': analysis.id})
+        client = APIClient()
+        response = client.patch(url, {'aef_inputs': {'income_tax_rate': 15}}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+        analysis = EconomicAnalysis.objects.get(pk=analysis.pk)
+        assert analysis.aef_inputs == {**AEF_DEFAULTS, 'income_tax_rate': 15.0}
+        assert analysis.adjustment_factor == pytest.approx(adjustment_factor_from_aef({'income_tax_rate': 15}))
+
+        response = client.patch(url, {'adjustment_factor': 0.8}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['aef_inputs'] is None
+        assert response.data['adjustment_factor'] == 0.8
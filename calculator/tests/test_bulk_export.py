@@ -0,0 +1,164 @@
+import io
+import os
+import zipfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from docx import Document
+from openpyxl import load_workbook
+from rest_framework import status
+from rest_framework.test import APIClient
+from calculator import bulk_export as bulk_export_module
+from calculator.bulk_export import render_exports, stream_export_zip
+from calculator.models import EconomicAnalysis, PostInjuryRow
+
+
+@pytest.fixture
+def analyses(analysis, evaluee):
+    analyses = [analysis] + [
+        EconomicAnalysis.objects.create(
+            evaluee=evaluee,
+            date_of_injury=analysis.date_of_injury,
+            date_of_report=analysis.date_of_report,
+            worklife_expectancy=20.0,
+            years_to_final_separation=20.0,
+            life_expectancy=40.0,
+            pre_injury_base_wage=50000 + i,
+            post_injury_base_wage=30000,
+            growth_rate=0.03,
+        )
+        for i in range(2)
+    ]
+    for each in analyses:
+        for i in range(5):
+            PostInjuryRow.objects.create(
+                analysis=each, year=2023 + i, portion_of_year=1.0, age=33.0 + i, wage_base_years=20000
+            )
+    return analyses
+
+
+def bulk_export(ids, **data):
+    url = reverse('analysis-bulk-export')
+    return APIClient().post(url, {'ids': ids, **data}, format='json')
+
+
+@pytest.mark.django_db
+class TestBulkExport:
+    @pytest.fixture(autouse=True)
+    def render_inline(self, settings):
+        settings.BULK_EXPORT_PROCESSES = 0
+
+    def test_zip_holds_every_report(self, analyses):
+        ids = [each.id for each in analyses]
+        with CaptureQueriesContext(connection) as queries:
+            response = bulk_export(ids)
+            body = b''.join(response.streaming_content)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/zip'
+        # Analyses with evaluees, then each row set, regardless of the analysis count
+        assert len(queries.captured_queries) == 3
+
+        archive = zipfile.ZipFile(io.BytesIO(body))
+        assert sorted(archive.namelist()) == sorted(
+            f'analysis_{i}/{name}' for i in ids for name in ('export_excel.xlsx', 'export_word.docx')
+        )
+        workbook = load_workbook(io.BytesIO(archive.read(f'analysis_{ids[0]}/export_excel.xlsx')))
+        assert workbook['Post-Injury Earnings'].max_row == 6
+        document = Document(io.BytesIO(archive.read(f'analysis_{ids[0]}/export_word.docx')))
+        assert len(document.tables[1].rows) == 6
+
+    def test_selected_formats(self, analyses):
+        response = bulk_export([analyses[0].id], formats=['word'])
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        assert archive.namelist() == [f'analysis_{analyses[0].id}/word.docx']
+
+    def test_streams_one_chunk_per_document(self, analyses):
+        chunks = list(stream_export_zip(analyses, ['export_word'], processes=0))
+        # One chunk per document plus the central directory
+        assert len(chunks) == len(analyses) + 1
+        assert chunks[0].startswith(b'PK')
+
+    def test_failed_report_is_listed_in_errors(self, analyses, monkeypatch):
+        from calculator import bulk_export as module
+
+        def render_export(analysis, report_type):
+            if analysis.id == analyses[1].id:
+                raise RuntimeError('boom')
+            return b'report'
+
+        monkeypatch.setattr(module, 'render_export', render_export)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(stream_export_zip(analyses, ['word'], processes=0))))
+        assert len(archive.namelist()) == len(analyses)
+        assert archive.read('errors.txt') == f'analysis_{analyses[1].id}/word.docx: boom\n'.encode()
+
+    def test_missing_analysis(self, analyses):
+        response = bulk_export([analyses[0].id, 999999])
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert '999999' in response.data['detail']
+
+    @pytest.mark.parametrize('data', [{'ids': []}, {'ids': 'abc'}, {'ids': [1], 'formats': ['pdf']}])
+    def test_rejects_invalid_requests(self, analyses, data):
+        response = APIClient().post(reverse('analysis-bulk-export'), data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestBulkExportPool:
+    @pytest.fixture(autouse=True)
+    def render_in_pool(self, settings):
+        settings.BULK_EXPORT_PROCESSES = 2
+        yield
+        for pool in list(bulk_export_module._pools.values()):
+            pool.shutdown()
+        bulk_export_module._pools.clear()
+
+    def entries(self, analyses):
+        response = bulk_export([each.id for each in analyses])
+        assert response.status_code == status.HTTP_200_OK
+        return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_pool_renders_every_report(self, analyses):
+        archive = self.entries(analyses)
+        assert sorted(archive.namelist()) == sorted(
+            f'analysis_{each.id}/{name}' for each in analyses for name in ('export_excel.xlsx', 'export_word.docx')
+        )
+        document = Document(io.BytesIO(archive.read(f'analysis_{analyses[0].id}/export_word.docx')))
+        assert len(document.tables[1].rows) == 6
+
+    def test_one_pool_per_size(self):
+        assert bulk_export_module._get_pool(2) is bulk_export_module._get_pool(2)
+        assert bulk_export_module._get_pool(1) is not bulk_export_module._get_pool(2)
+
+    def test_broken_pool_is_replaced(self, analyses):
+        pool = bulk_export_module._get_pool(2)
+        # A worker dying abruptly breaks the pool, as the OOM killer would
+        with pytest.raises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result()
+
+        archive = self.entries(analyses)
+        assert 'errors.txt' not in archive.namelist()
+        assert len(archive.namelist()) == 2 * len(analyses)
+        assert bulk_export_module._get_pool(2) is not pool
+
+
+def test_closing_export_cancels_pending_renders(analyses):
+    futures = []
+
+    def submit(processes, *args):
+        future = Future()
+        if not futures:
+            future.set_result(b'first')
+        futures.append(future)
+        return None, future
+
+    with mock.patch.object(bulk_export_module, '_submit', side_effect=submit):
+        rendered = render_exports(analyses, ['export_word'], processes=2)
+        assert next(rendered)[2] == b'first'
+        rendered.close()
+
+    assert len(futures) == len(analyses)
+    assert all(future.cancelled() for future in futures[1:])
@@ -0,0 +1,108 @@
+import csv
+import json
+import pytest
+import economic_analysis
+from economic_analysis import CASE_DEFAULTS, TOTAL_FIELDS, compute_exhibits, main, parse_case, read_cases, run_case
+
+PRE_ROWS = [[2021, 0.5, 36.5, 50000.0], [2022, 1.0, 37.5, 52000.0]]
+POST_ROWS = [[2023, 1.0, 38.5, 30000.0], [2024, 1.0, 39.5, 31260.0], [2025, 0.5, 40.5, 32572.92]]
+
+
+def record(**fields):
+    return {'pre_table_rows': PRE_ROWS, 'post_table_rows': POST_ROWS, **fields}
+
+
+def write_jsonl(path, records):
+    path.write_text(''.join(json.dumps(r) + '\n' for r in records))
+    return path
+
+
+def write_csv(path, records):
+    fields = sorted({key for r in records for key in r})
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for r in records:
+            writer.writerow({
+                key: json.dumps(value) if isinstance(value, list) else value
+                for key, value in r.items()
+            })
+    return path
+
+
+class TestBatchInput:
+    def test_parse_case_defaults(self):
+        case = parse_case({'pre_aif': '0.8', 'hi_start_year': ''})
+        assert case['pre_aif'] == 0.8
+        assert case['hi_start_year'] == CASE_DEFAULTS['hi_start_year']
+        assert case['pre_table_rows'] == [] and case['post_table_rows'] == []
+
+    def test_jsonl_and_csv_read_the_same_cases(self, tmp_path):
+        records = [record(case_id='a', pre_aif=0.8), record(post_growth_rate=0.05)]
+        jsonl = list(read_cases(write_jsonl(tmp_path / 'cases.jsonl', records), 'jsonl'))
+        from_csv = list(read_cases(write_csv(tmp_path / 'cases.csv', records), 'csv'))
+
+        assert [case_id for case_id, _ in jsonl] == [case_id for case_id, _ in from_csv] == ['a', '2']
+        for (_, left), (_, right) in zip(jsonl, from_csv):
+            assert parse_case(left) == parse_case(right)
+
+    def test_run_case_reports_errors(self):
+        result = run_case(('bad', record(post_table_rows='[[2023, 1.0]]')))
+        assert result['case_id'] == 'bad'
+        assert 'error' in result and 'exhibits' not in result
+
+        result = run_case(('good', record()))
+        assert result['exhibits'] == compute_exhibits(parse_case(record())).as_dict()
+
+
+class TestBatchMain:
+    def test_jsonl_output(self, tmp_path, capsys):
+        cases = write_jsonl(tmp_path / 'cases.jsonl', [record(case_id='a'), record(case_id='b')])
+        output = tmp_path / 'results.jsonl'
+        main(['--batch', str(cases), '--output', str(output), '--processes', '0'])
+
+        results = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [r['case_id'] for r in results] == ['a', 'b']
+        assert 'Processed 2 cases (0 failed)' in capsys.readouterr().err
+
+    def test_bad_row_fails_the_run(self, tmp_path, capsys):
+        cases = write_csv(tmp_path / 'cases.csv', [record(), record(pre_aif='abc'), record()])
+        output = tmp_path / 'results.csv'
+        with pytest.raises(SystemExit) as exit_info:
+            main(['--batch', str(cases), '--output', str(output), '--processes', '0'])
+
+        assert exit_info.value.code == 1
+        assert 'Processed 3 cases (1 failed)' in capsys.readouterr().err
+        rows = list(csv.DictReader(open(output)))
+        assert [bool(row['error']) for row in rows] == [False, True, False]
+        assert set(TOTAL_FIELDS) < set(rows[0])
+
+    def test_pool_matches_inline(self, tmp_path, monkeypatch):
+        records = [record(case_id=str(i), pre_aif=0.5 + i / 100) for i in range(30)]
+        cases = write_jsonl(tmp_path / 'cases.jsonl', records)
+        inline, pooled = tmp_path / 'inline.jsonl', tmp_path / 'pooled.jsonl'
+        main(['--batch', str(cases), '--output', str(inline), '--processes', '0'])
+
+        # Small chunks so the pool keeps a full window of chunks in flight
+        results = economic_analysis._pooled_results
+        monkeypatch.setattr(
+            economic_analysis, '_pooled_results',
+            lambda cases, processes: results(cases, processes, chunksize=4),
+        )
+        main(['--batch', str(cases), '--output', str(pooled), '--processes', '2'])
+        assert pooled.read_text() == inline.read_text()
+
+    def test_pool_reads_input_lazily(self):
+        consumed = []
+
+        def cases():
+            for i in range(100):
+                consumed.append(i)
+                yield str(i), record()
+
+        results = economic_analysis._pooled_results(cases(), processes=2, chunksize=5)
+        first = next(results)
+        assert first['case_id'] == '0'
+        # The first chunk plus a window of 2 * processes chunks, not the whole input
+        assert len(consumed) <= 5 * (2 * 2 + 1)
+        results.close()
@@ -0,0 +1,86 @@
+import io
+import pytest
+from datetime import date
+from django.urls import reverse
+from openpyxl import load_workbook
+from rest_framework import status
+from rest_framework.test import APIClient
+from calculator.models import EconomicAnalysis, Evaluee, PreInjuryRow, PostInjuryRow
+from calculator.views import BULK_EXPORT_MAX_ANALYSES
+
+
+def add_rows(analysis, post_years=5):
+    PreInjuryRow.objects.create(
+        analysis=analysis, year=2023, portion_of_year=0.92, age=33.0, wage_base_years=50000
+    )
+    PostInjuryRow.objects.bulk_create([
+        PostInjuryRow(analysis=analysis, year=2023 + i, portion_of_year=1.0,
+                      age=33.0 + i, wage_base_years=20000)
+        for i in range(post_years)
+    ])
+    return analysis
+
+
+def read_workbook(response):
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    return load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+
+
+@pytest.mark.django_db
+class TestExcelExport:
+    def test_export_excel_streams_workbook(self, analysis):
+        add_rows(analysis)
+        response = APIClient().get(reverse('analysis-export-excel', kwargs={'pk': analysis.id}))
+        workbook = read_workbook(response)
+
+        assert response['Content-Disposition'] == f'attachment; filename=analysis_{analysis.id}.xlsx'
+        assert workbook.sheetnames == ["Personal Info", "Pre-Injury Earnings", "Post-Injury Earnings"]
+        assert workbook["Personal Info"]["A1"].value == "First Name"
+        assert workbook["Personal Info"]["B1"].value == "John"
+        post = list(workbook["Post-Injury Earnings"].values)
+        assert post[0][0] == "Year"
+        assert [row[0] for row in post[1:]] == [2023, 2024, 2025, 2026, 2027]
+        assert post[1][1] == "100.0%"
+
+    def test_export_excel_bulk(self, analysis):
+        add_rows(analysis)
+        other = add_rows(EconomicAnalysis.objects.create(
+            evaluee=Evaluee.objects.create(
+                first_name="Jane", last_name="Roe", date_of_birth=date(1985, 5, 5)
+            ),
+            date_of_injury=date(2023, 1, 1),
+            date_of_report=date(2023, 12, 1),
+            worklife_expectancy=10.0,
+            years_to_final_separation=10.0,
+            life_expectancy=40.0,
+            pre_injury_base_wage=60000,
+            post_injury_base_wage=0
+        ), post_years=3)
+
+        response = APIClient().get(
+            reverse('analysis-export-excel-bulk'), {'ids': f'{analysis.id},{other.id}'}
+        )
+        workbook = read_workbook(response)
+
+        info = list(workbook["Personal Info"].values)
+        assert info[0][0] == "Analysis"
+        assert sorted(row[0] for row in info[1:]) == sorted([analysis.id, other.id])
+        post = list(workbook["Post-Injury Earnings"].values)[1:]
+        assert sum(1 for row in post if row[0] == analysis.id) == 5
+        assert sum(1 for row in post if row[0] == other.id) == 3
+
+    def test_export_excel_bulk_invalid_ids(self):
+        response = APIClient().get(reverse('analysis-export-excel-bulk'), {'ids': 'a,b'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_excel_bulk_requires_ids(self, analysis):
+        response = APIClient().get(reverse('analysis-export-excel-bulk'))
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'ids' in response.data['detail']
+
+    def test_export_excel_bulk_caps_ids(self):
+        ids = ','.join(str(i) for i in range(1, BULK_EXPORT_MAX_ANALYSES + 2))
+        response = APIClient().get(reverse('analysis-export-excel-bulk'), {'ids': ids})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert str(BULK_EXPORT_MAX_ANALYSES) in response.data['detail']
@@ -0,0 +1,63 @@
+import math
+import numpy as np
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from calculator.factor_tables import HORIZON_STEP, FactorTables
+
+
+class TestFactorTables:
+    def test_growth_and_discount_factors(self):
+        tables = FactorTables()
+        assert tables.growth_factors(0.042, 40).tolist() == pytest.approx([1.042 ** k for k in range(40)])
+        assert tables.discount_factors(0.03, 10).tolist() == pytest.approx([1.03 ** -k for k in range(10)])
+        assert tables.growth_factors(0.05, 5, 'continuous').tolist() == pytest.approx(
+            [math.exp(0.05 * k) for k in range(5)]
+        )
+
+    def test_factors_for_signed_exponents(self):
+        factors = FactorTables().factors(0.04, np.array([-2, 0, 3]))
+        assert factors.tolist() == pytest.approx([1.04 ** -2, 1.0, 1.04 ** 3])
+
+    def test_horizons_share_a_table(self):
+        tables = FactorTables()
+        tables.growth_factors(0.03, 10)
+        tables.growth_factors(0.03, HORIZON_STEP)
+        tables.discount_factors(0.03, 20)
+        tables.growth_factors(0.03, HORIZON_STEP + 1)
+        assert tables.stats() == {
+            'size': 2, 'maxsize': 256, 'hits': 2, 'misses': 2, 'evictions': 0, 'hit_rate': 0.5,
+        }
+
+    def test_least_recently_used_table_is_evicted(self):
+        tables = FactorTables(maxsize=2)
+        tables.growth_factors(0.01, 5)
+        tables.growth_factors(0.02, 5)
+        tables.growth_factors(0.01, 5)
+        tables.growth_factors(0.03, 5)
+        tables.growth_factors(0.01, 5)
+        stats = tables.stats()
+        assert (stats['hits'], stats['misses'], stats['evictions']) == (2, 3, 1)
+
+    def test_tables_are_read_only(self):
+        with pytest.raises(ValueError):
+            FactorTables().growth_factors(0.03, 5)[0] = 2.0
+
+    def test_unknown_compounding(self):
+        with pytest.raises(ValueError):
+            FactorTables().growth_factors(0.03, 5, 'monthly')
+
+
+@pytest.mark.django_db
+class TestFactorTableStats:
+    def test_admin_only(self):
+        client = APIClient()
+        assert client.get(reverse('factortable-list')).status_code in (
+            status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN
+        )
+        client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        response = client.get(reverse('factortable-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == {'size', 'maxsize', 'hits', 'misses', 'evictions', 'hit_rate'}
@@ -351,3 +351,110 @@ class TestHealthcarePlan:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) > 0
         assert all('year' in cost and 'cost' in cost for cost in response.data)
+
+@pytest.mark.django_db
+class TestBulkCalculateCosts:
+    def test_many_plans_use_constant_queries(self, api_client, analysis):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for i in range(40):
+            category = HealthcareCategory.objects.create(
+                name=f"Category {i}", growth_rate=0.01 * (i % 5), frequency_years=1 + i % 3
+            )
+            HealthcarePlan.objects.create(analysis=analysis, category=category, base_cost=100 + i)
+
+        url = reverse('analysis-healthcare-plans-calculate-costs', kwargs={'analysis_pk': analysis.id})
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(url)
+        assert response.status_code == status.HTTP_200_OK
+        # One read for the analysis and one for the plans with their categories
+        selects = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT')]
+        assert len(selects) == 2
+
+        for plan in HealthcarePlan.objects.select_related('category'):
+            frequency = int(plan.category.frequency_years)
+            expected = [
+                (2023 + offset, plan.base_cost * (1 + plan.category.growth_rate) ** offset)
+                for offset in range(0, 41, frequency)
+            ]
+            stored = list(plan.costs.order_by('year').values_list('year', 'cost'))
+            assert [year for year, _ in stored] == [year for year, _ in expected]
+            assert [cost for _, cost in stored] == pytest.approx([cost for _, cost in expected])
+
+    def test_inactive_plan_costs_are_dropped(self, api_client, analysis, healthcare_category):
+        inactive = HealthcarePlan.objects.create(
+            analysis=analysis, category=healthcare_category, base_cost=500, is_active=False
+        )
+        HealthcareCost.objects.create(plan=inactive, year=2023, age=33.0, cost=500)
+
+        url = reverse('analysis-healthcare-plans-calculate-costs', kwargs={'analysis_pk': analysis.id})
+        assert api_client.post(url).status_code == status.HTTP_200_OK
+        assert inactive.costs.count() == 0
+
+@pytest.mark.django_db
+class TestIncrementalCalculateCosts:
+    @pytest.fixture
+    def plans(self, analysis):
+        plans = []
+        for i in range(3):
+            category = HealthcareCategory.objects.create(name=f"Category {i}", growth_rate=0.03, frequency_years=1)
+            plans.append(HealthcarePlan.objects.create(analysis=analysis, category=category, base_cost=1000 + i))
+        return plans
+
+    def calculate(self, api_client, analysis):
+        url = reverse('analysis-healthcare-plans-calculate-costs', kwargs={'analysis_pk': analysis.id})
+        response = api_client.post(url)
+        assert response.status_code == status.HTTP_200_OK
+        return response.data['recalculated_plans']
+
+    def test_only_changed_plans_are_recalculated(self, api_client, analysis, plans):
+        assert sorted(self.calculate(api_client, analysis)) == sorted(plan.id for plan in plans)
+        untouched = set(HealthcareCost.objects.filter(plan=plans[0]).values_list('id', flat=True))
+
+        plans[1].base_cost = 5000
+        plans[1].save()
+        plans[2].category.frequency_years = 2
+        plans[2].category.save()
+
+        assert sorted(self.calculate(api_client, analysis)) == [plans[1].id, plans[2].id]
+        assert set(HealthcareCost.objects.filter(plan=plans[0]).values_list('id', flat=True)) == untouched
+        assert plans[1].costs.order_by('year').first().cost == 5000
+        assert plans[2].costs.count() == 21
+
+    def test_unchanged_plans_skip_recalculation(self, api_client, analysis, plans):
+        self.calculate(api_client, analysis)
+        assert self.calculate(api_client, analysis) == []
+
+    def test_toggling_active_drops_and_rebuilds_costs(self, api_client, analysis, plans):
+        self.calculate(api_client, analysis)
+        plans[0].is_active = False
+        plans[0].save()
+        assert self.calculate(api_client, analysis) == [plans[0].id]
+        assert plans[0].costs.count() == 0
+        assert plans[1].costs.count() == 41
+        assert self.calculate(api_client, analysis) == []
+
+        plans[0].is_active = True
+        plans[0].save()
+        assert self.calculate(api_client, analysis) == [plans[0].id]
+        assert plans[0].costs.count() == 41
+
+    def test_reactivated_plan_is_recalculated_after_edit(self, api_client, analysis, plans):
+        self.calculate(api_client, analysis)
+        plans[0].is_active = False
+        plans[0].base_cost = 2500
+        plans[0].save()
+        assert self.calculate(api_client, analysis) == [plans[0].id]
+
+        plans[0].is_active = True
+        plans[0].save()
+        assert self.calculate(api_client, analysis) == [plans[0].id]
+        assert plans[0].costs.order_by('year').first().cost == 2500
+
+    def test_analysis_change_recalculates_every_plan(self, api_client, analysis, plans):
+        self.calculate(api_client, analysis)
+        analysis.life_expectancy = 30.0
+        analysis.save()
+        assert len(self.calculate(api_client, analysis)) == 3
+        assert plans[0].costs.count() == 31
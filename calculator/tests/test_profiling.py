@@ -0,0 +1,106 @@
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from calculator.profiling import UNRESOLVED_ROUTE, RequestProfile, _current, profile_store, profiled_section
+
+
+@pytest.fixture(autouse=True)
+def clear_profiles():
+    profile_store.clear()
+    yield
+    profile_store.clear()
+
+
+@pytest.fixture
+def admin_client(db):
+    client = APIClient()
+    client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+    return client
+
+
+@pytest.mark.django_db
+class TestRequestProfiling:
+    def test_disabled_by_default(self, analysis):
+        response = APIClient().get(reverse('analysis-calculate', kwargs={'pk': analysis.id}))
+        assert response.status_code == status.HTTP_200_OK
+        assert 'Server-Timing' not in response
+        assert profile_store.summary()['routes'] == {}
+
+    def test_records_sections(self, settings, analysis):
+        settings.REQUEST_PROFILING = True
+        client = APIClient()
+        client.get(reverse('analysis-calculate', kwargs={'pk': analysis.id}))
+        response = client.get(reverse('analysis-list'))
+        assert response['Server-Timing'].startswith('total;dur=')
+
+        routes = profile_store.summary()['routes']
+        calculate = routes['analysis-calculate']
+        assert calculate['count'] == 1
+        assert calculate['mean_queries'] > 0
+        assert {'calculation', 'db'} <= set(calculate['mean_section_ms'])
+        assert 'serializer' in routes['analysis-list']['mean_section_ms']
+        assert sum(calculate['histogram'].values()) == 1
+
+    def test_header_opt_in_is_staff_only(self, analysis, admin_client):
+        url = reverse('analysis-calculate', kwargs={'pk': analysis.id})
+        assert 'Server-Timing' not in APIClient().get(url, HTTP_X_PROFILE='1')
+        assert 'Server-Timing' in admin_client.get(url, HTTP_X_PROFILE='1')
+        assert profile_store.summary()['routes']['analysis-calculate']['count'] == 1
+
+    def test_keeps_slowest_cprofile_dumps(self, settings, tmp_path, analysis):
+        settings.REQUEST_PROFILING = True
+        settings.REQUEST_PROFILE_KEEP = 2
+        settings.REQUEST_PROFILE_ROOT = tmp_path
+        client = APIClient()
+        for _ in range(4):
+            client.get(reverse('analysis-calculate', kwargs={'pk': analysis.id}))
+
+        slowest = profile_store.summary()['slowest_profiles']
+        assert len(slowest) == 2
+        assert sorted(str(path) for path in tmp_path.iterdir()) == sorted(p['path'] for p in slowest)
+
+    def test_unresolved_paths_share_one_route(self, settings, tmp_path):
+        settings.REQUEST_PROFILING = True
+        settings.REQUEST_PROFILE_KEEP = 5
+        settings.REQUEST_PROFILE_ROOT = tmp_path
+        client = APIClient()
+        for path in ('/missing/', '/wp-login.php', '/../etc/passwd'):
+            assert client.get(path).status_code == status.HTTP_404_NOT_FOUND
+
+        routes = profile_store.summary()['routes']
+        assert list(routes) == [UNRESOLVED_ROUTE]
+        assert routes[UNRESOLVED_ROUTE]['count'] == 3
+        assert all('-unresolved-' in path.name for path in tmp_path.iterdir())
+
+    def test_nested_sections_count_once(self):
+        profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            with profiled_section('calculation'):
+                with profiled_section('calculation'):
+                    pass
+        finally:
+            _current.reset(token)
+        assert list(profile.sections) == ['calculation']
+        assert profile.depth['calculation'] == 0
+
+    def test_sections_are_no_ops_outside_requests(self):
+        with profiled_section('calculation'):
+            pass
+        assert profile_store.summary()['routes'] == {}
+
+    def test_summary_endpoint_admin_only(self, settings, analysis, admin_client):
+        url = reverse('profiling-list')
+        assert APIClient().get(url).status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+
+        settings.REQUEST_PROFILING = True
+        admin_client.get(reverse('analysis-calculate', kwargs={'pk': analysis.id}))
+        response = admin_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert 'analysis-calculate' in response.data['routes']
+
+        assert admin_client.post(reverse('profiling-reset')).status_code == status.HTTP_204_NO_CONTENT
+        # Only the reset request itself remains
+        assert list(profile_store.summary()['routes']) == ['profiling-reset']
@@ -0,0 +1,324 @@
+import math
+import pytest
+from datetime import date
+from hypothesis import given, strategies as st
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from calculator.models import PreInjuryRow, PostInjuryRow
+from calculator.projection import (
+    DISCOUNT_CONVENTIONS,
+    ProjectionParameters,
+    RowArrays,
+    convention_totals,
+    discount_offsets,
+    insurance_loss,
+    project_analysis,
+    project_post_injury,
+    project_pre_injury,
+    sensitivity_grid,
+)
+
+
+def loop_insurance_loss(base_amount, growth_rate, years):
+    """The original per-year insurance loss loop"""
+    total_loss = 0
+    current_amount = base_amount
+    for year in range(years):
+        total_loss += current_amount
+        current_amount *= (1 + growth_rate / 100)
+    return total_loss
+
+
+base_amounts = st.floats(min_value=0, max_value=100000, allow_nan=False)
+growth_rates = st.one_of(
+    st.just(0.0),
+    st.floats(min_value=0, max_value=15, allow_nan=False),
+    st.floats(min_value=0, max_value=1e-9, allow_nan=False),
+)
+horizons = st.integers(min_value=0, max_value=75)
+
+
+class TestInsuranceLoss:
+    @given(base_amounts, growth_rates, horizons)
+    def test_closed_form_matches_loop_to_the_cent(self, base_amount, growth_rate, years):
+        expected = loop_insurance_loss(base_amount, growth_rate, years)
+        assert abs(insurance_loss(base_amount, growth_rate, years) - expected) < 0.005
+
+    @given(base_amounts, growth_rates, horizons)
+    def test_cumulative_mode_matches_loop_to_the_cent(self, base_amount, growth_rate, years):
+        running = insurance_loss(base_amount, growth_rate, years, cumulative=True)
+        assert len(running) == years
+        for n, total in enumerate(running.tolist(), 1):
+            assert abs(total - loop_insurance_loss(base_amount, growth_rate, n)) < 0.005
+
+    def test_zero_growth(self):
+        assert insurance_loss(1200.0, 0, 10) == 12000.0
+        assert insurance_loss(1200.0, 0, 3, cumulative=True).tolist() == [1200.0, 2400.0, 3600.0]
+
+    @pytest.mark.parametrize('years', [0, -3])
+    def test_non_positive_horizon(self, years):
+        assert insurance_loss(1200.0, 3.0, years) == 0.0
+        assert len(insurance_loss(1200.0, 3.0, years, cumulative=True)) == 0
+
+
+def legacy_exhibit(params, rows, pre_injury):
+    """Per-row reference implementation of the original view loop"""
+    total_future_value = 0
+    total_present_value = 0
+    total_benefits = 0
+    total_insurance = 0
+    columns = []
+    for year, portion, age, wage_base in rows:
+        gross = wage_base * portion
+        adjusted = gross * params.adjustment_factor
+        benefits = gross * (params.benefits_rate / 100)
+        years = 1 if pre_injury else year - params.report_year + 1
+        insurance = loop_insurance_loss(params.health_insurance_base, params.growth_rate, years)
+        if not pre_injury and params.apply_discounting and params.discount_rate:
+            discount_factor = (1 + params.discount_rate) ** (year - params.report_year)
+            total_present_value += adjusted / discount_factor
+            total_benefits += benefits / discount_factor
+            total_insurance += insurance / discount_factor
+        else:
+            total_future_value += adjusted
+            total_benefits += benefits
+            total_insurance += insurance
+        columns.append((gross, adjusted, benefits, insurance))
+    return columns, {
+        'total_future_value': total_future_value,
+        'total_present_value': total_present_value,
+        'total_benefits': total_benefits,
+        'total_insurance': total_insurance,
+    }
+
+
+@pytest.fixture
+def params():
+    return ProjectionParameters(
+        adjustment_factor=0.754,
+        benefits_rate=20.0,
+        health_insurance_base=7001.05,
+        growth_rate=3.0,
+        report_year=2023,
+        apply_discounting=True,
+        discount_rate=0.04,
+    )
+
+
+@pytest.fixture
+def records():
+    rows = [(2023, 0.0849, 33.9, 20000.0)]
+    rows += [(2023 + i, 1.0, 33.9 + i, 20000.0 * 1.03 ** i) for i in range(1, 45)]
+    rows.append((2068, 0.5, 78.9, 20000.0 * 1.03 ** 45))
+    return rows
+
+
+class TestProjectionEngine:
+    @pytest.mark.parametrize('apply_discounting', [True, False])
+    def test_post_injury_matches_row_loop(self, params, records, apply_discounting):
+        params = ProjectionParameters(**{**params.__dict__, 'apply_discounting': apply_discounting})
+        projection = project_post_injury(params, RowArrays.from_records(records))
+        columns, totals = legacy_exhibit(params, records, pre_injury=False)
+
+        assert len(projection) == len(records)
+        for i, (gross, adjusted, benefits, insurance) in enumerate(columns):
+            assert projection.gross_earnings[i] == pytest.approx(gross)
+            assert projection.adjusted_earnings[i] == pytest.approx(adjusted)
+            assert projection.benefits_loss[i] == pytest.approx(benefits)
+            assert projection.insurance_loss[i] == pytest.approx(insurance)
+        for key, value in totals.items():
+            assert projection.totals[key] == pytest.approx(value)
+
+    def test_pre_injury_matches_row_loop(self, params, records):
+        projection = project_pre_injury(params, RowArrays.from_records(records[:3]))
+        columns, totals = legacy_exhibit(params, records[:3], pre_injury=True)
+
+        assert projection.insurance_loss.tolist() == [params.health_insurance_base] * 3
+        assert projection.adjusted_earnings.tolist() == pytest.approx([c[1] for c in columns])
+        assert projection.totals['total_future_value'] == pytest.approx(totals['total_future_value'])
+        assert projection.totals['total_benefits'] == pytest.approx(totals['total_benefits'])
+
+    def test_empty_exhibit(self, params):
+        projection = project_post_injury(params, RowArrays.from_records([]))
+        assert len(projection) == 0
+        assert projection.row_dicts() == []
+        assert projection.totals['total_present_value'] == 0.0
+
+    def test_row_dicts_format_portion(self, params, records):
+        rows = project_pre_injury(params, RowArrays.from_records(records[:1])).row_dicts()
+        assert rows[0]['portion_of_year'] == '8.5%'
+        assert rows[0]['year'] == 2023
+        assert isinstance(rows[0]['gross_earnings'], float)
+
+
+class TestDiscountConventions:
+    @pytest.fixture
+    def dated_params(self, params):
+        return ProjectionParameters(**{**params.__dict__, 'report_date': date(2023, 12, 1)})
+
+    def test_offsets(self, dated_params):
+        rows = RowArrays.from_records([(2023, 31 / 365, 33.9, 1.0), (2024, 1.0, 34.9, 1.0), (2025, 0.5, 35.9, 1.0)])
+        assert discount_offsets(dated_params, rows, 'end_of_year').tolist() == [0, 1, 2]
+        assert discount_offsets(dated_params, rows, 'continuous').tolist() == [0, 1, 2]
+        assert discount_offsets(dated_params, rows, 'mid_year').tolist() == [0.0, 0.5, 1.5]
+        assert discount_offsets(dated_params, rows, 'exact_day').tolist() == pytest.approx([
+            15.5 / 365.25, (31 + 183) / 365.25, (31 + 366 + 182.5 / 2) / 365.25,
+        ])
+
+    def test_unknown_convention(self, dated_params, records):
+        with pytest.raises(ValueError):
+            discount_offsets(dated_params, RowArrays.from_records(records), 'quarterly')
+
+    def test_projection_discounts_under_convention(self, dated_params, records):
+        rows = RowArrays.from_records(records)
+        default = project_post_injury(dated_params, rows)
+        assert default.discount_factor.tolist() == pytest.approx([1.04 ** (year - 2023) for year, *_ in records])
+
+        params = ProjectionParameters(**{**dated_params.__dict__, 'discount_convention': 'continuous'})
+        continuous = project_post_injury(params, rows)
+        assert continuous.discount_factor.tolist() == pytest.approx([math.exp(0.04 * (year - 2023)) for year, *_ in records])
+        assert continuous.totals['total_present_value'] < default.totals['total_present_value']
+
+    def test_convention_totals_match_projection(self, dated_params, records):
+        rows = RowArrays.from_records(records)
+        totals = convention_totals(dated_params, rows)
+        assert set(totals) == set(DISCOUNT_CONVENTIONS)
+        for convention in DISCOUNT_CONVENTIONS:
+            params = ProjectionParameters(**{**dated_params.__dict__, 'discount_convention': convention})
+            expected = project_post_injury(params, rows).totals
+            for key in ('total_present_value', 'total_benefits', 'total_insurance'):
+                assert totals[convention][key] == pytest.approx(expected[key])
+        assert totals['mid_year']['total_present_value'] > totals['end_of_year']['total_present_value']
+
+    def test_convention_totals_need_discounting(self, dated_params, records):
+        params = ProjectionParameters(**{**dated_params.__dict__, 'apply_discounting': False})
+        with pytest.raises(ValueError):
+            convention_totals(params, RowArrays.from_records(records))
+
+
+class TestSensitivityGrid:
+    @pytest.fixture
+    def grid_params(self, params):
+        return ProjectionParameters(**{**params.__dict__, 'growth_rate': 0.03, 'injury_year': 2022})
+
+    def regrown_records(self, records, growth_rate):
+        return [(year, portion, age, 20000.0 * (1 + growth_rate) ** (year - 2022)) for year, portion, age, _ in records]
+
+    @pytest.mark.parametrize('convention', ['end_of_year', 'mid_year', 'continuous'])
+    def test_matches_projection_for_every_combination(self, grid_params, records, convention):
+        grid_params = ProjectionParameters(**{**grid_params.__dict__, 'discount_convention': convention})
+        discount_rates = [0.01, 0.02, 0.04]
+        growth_rates = [0.0, 0.03, 0.05]
+        adjustment_factors = [0.754, 1.0]
+        rows = RowArrays.from_records(self.regrown_records(records, 0.03))
+        grid = sensitivity_grid(grid_params, rows, discount_rates, growth_rates, adjustment_factors)
+
+        assert grid['total_present_value'].shape == (3, 3, 2)
+        for d, discount_rate in enumerate(discount_rates):
+            for g, growth_rate in enumerate(growth_rates):
+                for a, adjustment_factor in enumerate(adjustment_factors):
+                    params = ProjectionParameters(**{
+                        **grid_params.__dict__,
+                        'discount_rate': discount_rate,
+                        'growth_rate': growth_rate,
+                        'adjustment_factor': adjustment_factor,
+                    })
+                    expected = project_post_injury(
+                        params, RowArrays.from_records(self.regrown_records(records, growth_rate))
+                    ).totals
+                    assert grid['total_present_value'][d, g, a] == pytest.approx(expected['total_present_value'])
+                    assert grid['total_benefits'][d, g, a] == pytest.approx(expected['total_benefits'])
+                    assert grid['total_insurance'][d, g, a] == pytest.approx(expected['total_insurance'])
+                    assert grid['total_loss'][d, g, a] == pytest.approx(
+                        expected['total_present_value'] + expected['total_benefits'] + expected['total_insurance']
+                    )
+
+    def test_empty_rows(self, grid_params):
+        grid = sensitivity_grid(grid_params, RowArrays.from_records([]), [0.02], [0.03, 0.04], [1.0])
+        assert grid['total_loss'].tolist() == [[[0.0], [0.0]]]
+
+
+@pytest.mark.django_db
+class TestProjectionEndpoints:
+    @pytest.fixture
+    def analysis_with_rows(self, analysis):
+        PreInjuryRow.objects.create(
+            analysis=analysis, year=2023, portion_of_year=0.92, age=33.0, wage_base_years=50000
+        )
+        for i in range(21):
+            PostInjuryRow.objects.create(
+                analysis=analysis,
+                year=2023 + i,
+                portion_of_year=0.08 if i == 0 else 1.0,
+                age=33.0 + i,
+                wage_base_years=20000 * 1.03 ** i,
+            )
+        return analysis
+
+    def test_project_analysis_reads_saved_rows(self, analysis_with_rows):
+        pre, post = project_analysis(analysis_with_rows)
+        assert len(pre) == 1
+        assert len(post) == 21
+        assert post.rows.year.tolist() == list(range(2023, 2044))
+
+    def test_calculate_uses_projection(self, analysis_with_rows):
+        url = reverse('analysis-calculate', kwargs={'pk': analysis_with_rows.id})
+        response = APIClient().get(url)
+        assert response.status_code == status.HTTP_200_OK
+
+        _, post = project_analysis(analysis_with_rows)
+        data = response.data['exhibit2']['data']
+        assert len(data['rows']) == 21
+        assert data['total_present_value'] == pytest.approx(post.totals['total_present_value'])
+        assert data['rows'][0]['portion_of_year'] == '8.0%'
+
+    @pytest.mark.parametrize('action', ['analysis-export-excel', 'analysis-export-word'])
+    def test_exports_use_projection(self, analysis_with_rows, action):
+        url = reverse(action, kwargs={'pk': analysis_with_rows.id})
+        response = APIClient().get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Disposition'].startswith('attachment;')
+
+    def test_sensitivity_grid(self, analysis_with_rows):
+        url = reverse('analysis-sensitivity', kwargs={'pk': analysis_with_rows.id})
+        response = APIClient().get(url, {
+            'discount_rates': '0.01,0.02,0.03',
+            'growth_rates': '0.02,0.03',
+            'adjustment_factors': '0.8,0.9,1.0,1.1',
+        })
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['growth_rates'] == [0.02, 0.03]
+        assert len(response.data['total_present_value']) == 3
+        assert len(response.data['total_present_value'][0]) == 2
+        assert len(response.data['total_present_value'][0][0]) == 4
+
+    def test_sensitivity_defaults_to_analysis_assumptions(self, analysis_with_rows):
+        url = reverse('analysis-sensitivity', kwargs={'pk': analysis_with_rows.id})
+        response = APIClient().get(url)
+        assert response.status_code == status.HTTP_200_OK
+
+        _, post = project_analysis(analysis_with_rows)
+        assert response.data['total_present_value'] == [[[pytest.approx(post.totals['total_present_value'])]]]
+
+    def test_discount_conventions(self, analysis_with_rows):
+        url = reverse('analysis-discount-conventions', kwargs={'pk': analysis_with_rows.id})
+        response = APIClient().get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['discount_convention'] == 'end_of_year'
+
+        _, post = project_analysis(analysis_with_rows)
+        conventions = response.data['conventions']
+        assert list(conventions) == list(DISCOUNT_CONVENTIONS)
+        assert conventions['end_of_year']['total_present_value'] == pytest.approx(post.totals['total_present_value'])
+
+        analysis_with_rows.discount_convention = 'mid_year'
+        analysis_with_rows.save()
+        _, post = project_analysis(analysis_with_rows)
+        assert conventions['mid_year']['total_present_value'] == pytest.approx(post.totals['total_present_value'])
+
+    @pytest.mark.parametrize('query', [{'discount_rates': 'abc'}, {'growth_rates': '-1'}])
+    def test_sensitivity_rejects_invalid_rates(self, analysis_with_rows, query):
+        url = reverse('analysis-sensitivity', kwargs={'pk': analysis_with_rows.id})
+        response = APIClient().get(url, query)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,106 @@
+import io
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from calculator.models import CalculationResult, EconomicAnalysis, PreInjuryRow, PostInjuryRow
+from calculator.recalculation import analysis_inputs, recalculate_batch, rows_from_values, write_rows
+from calculator.row_generation import build_injury_rows
+
+
+def stored_rows(analysis):
+    return (
+        list(analysis.pre_injury_rows.values_list('year', 'portion_of_year', 'age', 'wage_base_years')),
+        list(analysis.post_injury_rows.values_list('year', 'portion_of_year', 'age', 'wage_base_years')),
+    )
+
+
+def expected_rows(analysis):
+    pre, post = build_injury_rows(analysis)
+    return (
+        [(r.year, r.portion_of_year, r.age, r.wage_base_years) for r in pre],
+        [(r.year, r.portion_of_year, r.age, r.wage_base_years) for r in post],
+    )
+
+
+def recalculate(*args, stderr=None):
+    out = io.StringIO()
+    call_command('recalculate_analyses', *args, stdout=out, stderr=stderr or io.StringIO())
+    return out.getvalue()
+
+
+def copy_analysis(analysis, **changes):
+    copy = EconomicAnalysis.objects.get(pk=analysis.pk)
+    copy.pk = None
+    for name, value in changes.items():
+        setattr(copy, name, value)
+    copy.save()
+    return copy
+
+
+@pytest.mark.django_db
+class TestRecalculateAnalyses:
+    def test_rows_from_values_matches_row_generation(self, analysis):
+        values = analysis_inputs(EconomicAnalysis.objects.all()).get()
+        analysis_id, pre, post = rows_from_values(values)
+        assert analysis_id == analysis.id
+        assert (pre, post) == expected_rows(analysis)
+
+    def test_write_rows_updates_creates_and_deletes(self, analysis):
+        PreInjuryRow.objects.create(analysis=analysis, year=2023, portion_of_year=0.5, age=1.0, wage_base_years=1)
+        PreInjuryRow.objects.create(analysis=analysis, year=2023, portion_of_year=0.5, age=1.0, wage_base_years=1)
+        PostInjuryRow.objects.create(analysis=analysis, year=2099, portion_of_year=1.0, age=1.0, wage_base_years=1)
+        kept = PreInjuryRow.objects.order_by('pk').first().pk
+
+        write_rows([rows_from_values(analysis_inputs(EconomicAnalysis.objects.all()).get())])
+
+        assert stored_rows(analysis) == expected_rows(analysis)
+        assert list(analysis.pre_injury_rows.values_list('pk', flat=True)) == [kept]
+
+    def test_command_inline(self, analysis):
+        analysis.growth_rate = 0.05
+        analysis.save()
+        CalculationResult.objects.create(analysis=analysis, fingerprint='x', data={})
+
+        output = recalculate('--processes', '0', '--batch-size', '1')
+
+        assert 'Recalculated 1 analyses' in output
+        assert 'analyses/s' in output
+        assert stored_rows(analysis) == expected_rows(analysis)
+        assert not CalculationResult.objects.exists()
+
+    def test_command_selected_ids(self, analysis, evaluee):
+        other = copy_analysis(analysis)
+
+        recalculate(str(other.id), '--processes', '0')
+
+        assert stored_rows(analysis) == ([], [])
+        assert stored_rows(other) == expected_rows(other)
+
+    def test_command_process_pool(self, analysis):
+        output = recalculate('--processes', '2', '--batch-size', '1')
+        assert 'Recalculated 1 analyses' in output
+        assert stored_rows(analysis) == expected_rows(analysis)
+
+    def test_recalculate_batch_returns_failures(self, analysis):
+        legacy = copy_analysis(analysis, date_of_report=analysis.date_of_injury - timedelta(days=1))
+
+        results, failures = recalculate_batch(analysis_inputs(EconomicAnalysis.objects.all()))
+
+        assert [analysis_id for analysis_id, _, _ in results] == [analysis.id]
+        assert failures == [(legacy.id, 'Date of report cannot be before the date of injury')]
+
+    @pytest.mark.parametrize('processes', ['0', '2'])
+    def test_command_skips_invalid_legacy_analysis(self, analysis, processes):
+        legacy = copy_analysis(analysis, date_of_report=analysis.date_of_injury - timedelta(days=1))
+        PostInjuryRow.objects.create(analysis=legacy, year=2023, portion_of_year=1.0, age=1.0, wage_base_years=1)
+        other = copy_analysis(analysis, growth_rate=0.05)
+        errors = io.StringIO()
+
+        output = recalculate('--processes', processes, '--batch-size', '2', stderr=errors)
+
+        assert 'Recalculated 2 analyses' in output
+        assert 'skipped 1 invalid analyses' in output
+        assert f'Skipped analysis {legacy.id}: Date of report cannot be before' in errors.getvalue()
+        assert stored_rows(analysis) == expected_rows(analysis)
+        assert stored_rows(other) == expected_rows(other)
+        assert legacy.post_injury_rows.count() == 1
@@ -0,0 +1,165 @@
+import io
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from docx import Document
+from openpyxl import load_workbook
+from rest_framework import status
+from rest_framework.test import APIClient
+from calculator.management.commands import run_report_worker
+from calculator.models import PostInjuryRow, ReportJob
+from calculator.report_jobs import claim_job, claim_pending_jobs, enqueue_report, requeue_stale_jobs, run_report_job
+
+
+@pytest.fixture(autouse=True)
+def report_job_root(settings, tmp_path):
+    settings.REPORT_JOB_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def analysis_with_rows(analysis):
+    PostInjuryRow.objects.bulk_create([
+        PostInjuryRow(analysis=analysis, year=2023 + i, portion_of_year=1.0,
+                      age=33.0 + i, wage_base_years=20000)
+        for i in range(5)
+    ])
+    return analysis
+
+
+class FakePool:
+    """Stands in for the worker pool; the first pool loses its workers"""
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        FakePool.created += 1
+        self.broken = FakePool.created == 1
+
+    def submit(self, function, job_id):
+        future = Future()
+        if self.broken:
+            future.set_exception(BrokenProcessPool('A process in the process pool was terminated abruptly'))
+        else:
+            future.set_result(run_report_job(job_id))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def enqueue(analysis, report_type):
+    return APIClient().post(
+        reverse('analysis-report-jobs', kwargs={'pk': analysis.id}),
+        {'report_type': report_type},
+        format='json'
+    )
+
+
+@pytest.mark.django_db
+class TestReportJobs:
+    def test_enqueue(self, analysis):
+        response = enqueue(analysis, 'export_word')
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['status'] == ReportJob.STATUS_PENDING
+        assert response.data['progress'] == 0
+        assert ReportJob.objects.get(id=response.data['id']).analysis == analysis
+
+    def test_enqueue_unknown_report_type(self, analysis):
+        response = enqueue(analysis, 'pdf')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not ReportJob.objects.exists()
+
+    def test_claim_is_exclusive(self, analysis):
+        job = enqueue_report(analysis, 'excel')
+        assert claim_job(job.id)
+        assert not claim_job(job.id)
+        assert claim_pending_jobs(5) == []
+
+    def test_requeue_stale_jobs(self, analysis):
+        job = enqueue_report(analysis, 'excel')
+        claim_job(job.id)
+        assert requeue_stale_jobs(older_than=3600) == 0
+        assert requeue_stale_jobs(older_than=-1) == 1
+        job.refresh_from_db()
+        assert job.status == ReportJob.STATUS_PENDING
+        assert job.started_at is None
+
+    def test_poll_and_download(self, analysis_with_rows, report_job_root):
+        client = APIClient()
+        job_id = enqueue(analysis_with_rows, 'export_excel').data['id']
+        download_url = reverse('reportjob-download', kwargs={'pk': job_id})
+
+        assert client.get(download_url).status_code == status.HTTP_409_CONFLICT
+
+        assert claim_job(job_id)
+        assert run_report_job(job_id)
+
+        poll = client.get(reverse('reportjob-detail', kwargs={'pk': job_id}))
+        assert poll.data['status'] == ReportJob.STATUS_COMPLETED
+        assert poll.data['progress'] == 100
+        assert 'artifact_path' not in poll.data
+        assert [p.name for p in report_job_root.iterdir()] == [f'{job_id}_analysis_{analysis_with_rows.id}.xlsx']
+
+        response = client.get(download_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert f'analysis_{analysis_with_rows.id}.xlsx' in response['Content-Disposition']
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+        assert workbook.sheetnames == ["Personal Info", "Pre-Injury Earnings", "Post-Injury Earnings"]
+
+    def test_failed_job_records_error(self, analysis, report_job_root):
+        job = enqueue_report(analysis, 'word')
+        claim_job(job.id)
+        report_job_root.rmdir()
+        report_job_root.write_text('not a directory')
+
+        assert not run_report_job(job.id)
+        job.refresh_from_db()
+        assert job.status == ReportJob.STATUS_FAILED
+        assert job.error
+        assert job.finished_at is not None
+
+    def test_worker_command_drains_queue(self, analysis_with_rows):
+        jobs = [enqueue_report(analysis_with_rows, t) for t in ('export_word', 'word', 'excel')]
+        out = io.StringIO()
+        call_command('run_report_worker', '--once', '--processes', '0', stdout=out)
+
+        assert 'Rendered 3 report(s), 0 failed' in out.getvalue()
+        for job in jobs:
+            job.refresh_from_db()
+            assert job.status == ReportJob.STATUS_COMPLETED
+        document = Document(jobs[0].artifact_path)
+        assert document.paragraphs[0].text == 'Economic Analysis Report'
+
+    def test_worker_command_fails_crashed_job(self, analysis_with_rows, monkeypatch):
+        job = enqueue_report(analysis_with_rows, 'word')
+
+        def crash(job_id):
+            raise ReportJob.DoesNotExist('ReportJob matching query does not exist.')
+
+        monkeypatch.setattr(run_report_worker, 'run_report_job', crash)
+        err = io.StringIO()
+        call_command('run_report_worker', '--once', '--processes', '0', stdout=io.StringIO(), stderr=err)
+
+        job.refresh_from_db()
+        assert job.status == ReportJob.STATUS_FAILED
+        assert job.error == 'ReportJob matching query does not exist.'
+        assert job.finished_at is not None
+        assert f'Job {job.id} crashed' in err.getvalue()
+
+    def test_worker_command_replaces_broken_pool(self, analysis_with_rows, monkeypatch):
+        monkeypatch.setattr(FakePool, 'created', 0)
+        monkeypatch.setattr(run_report_worker, 'ProcessPoolExecutor', FakePool)
+        lost, rendered = [enqueue_report(analysis_with_rows, 'word') for _ in range(2)]
+        out, err = io.StringIO(), io.StringIO()
+        call_command('run_report_worker', '--once', '--processes', '1', stdout=out, stderr=err)
+
+        assert 'Rendered 1 report(s), 1 failed' in out.getvalue()
+        assert 'starting a new pool' in err.getvalue()
+        assert FakePool.created == 2
+        lost.refresh_from_db()
+        rendered.refresh_from_db()
+        assert lost.status == ReportJob.STATUS_FAILED
+        assert 'terminated abruptly' in lost.error
+        assert rendered.status == ReportJob.STATUS_COMPLETED
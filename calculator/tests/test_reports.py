@@ -0,0 +1,85 @@
+import io
+import pytest
+from docx import Document
+from calculator.models import PreInjuryRow, PostInjuryRow
+from calculator.report_templates import ReportTemplate, append_table_rows, fill_placeholders
+from calculator.reports import write_analysis_document, write_summary_document
+
+
+def read_document(writer, analysis):
+    fileobj = io.BytesIO()
+    writer(analysis, fileobj)
+    return Document(io.BytesIO(fileobj.getvalue()))
+
+
+def build_skeleton():
+    doc = Document()
+    doc.add_paragraph('Name: {name}')
+    table = doc.add_table(rows=1, cols=2)
+    table.rows[0].cells[0].text = 'Year'
+    table.rows[0].cells[1].text = 'Amount'
+    return doc
+
+
+class TestReportTemplate:
+    def test_clones_are_independent(self):
+        template = ReportTemplate(build_skeleton)
+        first = template.clone()
+        fill_placeholders(first, {'name': 'John Doe'})
+        append_table_rows(first.tables[0], [['2023', ' $1.00 ']])
+
+        second = template.clone()
+        assert first.paragraphs[0].text == 'Name: John Doe'
+        assert second.paragraphs[0].text == 'Name: {name}'
+        assert len(second.tables[0].rows) == 1
+
+        fileobj = io.BytesIO()
+        first.save(fileobj)
+        saved = Document(io.BytesIO(fileobj.getvalue()))
+        assert saved.paragraphs[0].text == 'Name: John Doe'
+        assert [cell.text for cell in saved.tables[0].rows[1].cells] == ['2023', ' $1.00 ']
+
+
+@pytest.mark.django_db
+class TestWordReports:
+    def test_analysis_document(self, analysis):
+        PreInjuryRow.objects.create(
+            analysis=analysis, year=2023, portion_of_year=0.92, age=33.0, wage_base_years=50000
+        )
+        PostInjuryRow.objects.bulk_create([
+            PostInjuryRow(analysis=analysis, year=2023 + i, portion_of_year=1.0,
+                          age=33.0 + i, wage_base_years=20000)
+            for i in range(3)
+        ])
+        doc = read_document(write_analysis_document, analysis)
+
+        texts = [p.text for p in doc.paragraphs]
+        assert 'Name: John Doe' in texts
+        assert 'Date of Birth: 1990-01-01' in texts
+        pre, post = ([[cell.text for cell in row.cells] for row in table.rows] for table in doc.tables)
+        assert pre[0][0] == 'Year'
+        assert pre[1][:4] == ['2023', '92.0%', '33.0', '$50,000.00']
+        assert [row[0] for row in post[1:]] == ['2023', '2024', '2025']
+
+    def test_summary_document_sections(self, analysis):
+        analysis.include_health_insurance = True
+        analysis.health_insurance_base = 12000
+        analysis.health_cost_inflation_rate = 0.04
+        analysis.include_pension = True
+        analysis.pension_type = 'defined_contribution'
+        analysis.annual_contribution = 5000
+        analysis.expected_return_rate = 0.05
+        doc = read_document(write_summary_document, analysis)
+
+        texts = [p.text for p in doc.paragraphs]
+        assert 'Evaluee: John Doe' in texts
+        assert 'Pre-Injury Base Wage: $50,000.00' in texts
+        assert 'Base Amount: $12,000.00' in texts
+        assert 'Annual Contribution: $5,000.00' in texts
+        assert not any(text.startswith('Final Average Salary') for text in texts)
+
+        analysis.include_health_insurance = False
+        analysis.include_pension = False
+        texts = [p.text for p in read_document(write_summary_document, analysis).paragraphs]
+        assert 'Health Insurance' not in texts
+        assert 'Pension Information' not in texts
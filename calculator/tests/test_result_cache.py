@@ -0,0 +1,97 @@
+import pytest
+from unittest import mock
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from calculator.models import CalculationResult, EconomicAnalysis, PostInjuryRow
+from calculator import result_cache
+from calculator.result_cache import analysis_fingerprint
+
+
+@pytest.fixture
+def analysis_with_rows(analysis):
+    PostInjuryRow.objects.bulk_create([
+        PostInjuryRow(analysis=analysis, year=2023 + i, portion_of_year=1.0,
+                      age=33.0 + i, wage_base_years=20000)
+        for i in range(5)
+    ])
+    return analysis
+
+
+def calculate(analysis):
+    response = APIClient().get(reverse('analysis-calculate', kwargs={'pk': analysis.id}))
+    assert response.status_code == status.HTTP_200_OK
+    return response
+
+
+@pytest.mark.django_db
+class TestCalculationResultCache:
+    def test_repeat_calculate_is_a_single_lookup(self, analysis_with_rows):
+        first = calculate(analysis_with_rows)
+        assert CalculationResult.objects.filter(analysis=analysis_with_rows).exists()
+
+        with CaptureQueriesContext(connection) as queries:
+            second = calculate(analysis_with_rows)
+
+        # One query loads the analysis and evaluee, one reads the stored result
+        assert len(queries) == 2
+        assert second.json() == first.json()
+
+    def test_row_save_invalidates(self, analysis_with_rows):
+        calculate(analysis_with_rows)
+        row = analysis_with_rows.post_injury_rows.first()
+        row.wage_base_years = 40000
+        row.save()
+        assert not CalculationResult.objects.exists()
+
+        response = calculate(analysis_with_rows)
+        assert response.data['exhibit2']['data']['rows'][0]['wage_base_years'] == 40000
+
+    def test_row_delete_invalidates(self, analysis_with_rows):
+        calculate(analysis_with_rows)
+        analysis_with_rows.post_injury_rows.filter(year=2027).delete()
+        assert not CalculationResult.objects.exists()
+        assert len(calculate(analysis_with_rows).data['exhibit2']['data']['rows']) == 4
+
+    def test_analysis_save_invalidates(self, analysis_with_rows):
+        calculate(analysis_with_rows)
+        analysis_with_rows.adjustment_factor = 1.0
+        analysis_with_rows.save()
+        assert not CalculationResult.objects.exists()
+
+    def test_stale_fingerprint_is_recalculated(self, analysis_with_rows):
+        calculate(analysis_with_rows)
+        # queryset.update() bypasses signals; the fingerprint catches it
+        EconomicAnalysis.objects.filter(pk=analysis_with_rows.pk).update(adjustment_factor=1.0)
+
+        response = calculate(analysis_with_rows)
+        assert response.data['exhibit2']['adjustment_factor'] == 1.0
+        analysis_with_rows.refresh_from_db()
+        assert analysis_with_rows.calculation_result.fingerprint == analysis_fingerprint(analysis_with_rows)
+
+    def test_fingerprint_covers_evaluee(self, analysis):
+        before = analysis_fingerprint(analysis)
+        analysis.evaluee.first_name = "Jane"
+        assert analysis_fingerprint(analysis) != before
+
+    def test_version_change_is_a_miss(self, analysis_with_rows):
+        first = calculate(analysis_with_rows)
+        CalculationResult.objects.update(data={'stale': True})
+        assert calculate(analysis_with_rows).data == {'stale': True}
+
+        analysis_with_rows.refresh_from_db()
+        with mock.patch.object(result_cache, 'CALCULATION_VERSION', result_cache.CALCULATION_VERSION + 1):
+            response = calculate(analysis_with_rows)
+            fingerprint = analysis_fingerprint(analysis_with_rows)
+
+        assert response.json() == first.json()
+        assert fingerprint != analysis_fingerprint(analysis_with_rows)
+        assert CalculationResult.objects.get().fingerprint == fingerprint
+
+    def test_delete_analysis_with_cached_result(self, analysis_with_rows):
+        calculate(analysis_with_rows)
+        analysis_with_rows.delete()
+        assert not CalculationResult.objects.exists()
+        assert not PostInjuryRow.objects.exists()
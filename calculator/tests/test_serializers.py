@@ -0,0 +1,117 @@
+import pytest
+from datetime import date
+from unittest import mock
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from calculator.models import EconomicAnalysis, PreInjuryRow, PostInjuryRow
+from calculator.row_generation import build_injury_rows
+from calculator.serializers import EconomicAnalysisSerializer
+
+
+def analysis_data(worklife_expectancy=20.5, date_of_report='2023-12-01'):
+    return {
+        'date_of_injury': '2021-07-01',
+        'date_of_report': date_of_report,
+        'worklife_expectancy': worklife_expectancy,
+        'years_to_final_separation': worklife_expectancy,
+        'life_expectancy': 40.0,
+        'pre_injury_base_wage': 50000,
+        'post_injury_base_wage': 30000,
+        'growth_rate': 0.03,
+        'discount_rate': 0.02,
+    }
+
+
+def create_analysis(evaluee, **kwargs):
+    serializer = EconomicAnalysisSerializer(data=analysis_data(**kwargs))
+    serializer.is_valid(raise_exception=True)
+    return serializer.save(evaluee=evaluee)
+
+
+@pytest.mark.django_db
+class TestEconomicAnalysisSerializerCreate:
+    def test_generates_rows(self, evaluee):
+        analysis = create_analysis(evaluee)
+
+        pre_rows = list(analysis.pre_injury_rows.all())
+        post_rows = list(analysis.post_injury_rows.all())
+        assert [row.year for row in pre_rows] == [2021, 2022, 2023]
+        assert pre_rows[0].portion_of_year == pytest.approx(184 / 365)
+        assert pre_rows[1].portion_of_year == 1.0
+        assert pre_rows[2].portion_of_year == pytest.approx(334 / 365)
+        assert pre_rows[2].wage_base_years == pytest.approx(50000 * 1.03 ** 2)
+
+        assert [row.year for row in post_rows] == list(range(2023, 2044))
+        assert post_rows[0].portion_of_year == pytest.approx(31 / 365)
+        assert post_rows[-1].portion_of_year == pytest.approx(0.5)
+        assert post_rows[-1].wage_base_years == pytest.approx(20000 * 1.03 ** 22)
+
+    def test_query_count_independent_of_horizon(self, evaluee):
+        with CaptureQueriesContext(connection) as short:
+            create_analysis(evaluee, worklife_expectancy=5.0)
+        with CaptureQueriesContext(connection) as long:
+            create_analysis(evaluee, worklife_expectancy=45.0)
+
+        assert PostInjuryRow.objects.count() == 6 + 46
+        assert len(long) == len(short)
+        assert len(long) <= 6
+
+    def test_failure_rolls_back_analysis(self, evaluee):
+        with mock.patch.object(PostInjuryRow.objects, 'bulk_create', side_effect=RuntimeError('boom')):
+            with pytest.raises(serializers.ValidationError):
+                create_analysis(evaluee)
+
+        assert not EconomicAnalysis.objects.exists()
+        assert not PreInjuryRow.objects.exists()
+
+    def test_rejects_report_before_injury(self):
+        serializer = EconomicAnalysisSerializer(data=analysis_data(date_of_report='2021-06-30'))
+        assert not serializer.is_valid()
+        assert 'date_of_report' in serializer.errors
+
+    def test_partial_update_checks_stored_dates(self, evaluee):
+        analysis = create_analysis(evaluee)
+        serializer = EconomicAnalysisSerializer(analysis, data={'date_of_injury': '2024-01-01'}, partial=True)
+        assert not serializer.is_valid()
+        assert 'date_of_report' in serializer.errors
+
+        serializer = EconomicAnalysisSerializer(analysis, data={'date_of_report': '2021-07-01'}, partial=True)
+        assert serializer.is_valid(), serializer.errors
+
+
+@pytest.mark.django_db
+def test_build_injury_rows_returns_unsaved_rows(evaluee):
+    analysis = EconomicAnalysis(
+        evaluee=evaluee,
+        date_of_injury=date(2023, 1, 1),
+        date_of_report=date(2023, 12, 1),
+        worklife_expectancy=20.0,
+        years_to_final_separation=20.0,
+        life_expectancy=40.0,
+        pre_injury_base_wage=50000,
+        post_injury_base_wage=30000,
+        growth_rate=0.03,
+    )
+    pre_rows, post_rows = build_injury_rows(analysis)
+
+    assert len(pre_rows) == 1
+    assert len(post_rows) == 21
+    assert all(row.pk is None for row in pre_rows + post_rows)
+    assert post_rows[-1].portion_of_year == 1.0
+
+
+@pytest.mark.django_db
+def test_build_injury_rows_rejects_report_before_injury(evaluee):
+    analysis = EconomicAnalysis(
+        evaluee=evaluee,
+        date_of_injury=date(2023, 1, 1),
+        date_of_report=date(2022, 12, 31),
+        worklife_expectancy=20.0,
+        life_expectancy=40.0,
+        pre_injury_base_wage=50000,
+        post_injury_base_wage=30000,
+        growth_rate=0.03,
+    )
+    with pytest.raises(ValueError, match='before the date of injury'):
+        build_injury_rows(analysis)
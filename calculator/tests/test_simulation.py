@@ -0,0 +1,131 @@
+import io
+import json
+import math
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from calculator.projection import (
+    DISCOUNT_CONVENTIONS,
+    ProjectionParameters,
+    RowArrays,
+    convention_totals,
+    project_post_injury,
+)
+from calculator.row_generation import build_injury_rows
+from calculator.simulation import Distribution, SimulationModel, run_simulation
+from calculator.views import SIMULATION_MAX_DRAWS
+
+DISTRIBUTIONS = {
+    'growth_rate': {'distribution': 'normal', 'mean': 0.03, 'std': 0.005},
+    'discount_rate': {'distribution': 'uniform', 'low': 0.02, 'high': 0.05},
+    'worklife_expectancy': {'distribution': 'triangular', 'low': 15, 'mode': 20, 'high': 25},
+    'adjustment_factor': 0.754,
+}
+
+
+class TestDistribution:
+    def test_from_spec(self):
+        assert Distribution.from_spec(0.5) == Distribution('fixed', {'value': 0.5})
+        assert Distribution.from_spec({'distribution': 'uniform', 'low': 1, 'high': 3}).mean == 2.0
+
+    @pytest.mark.parametrize('spec', [
+        {'distribution': 'beta', 'a': 1},
+        {'distribution': 'normal', 'mean': 0.03},
+    ])
+    def test_invalid_spec(self, spec):
+        with pytest.raises(ValueError):
+            Distribution.from_spec(spec)
+
+
+@pytest.mark.django_db
+class TestSimulation:
+    def test_fixed_inputs_match_projection(self, analysis):
+        analysis.worklife_expectancy = 20.5
+        _, rows = build_injury_rows(analysis)
+        records = [(r.year, r.portion_of_year, r.age, r.wage_base_years) for r in rows]
+        expected = project_post_injury(ProjectionParameters.from_analysis(analysis), RowArrays.from_records(records))
+
+        result = run_simulation(SimulationModel.from_analysis(analysis), 10, seed=1)
+
+        assert result.point_estimate == pytest.approx(expected.totals['total_present_value'])
+        assert result.percentiles['p5'] == pytest.approx(result.point_estimate)
+        assert result.std == pytest.approx(0.0, abs=1e-6)
+
+    @pytest.mark.parametrize('convention', DISCOUNT_CONVENTIONS)
+    def test_fixed_inputs_match_convention_totals(self, analysis, convention):
+        analysis.worklife_expectancy = 20.5
+        analysis.discount_convention = convention
+        _, rows = build_injury_rows(analysis)
+        records = [(r.year, r.portion_of_year, r.age, r.wage_base_years) for r in rows]
+        totals = convention_totals(ProjectionParameters.from_analysis(analysis), RowArrays.from_records(records))
+
+        result = run_simulation(SimulationModel.from_analysis(analysis), 10, seed=1)
+
+        assert result.mean == pytest.approx(totals[convention]['total_present_value'])
+
+    @pytest.mark.parametrize('spec', [
+        -1.0,
+        {'distribution': 'uniform', 'low': -1.5, 'high': 0.05},
+        {'distribution': 'triangular', 'low': -1, 'mode': 0.02, 'high': 0.05},
+    ])
+    def test_rejects_rates_reaching_minus_one(self, analysis, spec):
+        with pytest.raises(ValueError, match='discount_rate must stay above -1'):
+            SimulationModel.from_analysis(analysis, {'discount_rate': spec})
+
+    def test_normal_rate_tails_are_clipped(self, analysis):
+        model = SimulationModel.from_analysis(
+            analysis, {'discount_rate': {'distribution': 'normal', 'mean': 0.02, 'std': 1.0}}
+        )
+        result = run_simulation(model, 5000, seed=11)
+        assert all(map(math.isfinite, [result.mean, result.std, *result.percentiles.values()]))
+
+    def test_reproducible_across_processes(self, analysis):
+        model = SimulationModel.from_analysis(analysis, DISTRIBUTIONS)
+        inline = run_simulation(model, 5000, seed=42, chunk_size=1000)
+        pooled = run_simulation(model, 5000, seed=42, chunk_size=1000, processes=2)
+        assert inline == pooled
+        assert run_simulation(model, 5000, seed=43, chunk_size=1000) != inline
+
+    def test_percentiles_are_ordered(self, analysis):
+        result = run_simulation(SimulationModel.from_analysis(analysis, DISTRIBUTIONS), 20000, seed=7)
+        assert result.percentiles['p5'] < result.percentiles['p50'] < result.percentiles['p95']
+
+    def test_unknown_field(self, analysis):
+        with pytest.raises(ValueError):
+            SimulationModel.from_analysis(analysis, {'life_expectancy': 40})
+
+    def test_simulate_action(self, analysis):
+        url = reverse('analysis-simulate', kwargs={'pk': analysis.id})
+        body = {'draws': 2000, 'seed': 3, 'distributions': DISTRIBUTIONS}
+        response = APIClient().post(url, body, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['seed'] == 3
+        assert set(response.data['percentiles']) == {'p5', 'p50', 'p95'}
+        assert APIClient().post(url, body, format='json').data == response.data
+
+    def test_simulate_action_rejects_bad_distribution(self, analysis):
+        url = reverse('analysis-simulate', kwargs={'pk': analysis.id})
+        body = {'distributions': {'growth_rate': {'distribution': 'beta'}}}
+        response = APIClient().post(url, body, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_simulate_action_caps_draws(self, analysis):
+        url = reverse('analysis-simulate', kwargs={'pk': analysis.id})
+        response = APIClient().post(url, {'draws': SIMULATION_MAX_DRAWS + 1}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'simulate_analysis' in response.data['detail']
+
+    def test_command(self, analysis, tmp_path):
+        config = tmp_path / 'distributions.json'
+        config.write_text(json.dumps(DISTRIBUTIONS))
+        out = io.StringIO()
+        call_command(
+            'simulate_analysis', str(analysis.id), '--draws', '3000', '--seed', '5',
+            '--processes', '0', '--distributions', str(config), stdout=out
+        )
+        output = out.getvalue()
+        assert 'Seed: 5' in output
+        assert 'P95:' in output
+        assert 'Simulated 3000 draws' in output
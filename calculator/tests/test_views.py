@@ -2,11 +2,15 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from calculator.models import (
     Evaluee,
     EconomicAnalysis,
     HealthcareCategory,
-    HealthcarePlan
+    HealthcarePlan,
+    PreInjuryRow,
+    PostInjuryRow
 )
 from datetime import date
 
@@ -117,6 +121,46 @@ class TestAnalysisViews:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['id'] == analysis.id
 
+    def test_list_analyses_query_count_is_constant(self, api_client):
+        def add_analyses(count):
+            for _ in range(count):
+                evaluee = Evaluee.objects.create(
+                    first_name=f"Evaluee {EconomicAnalysis.objects.count()}",
+                    last_name="Doe",
+                    date_of_birth=date(1990, 1, 1)
+                )
+                analysis = EconomicAnalysis.objects.create(
+                    evaluee=evaluee,
+                    date_of_injury=date(2023, 1, 1),
+                    date_of_report=date(2023, 12, 1),
+                    worklife_expectancy=20.0,
+                    years_to_final_separation=20.0,
+                    life_expectancy=40.0,
+                    pre_injury_base_wage=50000,
+                    post_injury_base_wage=30000
+                )
+                PreInjuryRow.objects.create(
+                    analysis=analysis, year=2023, portion_of_year=0.92, age=33.0, wage_base_years=50000
+                )
+                PostInjuryRow.objects.bulk_create([
+                    PostInjuryRow(analysis=analysis, year=2023 + year, portion_of_year=1.0,
+                                  age=33.0 + year, wage_base_years=20000)
+                    for year in range(3)
+                ])
+
+        url = reverse('analysis-list')
+        add_analyses(2)
+        with CaptureQueriesContext(connection) as few:
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+
+        add_analyses(8)
+        with CaptureQueriesContext(connection) as many:
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 10
+        assert len(many) == len(few)
+
     def test_get_analysis_details(self, api_client, analysis):
         url = reverse('analysis-detail', kwargs={'pk': analysis.id})
         response = api_client.get(url)
@@ -1,22 +1,55 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
-from .models import EconomicAnalysis, Evaluee, HealthcareCategory, HealthcarePlan, HealthcareCost
-from .serializers import EconomicAnalysisSerializer, EvalueeSerializer, HealthcareCategorySerializer, HealthcarePlanSerializer, HealthcareCostSerializer
-from openpyxl import Workbook
-from docx import Document
-from django.http import HttpResponse
-from decimal import Decimal, ROUND_HALF_UP
+from .models import EconomicAnalysis, Evaluee, HealthcareCategory, HealthcarePlan, ReportJob
+from .serializers import EconomicAnalysisSerializer, EvalueeSerializer, HealthcareCategorySerializer, HealthcarePlanSerializer, HealthcareCostSerializer, ReportJobSerializer
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from .aef import AEF_STEPS, evaluate_aef_batch
+from .bulk_export import DEFAULT_EXPORT_FORMATS, ZIP_CONTENT_TYPE, stream_export_zip
+from .excel_export import XLSX_CONTENT_TYPE, streaming_workbook_response, write_analysis_workbook, write_bulk_workbook
+from .factor_tables import factor_tables
+from .healthcare_costs import replace_plan_costs
+from .profiling import profile_store, profiled_section
+from .projection import ProjectionParameters, RowArrays, convention_totals, project_analysis, sensitivity_grid
+from .report_jobs import enqueue_report
+from .reports import DOCX_CONTENT_TYPE, REPORT_FORMATS, report_filename, write_analysis_document, write_summary_document, write_summary_workbook
+from .result_cache import analysis_fingerprint, get_cached_calculation, store_calculation
+from .simulation import SimulationModel, run_simulation
+
+SENSITIVITY_MAX_VALUES = 200
+# Draws run in the request thread; larger runs belong in simulate_analysis
+SIMULATION_MAX_DRAWS = 100000
+BULK_EXPORT_MAX_ANALYSES = 500
+AEF_BATCH_MAX_INPUTS = 100000
+
+
+def _rate_list(request, name, default):
+    """Parse a comma separated ``?name=`` list of numbers"""
+    raw = request.query_params.get(name)
+    if not raw:
+        return [default]
+    values = [float(value) for value in raw.split(',')]
+    if len(values) > SENSITIVITY_MAX_VALUES:
+        raise ValueError(f'{name} accepts at most {SENSITIVITY_MAX_VALUES} values')
+    return values
 
 class EvalueeViewSet(viewsets.ModelViewSet):
     queryset = Evaluee.objects.all()
     serializer_class = EvalueeSerializer
 
 class EconomicAnalysisViewSet(viewsets.ModelViewSet):
-    queryset = EconomicAnalysis.objects.all()
+    queryset = EconomicAnalysis.objects.select_related('evaluee')
     serializer_class = EconomicAnalysisSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # The serializer nests both row sets; other actions read rows directly
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.prefetch_related('pre_injury_rows', 'post_injury_rows')
+        return queryset
+
     def create(self, request, *args, **kwargs):
         try:
             return super().create(request, *args, **kwargs)
@@ -26,23 +59,15 @@ class EconomicAnalysisViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-    def _calculate_benefits_loss(self, base_earnings, benefits_rate):
-        """Calculate benefits loss based on base earnings and benefits rate"""
-        return base_earnings * (benefits_rate / 100)
-
-    def _calculate_insurance_loss(self, base_amount, growth_rate, years):
-        """Calculate insurance loss with growth over years"""
-        total_loss = 0
-        current_amount = base_amount
-        for year in range(years):
-            total_loss += current_amount
-            current_amount *= (1 + growth_rate / 100)
-        return total_loss
-
     @action(detail=True, methods=['get'])
     def calculate(self, request, pk=None):
         try:
             analysis = self.get_object()
+            fingerprint = analysis_fingerprint(analysis)
+            cached = get_cached_calculation(analysis, fingerprint)
+            if cached is not None:
+                return Response(cached)
+
             evaluee = analysis.evaluee
 
             # Calculate age at injury and current age
@@ -73,95 +98,7 @@ class EconomicAnalysisViewSet(viewsets.ModelViewSet):
                 'date_of_death': date_of_death,
             }
 
-            # Pre-Injury Data
-            pre_injury_rows = []
-            total_future_value_pre = 0
-            total_benefits_pre = 0
-            total_insurance_pre = 0
-
-            for row in analysis.pre_injury_rows.all():
-                # Format portion of year as percentage
-                portion_percentage = Decimal(row.portion_of_year * 100).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)
-                
-                # Calculate gross earnings (grown wage * portion of year)
-                gross_earnings = row.wage_base_years * row.portion_of_year
-                
-                # Apply adjustment factor
-                adjusted_earnings = gross_earnings * analysis.adjustment_factor
-
-                # Calculate benefits and insurance losses
-                benefits_loss = self._calculate_benefits_loss(gross_earnings, analysis.benefits_rate)
-                insurance_loss = self._calculate_insurance_loss(
-                    analysis.health_insurance_base,
-                    analysis.growth_rate,
-                    1  # For pre-injury period
-                )
-
-                total_future_value_pre += adjusted_earnings
-                total_benefits_pre += benefits_loss
-                total_insurance_pre += insurance_loss
-
-                pre_injury_rows.append({
-                    'year': row.year,
-                    'portion_of_year': f"{portion_percentage}%",
-                    'age': row.age,
-                    'wage_base_years': row.wage_base_years,
-                    'gross_earnings': gross_earnings,
-                    'adjusted_earnings': adjusted_earnings,
-                    'benefits_loss': benefits_loss,
-                    'insurance_loss': insurance_loss
-                })
-
-            # Post-Injury Data
-            post_injury_rows = []
-            total_future_value_post = 0
-            total_present_value_post = 0
-            total_benefits_post = 0
-            total_insurance_post = 0
-
-            for row in analysis.post_injury_rows.all():
-                # Format portion of year as percentage
-                portion_percentage = Decimal(row.portion_of_year * 100).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)
-                
-                # Calculate gross earnings
-                gross_earnings = row.wage_base_years * row.portion_of_year
-                
-                # Apply adjustment factor
-                adjusted_earnings = gross_earnings * analysis.adjustment_factor
-
-                # Calculate benefits and insurance losses
-                benefits_loss = self._calculate_benefits_loss(gross_earnings, analysis.benefits_rate)
-                insurance_loss = self._calculate_insurance_loss(
-                    analysis.health_insurance_base,
-                    analysis.growth_rate,
-                    row.year - analysis.date_of_report.year + 1
-                )
-
-                # Apply discounting if enabled
-                if analysis.apply_discounting and analysis.discount_rate:
-                    years_from_report = row.year - analysis.date_of_report.year
-                    discount_factor = (1 + analysis.discount_rate) ** years_from_report
-                    present_value = adjusted_earnings / discount_factor
-                    benefits_present_value = benefits_loss / discount_factor
-                    insurance_present_value = insurance_loss / discount_factor
-                    total_present_value_post += present_value
-                    total_benefits_post += benefits_present_value
-                    total_insurance_post += insurance_present_value
-                else:
-                    total_future_value_post += adjusted_earnings
-                    total_benefits_post += benefits_loss
-                    total_insurance_post += insurance_loss
-
-                post_injury_rows.append({
-                    'year': row.year,
-                    'portion_of_year': f"{portion_percentage}%",
-                    'age': row.age,
-                    'wage_base_years': row.wage_base_years,
-                    'gross_earnings': gross_earnings,
-                    'adjusted_earnings': adjusted_earnings,
-                    'benefits_loss': benefits_loss,
-                    'insurance_loss': insurance_loss
-                })
+            pre, post = project_analysis(analysis)
 
             # Prepare response data
             response_data = {
@@ -172,10 +109,10 @@ class EconomicAnalysisViewSet(viewsets.ModelViewSet):
                     'growth_rate': analysis.growth_rate,
                     'adjustment_factor': analysis.adjustment_factor,
                     'data': {
-                        'rows': pre_injury_rows,
-                        'total_future_value': total_future_value_pre,
-                        'total_benefits': total_benefits_pre,
-                        'total_insurance': total_insurance_pre
+                        'rows': pre.row_dicts(),
+                        'total_future_value': pre.totals['total_future_value'],
+                        'total_benefits': pre.totals['total_benefits'],
+                        'total_insurance': pre.totals['total_insurance']
                     }
                 },
                 'exhibit2': {
@@ -184,15 +121,17 @@ class EconomicAnalysisViewSet(viewsets.ModelViewSet):
                     'growth_rate': analysis.growth_rate,
                     'adjustment_factor': analysis.adjustment_factor,
                     'data': {
-                        'rows': post_injury_rows,
-                        'total_future_value': total_future_value_post,
-                        'total_present_value': total_present_value_post if analysis.apply_discounting else None,
-                        'total_benefits': total_benefits_post,
-                        'total_insurance': total_insurance_post
+                        'rows': post.row_dicts(),
+                        'total_future_value': post.totals['total_future_value'],
+                        'total_present_value': post.totals['total_present_value'] if analysis.apply_discounting else None,
+                        'discount_convention': analysis.discount_convention,
+                        'total_benefits': post.totals['total_benefits'],
+                        'total_insurance': post.totals['total_insurance']
                     }
                 }
             }
 
+            store_calculation(analysis, fingerprint, response_data)
             return Response(response_data)
         except Exception as e:
             return Response(
@@ -201,171 +140,187 @@ class EconomicAnalysisViewSet(viewsets.ModelViewSet):
             )
 
     @action(detail=True, methods=['get'])
-    def export_excel(self, request, pk=None):
+    def sensitivity(self, request, pk=None):
+        """
+        Post-injury totals over a grid of assumptions.
+
+        ``?discount_rates=``, ``?growth_rates=`` and ``?adjustment_factors=``
+        take comma separated values and default to the analysis' own. Every
+        total is a nested list indexed ``[discount][growth][adjustment]``.
+        """
         try:
             analysis = self.get_object()
-            response = HttpResponse(
-                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            discount_rates = _rate_list(request, 'discount_rates', analysis.discount_rate or 0.0)
+            growth_rates = _rate_list(request, 'growth_rates', analysis.growth_rate)
+            adjustment_factors = _rate_list(request, 'adjustment_factors', analysis.adjustment_factor)
+            if min(discount_rates) <= -1 or min(growth_rates) <= -1:
+                raise ValueError('Discount and growth rates must be greater than -1')
+
+            grid = sensitivity_grid(
+                ProjectionParameters.from_analysis(analysis),
+                RowArrays.from_queryset(analysis.post_injury_rows.all()),
+                discount_rates,
+                growth_rates,
+                adjustment_factors,
             )
-            response['Content-Disposition'] = f'attachment; filename=analysis_{analysis.id}.xlsx'
-
-            workbook = Workbook()
-            
-            # Personal Info Sheet
-            ws = workbook.active
-            ws.title = "Personal Info"
-            
-            # Add headers and data for personal info
-            personal_info = [
-                ["First Name", analysis.evaluee.first_name],
-                ["Last Name", analysis.evaluee.last_name],
-                ["Date of Birth", analysis.evaluee.date_of_birth],
-                ["Date of Injury", analysis.date_of_injury],
-                ["Date of Report", analysis.date_of_report],
-                ["Age at Injury", (analysis.date_of_injury - analysis.evaluee.date_of_birth).days / 365.25],
-                ["Worklife Expectancy", analysis.worklife_expectancy],
-                ["Life Expectancy", analysis.life_expectancy],
-            ]
-            
-            for row in personal_info:
-                ws.append(row)
-
-            # Pre-Injury Sheet
-            ws_pre = workbook.create_sheet("Pre-Injury Earnings")
-            headers = ["Year", "Portion of Year", "Age", "Wage Base", "Gross Earnings", "Adjusted Earnings", "Benefits Loss", "Insurance Loss"]
-            ws_pre.append(headers)
-            
-            for row in analysis.pre_injury_rows.all():
-                gross_earnings = row.wage_base_years * row.portion_of_year
-                adjusted_earnings = gross_earnings * analysis.adjustment_factor
-                benefits_loss = self._calculate_benefits_loss(gross_earnings, analysis.benefits_rate)
-                insurance_loss = self._calculate_insurance_loss(
-                    analysis.health_insurance_base,
-                    analysis.growth_rate,
-                    1  # For pre-injury period
-                )
-                ws_pre.append([
-                    row.year,
-                    f"{Decimal(row.portion_of_year * 100).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)}%",
-                    row.age,
-                    row.wage_base_years,
-                    gross_earnings,
-                    adjusted_earnings,
-                    benefits_loss,
-                    insurance_loss
-                ])
-
-            # Post-Injury Sheet
-            ws_post = workbook.create_sheet("Post-Injury Earnings")
-            ws_post.append(headers)
-            
-            for row in analysis.post_injury_rows.all():
-                gross_earnings = row.wage_base_years * row.portion_of_year
-                adjusted_earnings = gross_earnings * analysis.adjustment_factor
-                benefits_loss = self._calculate_benefits_loss(gross_earnings, analysis.benefits_rate)
-                insurance_loss = self._calculate_insurance_loss(
-                    analysis.health_insurance_base,
-                    analysis.growth_rate,
-                    row.year - analysis.date_of_report.year + 1
+            return Response({
+                'discount_rates': discount_rates,
+                'growth_rates': growth_rates,
+                'adjustment_factors': adjustment_factors,
+                **{name: totals.tolist() for name, totals in grid.items()},
+            })
+        except Exception as e:
+            return Response(
+                {'detail': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    @action(detail=True, methods=['get'], url_path='discount-conventions')
+    def discount_conventions(self, request, pk=None):
+        """
+        Post-injury present value totals under every discounting convention.
+
+        Lets the conventions be compared side by side without switching the
+        analysis' own ``discount_convention`` and recalculating.
+        """
+        try:
+            analysis = self.get_object()
+            totals = convention_totals(
+                ProjectionParameters.from_analysis(analysis),
+                RowArrays.from_queryset(analysis.post_injury_rows.all()),
+            )
+            return Response({
+                'discount_rate': analysis.discount_rate,
+                'discount_convention': analysis.discount_convention,
+                'conventions': totals,
+            })
+        except Exception as e:
+            return Response(
+                {'detail': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    @action(detail=True, methods=['post'])
+    def simulate(self, request, pk=None):
+        """
+        Monte Carlo percentiles of the post-injury present value.
+
+        The body may give ``draws``, ``seed`` and a ``distributions`` mapping
+        of growth_rate, discount_rate, worklife_expectancy or
+        adjustment_factor to a number or ``{"distribution": ..., ...}``.
+        Larger runs belong in the ``simulate_analysis`` command.
+        """
+        try:
+            analysis = self.get_object()
+            draws = int(request.data.get('draws', 10000))
+            if draws > SIMULATION_MAX_DRAWS:
+                raise ValueError(
+                    f'draws must be at most {SIMULATION_MAX_DRAWS}; '
+                    'run larger simulations with the simulate_analysis command'
                 )
-                ws_post.append([
-                    row.year,
-                    f"{Decimal(row.portion_of_year * 100).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)}%",
-                    row.age,
-                    row.wage_base_years,
-                    gross_earnings,
-                    adjusted_earnings,
-                    benefits_loss,
-                    insurance_loss
-                ])
-
-            workbook.save(response)
-            return response
-            
+            seed = request.data.get('seed')
+            model = SimulationModel.from_analysis(analysis, request.data.get('distributions'))
+            with profiled_section('calculation'):
+                result = run_simulation(model, draws, seed=None if seed is None else int(seed))
+            return Response(result.as_dict())
+        except Exception as e:
+            return Response(
+                {'detail': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    @action(detail=True, methods=['get'])
+    def export_excel(self, request, pk=None):
+        try:
+            analysis = self.get_object()
+            return streaming_workbook_response(
+                lambda fileobj: write_analysis_workbook(analysis, fileobj),
+                f'analysis_{analysis.id}.xlsx'
+            )
         except Exception as e:
             return Response(
                 {'detail': f'Failed to export Excel: {str(e)}'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    @action(detail=False, methods=['get'])
+    def export_excel_bulk(self, request):
+        """Export the analyses in ``?ids=1,2,3`` into one workbook"""
+        try:
+            ids = request.query_params.get('ids')
+            if not ids:
+                raise ValueError('ids must list the analyses to export')
+            ids = {int(i) for i in ids.split(',')}
+            if len(ids) > BULK_EXPORT_MAX_ANALYSES:
+                raise ValueError(f'ids accepts at most {BULK_EXPORT_MAX_ANALYSES} analyses')
+            analyses = (
+                self.get_queryset()
+                .prefetch_related('pre_injury_rows', 'post_injury_rows')
+                .filter(id__in=ids)
+            )
+            return streaming_workbook_response(
+                lambda fileobj: write_bulk_workbook(analyses.iterator(chunk_size=100), fileobj),
+                'analyses.xlsx'
+            )
+        except Exception as e:
+            return Response(
+                {'detail': f'Failed to export Excel: {str(e)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    @action(detail=False, methods=['post'], url_path='bulk-export')
+    def bulk_export(self, request):
+        """
+        Stream one ZIP holding the ``formats`` reports of every analysis in ``ids``.
+
+        ``formats`` are report types as for ``report-jobs`` and default to
+        ``export_excel`` and ``export_word``.
+        """
+        try:
+            ids = request.data.get('ids')
+            if not isinstance(ids, list) or not ids:
+                raise ValueError('ids must be a non-empty list of analysis ids')
+            ids = sorted({int(i) for i in ids})
+            if len(ids) > BULK_EXPORT_MAX_ANALYSES:
+                raise ValueError(f'ids accepts at most {BULK_EXPORT_MAX_ANALYSES} analyses')
+            report_types = request.data.get('formats') or list(DEFAULT_EXPORT_FORMATS)
+            unknown = [report_type for report_type in report_types if report_type not in REPORT_FORMATS]
+            if unknown:
+                raise ValueError(f'formats must be among: {", ".join(REPORT_FORMATS)}')
+
+            analyses = list(
+                self.get_queryset()
+                .filter(id__in=ids)
+                .prefetch_related('pre_injury_rows', 'post_injury_rows')
+                .order_by('id')
+            )
+            missing = set(ids) - {analysis.id for analysis in analyses}
+            if missing:
+                return Response(
+                    {'detail': f'Analyses not found: {", ".join(map(str, sorted(missing)))}'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+        except Exception as e:
+            return Response(
+                {'detail': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        response = StreamingHttpResponse(
+            stream_export_zip(analyses, list(dict.fromkeys(report_types))),
+            content_type=ZIP_CONTENT_TYPE
+        )
+        response['Content-Disposition'] = 'attachment; filename=analyses.zip'
+        return response
+
     @action(detail=True, methods=['get'])
     def export_word(self, request, pk=None):
         try:
             analysis = self.get_object()
-            
-            # Create a new document
-            doc = Document()
-            doc.add_heading('Economic Analysis Report', 0)
-            
-            # Add personal information section
-            doc.add_heading('Personal Information', level=1)
-            doc.add_paragraph(f'Name: {analysis.evaluee.first_name} {analysis.evaluee.last_name}')
-            doc.add_paragraph(f'Date of Birth: {analysis.evaluee.date_of_birth}')
-            doc.add_paragraph(f'Date of Injury: {analysis.date_of_injury}')
-            doc.add_paragraph(f'Date of Report: {analysis.date_of_report}')
-            
-            # Add pre-injury earnings section
-            doc.add_heading('Pre-Injury Earnings', level=1)
-            table = doc.add_table(rows=1, cols=8)
-            table.style = 'Table Grid'
-            header_cells = table.rows[0].cells
-            headers = ["Year", "Portion of Year", "Age", "Wage Base", "Gross Earnings", "Adjusted Earnings", "Benefits Loss", "Insurance Loss"]
-            for i, header in enumerate(headers):
-                header_cells[i].text = header
-                
-            for row in analysis.pre_injury_rows.all():
-                gross_earnings = row.wage_base_years * row.portion_of_year
-                adjusted_earnings = gross_earnings * analysis.adjustment_factor
-                benefits_loss = self._calculate_benefits_loss(gross_earnings, analysis.benefits_rate)
-                insurance_loss = self._calculate_insurance_loss(
-                    analysis.health_insurance_base,
-                    analysis.growth_rate,
-                    1  # For pre-injury period
-                )
-                row_cells = table.add_row().cells
-                row_cells[0].text = str(row.year)
-                row_cells[1].text = f"{Decimal(row.portion_of_year * 100).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)}%"
-                row_cells[2].text = f"{row.age:.1f}"
-                row_cells[3].text = f"${row.wage_base_years:,.2f}"
-                row_cells[4].text = f"${gross_earnings:,.2f}"
-                row_cells[5].text = f"${adjusted_earnings:,.2f}"
-                row_cells[6].text = f"${benefits_loss:,.2f}"
-                row_cells[7].text = f"${insurance_loss:,.2f}"
-                
-            # Add post-injury earnings section
-            doc.add_heading('Post-Injury Earnings', level=1)
-            table = doc.add_table(rows=1, cols=8)
-            table.style = 'Table Grid'
-            header_cells = table.rows[0].cells
-            for i, header in enumerate(headers):
-                header_cells[i].text = header
-                
-            for row in analysis.post_injury_rows.all():
-                gross_earnings = row.wage_base_years * row.portion_of_year
-                adjusted_earnings = gross_earnings * analysis.adjustment_factor
-                benefits_loss = self._calculate_benefits_loss(gross_earnings, analysis.benefits_rate)
-                insurance_loss = self._calculate_insurance_loss(
-                    analysis.health_insurance_base,
-                    analysis.growth_rate,
-                    row.year - analysis.date_of_report.year + 1
-                )
-                row_cells = table.add_row().cells
-                row_cells[0].text = str(row.year)
-                row_cells[1].text = f"{Decimal(row.portion_of_year * 100).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)}%"
-                row_cells[2].text = f"{row.age:.1f}"
-                row_cells[3].text = f"${row.wage_base_years:,.2f}"
-                row_cells[4].text = f"${gross_earnings:,.2f}"
-                row_cells[5].text = f"${adjusted_earnings:,.2f}"
-                row_cells[6].text = f"${benefits_loss:,.2f}"
-                row_cells[7].text = f"${insurance_loss:,.2f}"
-            
-            # Save the document
-            response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document')
+            response = HttpResponse(content_type=DOCX_CONTENT_TYPE)
             response['Content-Disposition'] = f'attachment; filename=analysis_{analysis.id}.docx'
-            doc.save(response)
-            
+            write_analysis_document(analysis, response)
             return response
-            
         except Exception as e:
             return Response(
                 {'detail': f'Failed to export Word: {str(e)}'},
@@ -377,54 +332,9 @@ class EconomicAnalysisViewSet(viewsets.ModelViewSet):
         """Generate Excel report for the analysis"""
         try:
             analysis = self.get_object()
-            
-            # Create workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Economic Analysis"
-            
-            # Add headers
-            ws['A1'] = "Economic Analysis Report"
-            ws['A2'] = f"Evaluee: {analysis.evaluee.first_name} {analysis.evaluee.last_name}"
-            ws['A3'] = f"Date of Injury: {analysis.date_of_injury}"
-            ws['A4'] = f"Date of Report: {analysis.date_of_report}"
-            
-            # Add analysis details
-            ws['A6'] = "Pre-Injury Base Wage"
-            ws['B6'] = analysis.pre_injury_base_wage
-            ws['A7'] = "Post-Injury Base Wage"
-            ws['B7'] = analysis.post_injury_base_wage
-            ws['A8'] = "Growth Rate"
-            ws['B8'] = f"{analysis.growth_rate * 100}%"
-            ws['A9'] = "Adjustment Factor"
-            ws['B9'] = analysis.adjustment_factor
-            
-            if analysis.include_health_insurance:
-                ws['A11'] = "Health Insurance"
-                ws['B11'] = analysis.health_insurance_base
-                ws['A12'] = "Health Cost Inflation Rate"
-                ws['B12'] = f"{analysis.health_cost_inflation_rate * 100}%"
-            
-            if analysis.include_pension:
-                ws['A14'] = "Pension Information"
-                ws['B14'] = analysis.pension_type
-                if analysis.pension_type == 'defined_benefit':
-                    ws['A15'] = "Final Average Salary"
-                    ws['B15'] = analysis.final_average_salary
-                    ws['A16'] = "Years of Service"
-                    ws['B16'] = analysis.years_of_service
-                    ws['A17'] = "Benefit Multiplier"
-                    ws['B17'] = f"{analysis.benefit_multiplier * 100}%"
-                else:
-                    ws['A15'] = "Annual Contribution"
-                    ws['B15'] = analysis.annual_contribution
-                    ws['A16'] = "Expected Return Rate"
-                    ws['B16'] = f"{analysis.expected_return_rate * 100}%"
-            
-            # Create response
-            response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+            response = HttpResponse(content_type=XLSX_CONTENT_TYPE)
             response['Content-Disposition'] = f'attachment; filename=analysis_{pk}.xlsx'
-            wb.save(response)
+            write_summary_workbook(analysis, response)
             return response
         except Exception as e:
             return Response(
@@ -437,43 +347,9 @@ class EconomicAnalysisViewSet(viewsets.ModelViewSet):
         """Generate Word report for the analysis"""
         try:
             analysis = self.get_object()
-            
-            # Create document
-            doc = Document()
-            doc.add_heading('Economic Analysis Report', 0)
-            
-            # Add evaluee information
-            doc.add_paragraph(f"Evaluee: {analysis.evaluee.first_name} {analysis.evaluee.last_name}")
-            doc.add_paragraph(f"Date of Injury: {analysis.date_of_injury}")
-            doc.add_paragraph(f"Date of Report: {analysis.date_of_report}")
-            
-            # Add analysis details
-            doc.add_heading('Analysis Details', level=1)
-            doc.add_paragraph(f"Pre-Injury Base Wage: ${analysis.pre_injury_base_wage:,.2f}")
-            doc.add_paragraph(f"Post-Injury Base Wage: ${analysis.post_injury_base_wage:,.2f}")
-            doc.add_paragraph(f"Growth Rate: {analysis.growth_rate * 100}%")
-            doc.add_paragraph(f"Adjustment Factor: {analysis.adjustment_factor}")
-            
-            if analysis.include_health_insurance:
-                doc.add_heading('Health Insurance', level=1)
-                doc.add_paragraph(f"Base Amount: ${analysis.health_insurance_base:,.2f}")
-                doc.add_paragraph(f"Inflation Rate: {analysis.health_cost_inflation_rate * 100}%")
-            
-            if analysis.include_pension:
-                doc.add_heading('Pension Information', level=1)
-                doc.add_paragraph(f"Pension Type: {analysis.pension_type}")
-                if analysis.pension_type == 'defined_benefit':
-                    doc.add_paragraph(f"Final Average Salary: ${analysis.final_average_salary:,.2f}")
-                    doc.add_paragraph(f"Years of Service: {analysis.years_of_service}")
-                    doc.add_paragraph(f"Benefit Multiplier: {analysis.benefit_multiplier * 100}%")
-                else:
-                    doc.add_paragraph(f"Annual Contribution: ${analysis.annual_contribution:,.2f}")
-                    doc.add_paragraph(f"Expected Return Rate: {analysis.expected_return_rate * 100}%")
-            
-            # Create response
-            response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document')
+            response = HttpResponse(content_type=DOCX_CONTENT_TYPE)
             response['Content-Disposition'] = f'attachment; filename=analysis_{pk}.docx'
-            doc.save(response)
+            write_summary_document(analysis, response)
             return response
         except Exception as e:
             return Response(
@@ -481,6 +357,86 @@ class EconomicAnalysisViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    @action(detail=True, methods=['post'], url_path='report-jobs')
+    def report_jobs(self, request, pk=None):
+        """Queue a report for the background worker (``run_report_worker``)"""
+        analysis = self.get_object()
+        report_type = request.data.get('report_type')
+        if report_type not in REPORT_FORMATS:
+            return Response(
+                {'detail': f'report_type must be one of: {", ".join(REPORT_FORMATS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        job = enqueue_report(analysis, report_type)
+        return Response(ReportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+class ReportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = ReportJob.objects.all()
+    serializer_class = ReportJobSerializer
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != ReportJob.STATUS_COMPLETED:
+            return Response(
+                {'detail': f'Report is {job.status}', 'progress': job.progress},
+                status=status.HTTP_409_CONFLICT
+            )
+        try:
+            fileobj = open(job.artifact_path, 'rb')
+        except OSError:
+            return Response({'detail': 'Report file is no longer available'}, status=status.HTTP_410_GONE)
+        return FileResponse(
+            fileobj,
+            as_attachment=True,
+            filename=report_filename(job.report_type, job.analysis_id),
+            content_type=REPORT_FORMATS[job.report_type].content_type
+        )
+
+class AEFViewSet(viewsets.ViewSet):
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """
+        Evaluate many AEF input vectors in one pass.
+
+        The body is ``{"inputs": [...]}`` where each entry maps AEF inputs
+        (percentages) to values; missing inputs take the calculator defaults.
+        Each result holds every intermediate step, in input order.
+        """
+        try:
+            vectors = request.data.get('inputs')
+            if not isinstance(vectors, list):
+                raise ValueError('inputs must be a list of AEF input objects')
+            if len(vectors) > AEF_BATCH_MAX_INPUTS:
+                raise ValueError(f'inputs accepts at most {AEF_BATCH_MAX_INPUTS} entries')
+            with profiled_section('calculation'):
+                results = evaluate_aef_batch(vectors)
+            return Response({'steps': AEF_STEPS, 'count': len(results), 'results': results})
+        except Exception as e:
+            return Response(
+                {'detail': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+class FactorTableViewSet(viewsets.ViewSet):
+    """Hit rate and size of this process' growth/discount factor tables"""
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        return Response(factor_tables.stats())
+
+class ProfilingViewSet(viewsets.ViewSet):
+    """Rolling request timings recorded by ``RequestProfilingMiddleware``"""
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        return Response(profile_store.summary())
+
+    @action(detail=False, methods=['post'])
+    def reset(self, request):
+        profile_store.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
 class HealthcareCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = HealthcareCategory.objects.all()
     serializer_class = HealthcareCategorySerializer
@@ -506,44 +462,9 @@ class HealthcarePlanViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def calculate_costs(self, request, analysis_pk=None):
-        analysis = get_object_or_404(EconomicAnalysis, id=analysis_pk)
-        plans = self.get_queryset().filter(is_active=True)
-        
-        # Delete existing costs
-        HealthcareCost.objects.filter(plan__in=plans).delete()
-        
-        # Calculate costs for each plan
-        for plan in plans:
-            category = plan.category
-            base_cost = plan.base_cost
-            growth_rate = category.growth_rate
-            frequency = category.frequency_years
-            
-            # Get the year range from the analysis
-            start_year = analysis.date_of_injury.year
-            end_year = start_year + int(analysis.life_expectancy)
-            
-            # Calculate age at start
-            age_at_start = (analysis.date_of_injury - analysis.evaluee.date_of_birth).days / 365.25
-            
-            costs = []
-            for year in range(start_year, end_year + 1):
-                years_from_start = year - start_year
-                age = age_at_start + years_from_start
-                
-                # Check if this is a treatment year based on frequency
-                if frequency == 1 or years_from_start % int(frequency) == 0:
-                    # Calculate grown cost
-                    cost = base_cost * (1 + growth_rate) ** years_from_start
-                    
-                    costs.append(HealthcareCost(
-                        plan=plan,
-                        year=year,
-                        age=age,
-                        cost=cost
-                    ))
-            
-            # Bulk create the costs
-            HealthcareCost.objects.bulk_create(costs)
-        
-        return Response({'status': 'Costs calculated successfully'})
+        analysis = get_object_or_404(EconomicAnalysis.objects.select_related('evaluee'), id=analysis_pk)
+        recalculated = replace_plan_costs(analysis, self.get_queryset())
+        return Response({
+            'status': 'Costs calculated successfully',
+            'recalculated_plans': [plan.id for plan in recalculated],
+        })
@@ -0,0 +1,32 @@
+"""
+Process-pool entry points for the management commands and bulk export.
+
+Workers are spawned rather than forked so none of them shares the parent's
+database connection. A spawned worker unpickles these functions before
+Django is configured, so this module must not import models at load time.
+"""
+import io
+
+import django
+
+
+def init_worker():
+    django.setup()
+
+
+def render_report(job_id):
+    from .report_jobs import run_report_job
+    return run_report_job(job_id)
+
+
+def recalculate_rows(records):
+    from .recalculation import recalculate_batch
+    return recalculate_batch(records)
+
+
+def render_export(analysis, report_type):
+    """Render one report for an analysis whose evaluee and rows are loaded"""
+    from .reports import REPORT_FORMATS
+    fileobj = io.BytesIO()
+    REPORT_FORMATS[report_type].writer(analysis, fileobj)
+    return fileobj.getvalue()
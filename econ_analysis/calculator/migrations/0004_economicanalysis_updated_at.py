@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-16 22:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calculator", "0003_economicanalysis_post_discount_rate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="economicanalysis",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
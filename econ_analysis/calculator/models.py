@@ -1,8 +1,13 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
-from decimal import Decimal
 from datetime import date, timedelta
-from dateutil.relativedelta import relativedelta
+
+from . import money
+from .periods import EarningsPeriod, HealthInsurancePeriod, age_at_date, iter_period_years
 
 
 class EconomicAnalysis(models.Model):
@@ -108,150 +113,99 @@ class EconomicAnalysis(models.Model):
         default=0.0,
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    FINGERPRINT_EXCLUDED_FIELDS = {"id", "created_at", "updated_at"}
+
+    def inputs_fingerprint(self):
+        """Stable SHA-256 of every input field, used to key cached exhibits"""
+        inputs = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname not in self.FINGERPRINT_EXCLUDED_FIELDS
+        }
+        payload = json.dumps(inputs, sort_keys=True, cls=DjangoJSONEncoder)
+        return hashlib.sha256(payload.encode()).hexdigest()
 
     def calculate_age_at_date(self, target_date):
         """Calculate age at a specific date"""
-        age = relativedelta(target_date, self.date_of_birth)
-        return age.years + (age.days / 365.25)
+        return age_at_date(self.date_of_birth, target_date)
 
     def get_pre_injury_periods(self):
-        """Generate pre-injury periods from injury date to report date"""
-        start_date = self.date_of_injury
-        end_date = self.date_of_report
-
-        periods = []
-        current_date = start_date
-        while current_date <= end_date:
-            year = current_date.year
-
-            # Calculate portion of year
-            year_start = date(year, 1, 1)
-            year_end = date(year, 12, 31)
-
-            if year == start_date.year:
-                days_in_period = (year_end - start_date).days + 1
-                portion = days_in_period / 365.25
-            elif year == end_date.year:
-                days_in_period = (end_date - year_start).days + 1
-                portion = days_in_period / 365.25
-            else:
-                portion = 1.0
-
-            age = self.calculate_age_at_date(current_date)
-            base_earnings = self.pre_base_earnings * (
-                1 + self.pre_growth_rate / 100
-            ) ** (year - start_date.year)
-
-            periods.append(
-                {
-                    "year": year,
-                    "portion_of_year": portion,
-                    "age": age,
-                    "wage_base_years": base_earnings,
-                }
+        """
+        Lazily yield an ``EarningsPeriod`` per year from injury date to report date.
+
+        Money values are integer ``money`` units.
+        """
+        years = max(self.date_of_report.year - self.date_of_injury.year + 1, 0)
+        growth = money.growth_factors(money.rate_from_percent(self.pre_growth_rate), years)
+        base_earnings = money.to_units(self.pre_base_earnings)
+        aif = money.rate_from_percent(self.pre_aif)
+
+        for period in iter_period_years(self.date_of_injury, self.date_of_report, self.date_of_birth):
+            wage_base = money.apply_factor(base_earnings, growth[period.index])
+            gross_earnings = money.apply_factor(wage_base, period.portion_factor)
+            yield EarningsPeriod(
+                period.year,
+                period.portion,
+                period.age,
+                wage_base,
+                gross_earnings,
+                money.apply_rate(gross_earnings, aif),
             )
 
-            current_date = date(year + 1, 1, 1)
-
-        return periods
-
     def get_post_injury_periods(self):
-        """Generate post-injury periods from report date to worklife end"""
-        start_date = self.date_of_report
-        end_date = self.worklife_end_date
-
-        periods = []
-        current_date = start_date
-        while current_date <= end_date:
-            year = current_date.year
-
-            # Calculate portion of year
-            year_start = date(year, 1, 1)
-            year_end = date(year, 12, 31)
-
-            if year == start_date.year:
-                days_in_period = (year_end - start_date).days + 1
-                portion = days_in_period / 365.25
-            elif year == end_date.year:
-                days_in_period = (end_date - year_start).days + 1
-                portion = days_in_period / 365.25
-            else:
-                portion = 1.0
-
-            age = self.calculate_age_at_date(current_date)
-            base_earnings = self.post_base_earnings * (
-                1 + self.post_growth_rate / 100
-            ) ** (year - start_date.year)
-
-            # Calculate present value
-            discount_factor = (1 + self.post_discount_rate / 100) ** -(
-                year - start_date.year
+        """
+        Lazily yield an ``EarningsPeriod`` per year from report date to worklife end.
+
+        Money values are integer ``money`` units.
+        """
+        years = max(self.worklife_end_date.year - self.date_of_report.year + 1, 0)
+        growth = money.growth_factors(money.rate_from_percent(self.post_growth_rate), years)
+        discount = money.discount_factors(money.rate_from_percent(self.post_discount_rate), years)
+        base_earnings = money.to_units(self.post_base_earnings)
+        aif = money.rate_from_percent(self.post_aif)
+
+        for period in iter_period_years(self.date_of_report, self.worklife_end_date, self.date_of_birth):
+            wage_base = money.apply_factor(base_earnings, growth[period.index])
+            gross_earnings = money.apply_factor(wage_base, period.portion_factor)
+            yield EarningsPeriod(
+                period.year,
+                period.portion,
+                period.age,
+                wage_base,
+                gross_earnings,
+                money.apply_rate(gross_earnings, aif),
+                money.apply_factor(gross_earnings, discount[period.index]),
             )
-            present_value = base_earnings * portion * discount_factor
-
-            periods.append(
-                {
-                    "year": year,
-                    "portion_of_year": portion,
-                    "age": age,
-                    "wage_base_years": base_earnings,
-                    "present_value": present_value,
-                }
-            )
-
-            current_date = date(year + 1, 1, 1)
-
-        return periods
 
     def get_health_insurance_periods(self):
-        """Generate health insurance periods if included"""
+        """
+        Lazily yield a ``HealthInsurancePeriod`` per post-injury year, or
+        return ``None`` if health insurance is not included.
+
+        Money values are integer ``money`` units.
+        """
         if not self.include_health_insurance:
             return None
-
-        start_date = self.date_of_report
-        end_date = self.worklife_end_date
-
-        periods = []
-        current_date = start_date
-        while current_date <= end_date:
-            year = current_date.year
-            year_index = year - start_date.year
-
-            # Calculate portion of year
-            year_start = date(year, 1, 1)
-            year_end = date(year, 12, 31)
-
-            if year == start_date.year:
-                days_in_period = (year_end - start_date).days + 1
-                portion = days_in_period / 365.25
-            elif year == end_date.year:
-                days_in_period = (end_date - year_start).days + 1
-                portion = days_in_period / 365.25
-            else:
-                portion = 1.0
-
-            premium = (
-                self.hi_base_premium * (1 + self.hi_growth_rate / 100) ** year_index
+        return self._iter_health_insurance_periods()
+
+    def _iter_health_insurance_periods(self):
+        years = max(self.worklife_end_date.year - self.date_of_report.year + 1, 0)
+        growth = money.growth_factors(money.rate_from_percent(self.hi_growth_rate), years)
+        discount = money.discount_factors(money.rate_from_percent(self.hi_discount_rate), years)
+        base_premium = money.to_units(self.hi_base_premium or 0)
+
+        for period in iter_period_years(self.date_of_report, self.worklife_end_date, self.date_of_birth):
+            premium = money.apply_factor(base_premium, growth[period.index])
+            yearly_value = money.apply_factor(premium, period.portion_factor)
+            yield HealthInsurancePeriod(
+                period.year,
+                period.portion,
+                premium,
+                yearly_value,
+                money.apply_factor(yearly_value, discount[period.index]),
             )
-            yearly_value = premium * Decimal(str(portion))
-            discount_factor = Decimal("1.0") / (
-                (1 + self.hi_discount_rate / 100) ** year_index
-            )
-            present_value = yearly_value * discount_factor
-
-            periods.append(
-                {
-                    "year": year,
-                    "portion": portion,
-                    "premium": premium,
-                    "yearly_value": yearly_value,
-                    "present_value": present_value,
-                }
-            )
-
-            current_date = date(year + 1, 1, 1)
-
-        return periods
 
     class Meta:
         verbose_name_plural = "Economic Analyses"
@@ -0,0 +1,85 @@
+"""
+Fixed-point money and rate arithmetic for the analysis periods.
+
+Amounts are integers in units of 1e-12 dollars and rates are integer parts
+per million, which holds the four decimal places of the percentage fields
+exactly. Growth and discount factors come from a cached per-rate table of
+powers of ``1 + rate``, so each period costs an integer multiply per value
+(``apply_factor``, ``apply_rate``) instead of a ``Decimal`` power. Callers
+convert back with ``to_decimal`` only for display.
+
+Amounts are never negative, so products are rounded half-up to whole units.
+Portions of a year are taken from the same ``repr`` of the float portion that
+``Decimal(str(portion))`` used, so at this resolution results round to the
+same cent as the ``Decimal`` formulas they replace.
+"""
+from decimal import Decimal, ROUND_HALF_EVEN
+from functools import lru_cache
+
+AMOUNT_EXPONENT = 12
+RATE_SCALE = 10 ** 6
+FACTOR_SCALE = 10 ** 18
+FULL_YEAR = FACTOR_SCALE
+
+_UNIT = Decimal(1).scaleb(-AMOUNT_EXPONENT)
+_HALF_FACTOR = FACTOR_SCALE // 2
+_HALF_RATE = RATE_SCALE // 2
+# Extra digits carried while building factor tables so repeated
+# multiplication does not drift at the published precision
+_GUARD_SCALE = 10 ** 18
+
+
+def to_units(amount):
+    """Convert a dollar amount (``Decimal``, int or str) into integer units"""
+    scaled = Decimal(amount).scaleb(AMOUNT_EXPONENT)
+    return int(scaled.to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def to_decimal(units):
+    """Convert integer units back into a dollar ``Decimal``"""
+    return Decimal(units) * _UNIT
+
+
+def rate_from_percent(percent):
+    """Parts per million of a percentage, e.g. ``Decimal('4.2')`` -> 42000"""
+    scaled = Decimal(percent or 0).scaleb(4)
+    return int(scaled.to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def apply_rate(units, rate):
+    """``units * rate`` for a rate in parts per million"""
+    return (units * rate + _HALF_RATE) // RATE_SCALE
+
+
+def apply_factor(units, factor):
+    """``units * factor`` for a factor scaled by ``FACTOR_SCALE``"""
+    return (units * factor + _HALF_FACTOR) // FACTOR_SCALE
+
+
+def portion_factor(portion):
+    """A float portion of a year as a scaled factor, read from its ``repr``"""
+    return int(Decimal(repr(portion)).scaleb(18))
+
+
+def _power_table(multiplier, divisor, years):
+    scale = FACTOR_SCALE * _GUARD_SCALE
+    half_divisor = divisor // 2
+    half_guard = _GUARD_SCALE // 2
+    factor = scale
+    factors = []
+    for _ in range(years):
+        factors.append((factor + half_guard) // _GUARD_SCALE)
+        factor = (factor * multiplier + half_divisor) // divisor
+    return tuple(factors)
+
+
+@lru_cache(maxsize=256)
+def growth_factors(rate, years):
+    """``(1 + rate) ** k`` for ``k`` in ``range(years)``, as scaled factors"""
+    return _power_table(RATE_SCALE + rate, RATE_SCALE, years)
+
+
+@lru_cache(maxsize=256)
+def discount_factors(rate, years):
+    """``(1 + rate) ** -k`` for ``k`` in ``range(years)``, as scaled factors"""
+    return _power_table(RATE_SCALE, RATE_SCALE + rate, years)
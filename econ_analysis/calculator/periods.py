@@ -0,0 +1,82 @@
+"""
+Lazy yearly periods for the analysis exhibits.
+
+``iter_period_years`` walks the calendar years of a period once. Only the
+first and last years can be partial, and every year after the first starts
+on 1 January, so the age at each later year is the age at the second year
+plus whole years. Ages come from a cached ``relativedelta``, so it runs at
+most twice per period. The post-injury and health insurance periods walk the
+same years and share those results. Money values in the records are integer
+``money`` units.
+"""
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+
+from dateutil.relativedelta import relativedelta
+
+from . import money
+
+
+@dataclass(slots=True)
+class PeriodYear:
+    """One calendar year of a period"""
+    index: int
+    year: int
+    portion: float
+    portion_factor: int
+    age: float
+
+
+@dataclass(slots=True)
+class EarningsPeriod:
+    year: int
+    portion: float
+    age: float
+    wage_base: int
+    gross_earnings: int
+    adjusted_earnings: int
+    present_value: int = None
+
+
+@dataclass(slots=True)
+class HealthInsurancePeriod:
+    year: int
+    portion: float
+    premium: int
+    yearly_value: int
+    present_value: int
+
+
+@lru_cache(maxsize=1024)
+def _age_parts(date_of_birth, target_date):
+    """``(whole years, remaining days / 365.25)`` from ``date_of_birth`` to ``target_date``"""
+    age = relativedelta(target_date, date_of_birth)
+    return age.years, age.days / 365.25
+
+
+def age_at_date(date_of_birth, target_date):
+    """Age in years; whole years plus remaining days over 365.25"""
+    years, days = _age_parts(date_of_birth, target_date)
+    return years + days
+
+
+def iter_period_years(start_date, end_date, date_of_birth):
+    """Yield a ``PeriodYear`` for each calendar year from start to end date"""
+    if start_date > end_date:
+        return
+    last_year = end_date.year
+
+    portion = ((date(start_date.year, 12, 31) - start_date).days + 1) / 365.25
+    yield PeriodYear(0, start_date.year, portion, money.portion_factor(portion), age_at_date(date_of_birth, start_date))
+    if last_year == start_date.year:
+        return
+
+    # Every later year starts on 1 January, a whole number of years apart
+    age_years, age_days = _age_parts(date_of_birth, date(start_date.year + 1, 1, 1))
+    for index, year in enumerate(range(start_date.year + 1, last_year), 1):
+        yield PeriodYear(index, year, 1.0, money.FULL_YEAR, (age_years + index - 1) + age_days)
+
+    portion = ((end_date - date(last_year, 1, 1)).days + 1) / 365.25
+    index = last_year - start_date.year
+    yield PeriodYear(index, last_year, portion, money.portion_factor(portion), (age_years + index - 1) + age_days)
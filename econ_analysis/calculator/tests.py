@@ -1,3 +1,240 @@
-from django.test import TestCase
+import random
+from datetime import date
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from dateutil.relativedelta import relativedelta
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from . import money
+from .models import EconomicAnalysis
+from .views import AnalysisDetailView
+
+CENT = Decimal("0.01")
+
+
+def legacy_periods(start_date, end_date):
+    """The period loop and portion logic of the Decimal methods"""
+    current_date = start_date
+    while current_date <= end_date:
+        year = current_date.year
+        if year == start_date.year:
+            portion = ((date(year, 12, 31) - start_date).days + 1) / 365.25
+        elif year == end_date.year:
+            portion = ((end_date - date(year, 1, 1)).days + 1) / 365.25
+        else:
+            portion = 1.0
+        yield year, current_date, portion
+        current_date = date(year + 1, 1, 1)
+
+
+def legacy_age(date_of_birth, target_date):
+    age = relativedelta(target_date, date_of_birth)
+    return age.years + (age.days / 365.25)
+
+
+def legacy_exhibits(analysis):
+    """Every period value of the three exhibits from the previous Decimal formulas"""
+    start = analysis.date_of_injury
+    pre = []
+    for year, current_date, portion in legacy_periods(start, analysis.date_of_report):
+        wage_base = analysis.pre_base_earnings * (1 + analysis.pre_growth_rate / 100) ** (year - start.year)
+        gross = Decimal(str(portion)) * wage_base
+        adjusted = gross * (analysis.pre_aif / Decimal("100.0"))
+        pre.append((year, legacy_age(analysis.date_of_birth, current_date), wage_base, gross, adjusted))
+
+    start = analysis.date_of_report
+    post = []
+    hi = []
+    for year, current_date, portion in legacy_periods(start, analysis.worklife_end_date):
+        index = year - start.year
+        portion = Decimal(str(portion))
+        wage_base = analysis.post_base_earnings * (1 + analysis.post_growth_rate / 100) ** index
+        gross = portion * wage_base
+        adjusted = gross * (analysis.post_aif / Decimal("100.0"))
+        present_value = wage_base * portion * (1 + analysis.post_discount_rate / 100) ** -index
+        post.append(
+            (year, legacy_age(analysis.date_of_birth, current_date), wage_base, gross, adjusted, present_value)
+        )
+
+        premium = analysis.hi_base_premium * (1 + analysis.hi_growth_rate / 100) ** index
+        yearly_value = premium * portion
+        hi_present = yearly_value * (Decimal("1.0") / ((1 + analysis.hi_discount_rate / 100) ** index))
+        hi.append((year, premium, yearly_value, hi_present))
+    return pre, post, hi
+
+
+def random_analysis(rng):
+    def percent():
+        return Decimal(rng.randint(0, 100000)).scaleb(-4)
+
+    def dollars(low, high):
+        return Decimal(rng.randint(low * 100, high * 100)).scaleb(-2)
+
+    injury = date(rng.randint(2015, 2022), rng.randint(1, 12), rng.randint(1, 28))
+    report = date(injury.year + rng.randint(0, 4), rng.randint(1, 12), rng.randint(1, 28))
+    return EconomicAnalysis(
+        date_of_birth=date.fromordinal(rng.randint(date(1950, 1, 1).toordinal(), date(1995, 12, 31).toordinal())),
+        date_of_injury=injury,
+        date_of_report=max(report, injury),
+        worklife_end_date=date(report.year + rng.randint(0, 45), rng.randint(1, 12), rng.randint(1, 28)),
+        pre_growth_rate=percent(),
+        pre_aif=percent(),
+        pre_base_earnings=dollars(20000, 200000),
+        post_growth_rate=percent(),
+        post_aif=percent(),
+        post_base_earnings=dollars(0, 100000),
+        post_discount_rate=percent(),
+        include_health_insurance=True,
+        hi_base_premium=dollars(2000, 20000),
+        hi_growth_rate=percent(),
+        hi_discount_rate=percent(),
+    )
+
+
+class FixedPointPeriodsTest(SimpleTestCase):
+    """The fixed-point periods round to the same cent as the Decimal formulas"""
+
+    def assertSameCents(self, expected, actual_units):
+        self.assertEqual(
+            [value.quantize(CENT) for value in expected],
+            [money.to_decimal(units).quantize(CENT) for units in actual_units],
+        )
+
+    def check_analysis(self, analysis):
+        pre, post, hi = legacy_exhibits(analysis)
+
+        periods = list(analysis.get_pre_injury_periods())
+        self.assertEqual([p.year for p in periods], [row[0] for row in pre])
+        for row, period in zip(pre, periods):
+            self.assertAlmostEqual(period.age, row[1], places=9)
+            self.assertSameCents(row[2:], (period.wage_base, period.gross_earnings, period.adjusted_earnings))
+
+        periods = list(analysis.get_post_injury_periods())
+        self.assertEqual([p.year for p in periods], [row[0] for row in post])
+        for row, period in zip(post, periods):
+            self.assertAlmostEqual(period.age, row[1], places=9)
+            self.assertSameCents(
+                row[2:],
+                (period.wage_base, period.gross_earnings, period.adjusted_earnings, period.present_value),
+            )
+
+        periods = list(analysis.get_health_insurance_periods())
+        self.assertEqual([p.year for p in periods], [row[0] for row in hi])
+        for row, period in zip(hi, periods):
+            self.assertSameCents(row[1:], (period.premium, period.yearly_value, period.present_value))
+
+    def test_random_analyses_match_decimal_formulas(self):
+        rng = random.Random(0)
+        for case in range(200):
+            analysis = random_analysis(rng)
+            with self.subTest(case=case):
+                self.check_analysis(analysis)
+
+    def test_edge_rates_and_portions(self):
+        rng = random.Random(1)
+        edge_rates = (
+            (Decimal("0"), Decimal("0")),
+            (Decimal("10.0000"), Decimal("9.9999")),
+            (Decimal("0.0001"), Decimal("0.0001")),
+        )
+        for rates in edge_rates:
+            analysis = random_analysis(rng)
+            analysis.pre_growth_rate = analysis.post_growth_rate = analysis.hi_growth_rate = rates[0]
+            analysis.post_discount_rate = analysis.hi_discount_rate = rates[1]
+            # Leap-year boundaries and single-day first and last years
+            analysis.date_of_injury = date(2019, 12, 31)
+            analysis.date_of_report = date(2020, 2, 29)
+            analysis.worklife_end_date = date(2060, 1, 1)
+            with self.subTest(rates=rates):
+                self.check_analysis(analysis)
+
+    def test_single_year_period(self):
+        analysis = random_analysis(random.Random(2))
+        analysis.date_of_report = analysis.date_of_injury
+        analysis.worklife_end_date = date(analysis.date_of_report.year, 12, 31)
+        self.check_analysis(analysis)
+
+    def test_health_insurance_excluded(self):
+        analysis = random_analysis(random.Random(3))
+        analysis.include_health_insurance = False
+        self.assertIsNone(analysis.get_health_insurance_periods())
+
+
+class MoneyTest(SimpleTestCase):
+    def test_round_trip(self):
+        self.assertEqual(money.to_decimal(money.to_units(Decimal("7001.05"))), Decimal("7001.05"))
+        self.assertEqual(money.rate_from_percent(Decimal("4.2")), 42000)
+
+    def test_factor_tables(self):
+        growth = money.growth_factors(money.rate_from_percent(Decimal("3")), 3)
+        self.assertEqual(growth, (money.FACTOR_SCALE, 103 * 10 ** 16, 10609 * 10 ** 14))
+        discount = money.discount_factors(money.rate_from_percent(Decimal("25")), 2)
+        self.assertEqual(discount, (money.FACTOR_SCALE, 8 * 10 ** 17))
+
+
+class AnalysisDetailViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.analysis = EconomicAnalysis.objects.create(
+            date_of_injury=date(2021, 7, 1),
+            date_of_report=date(2023, 12, 1),
+            worklife_end_date=date(2040, 6, 30),
+            include_health_insurance=True,
+            hi_base_premium=Decimal("7001.05"),
+            hi_growth_rate=Decimal("7"),
+            hi_discount_rate=Decimal("3"),
+        )
+        # Read back so the fingerprint sees the stored Decimal values
+        self.analysis.refresh_from_db()
+        self.url = reverse("analysis-detail", kwargs={"pk": self.analysis.pk})
+
+    def test_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(self.analysis.inputs_fingerprint(), response["ETag"])
+        self.assertEqual(response["Last-Modified"], http_date(int(self.analysis.updated_at.timestamp())))
+
+    def test_if_none_match(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_exhibits_are_cached(self):
+        self.client.get(self.url)
+        with mock.patch.object(AnalysisDetailView, "get_exhibits_context") as get_exhibits_context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        get_exhibits_context.assert_not_called()
+
+    def test_edit_invalidates_etag_and_cache(self):
+        first = self.client.get(self.url)
+        self.analysis.post_base_earnings = Decimal("12345.67")
+        self.analysis.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertContains(response, "$12345.67")
+        self.assertNotContains(first, "$12345.67")
+
+    def test_version_invalidates_etag_and_cache(self):
+        etag = self.client.get(self.url)["ETag"]
+        with mock.patch.object(AnalysisDetailView, "exhibits_version", AnalysisDetailView.exhibits_version + 1):
+            with mock.patch.object(
+                AnalysisDetailView, "get_exhibits_context", wraps=AnalysisDetailView().get_exhibits_context
+            ) as get_exhibits_context:
+                response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        get_exhibits_context.assert_called_once()
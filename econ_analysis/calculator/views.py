@@ -1,7 +1,13 @@
+from itertools import zip_longest
+
+from django.core.cache import cache
 from django.shortcuts import render, redirect
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from django.views.generic import CreateView, DetailView
 from django.urls import reverse_lazy, reverse
-from decimal import Decimal
+from . import money
 from .models import EconomicAnalysis
 from .forms import EconomicAnalysisForm, HealthInsuranceForm
 
@@ -42,92 +48,110 @@ class AnalysisCreateView(CreateView):
 
 
 class AnalysisDetailView(DetailView):
+    """
+    Analysis results, served conditionally and from a fragment cache.
+
+    The ETag is the fingerprint of the analysis inputs and Last-Modified its
+    ``updated_at``, so unchanged analyses get a 304. Otherwise the exhibit
+    tables are rendered once per fingerprint and cached; a repeat view of
+    an unchanged analysis skips both the calculation and the table markup.
+
+    Bump ``exhibits_version`` whenever ``analysis_exhibits.html`` or the
+    exhibit calculations change. It is part of both the ETag and the cache
+    key, so a deploy never serves exhibits rendered by the old code.
+    """
+
     model = EconomicAnalysis
     template_name = "calculator/analysis_detail.html"
+    exhibits_template_name = "calculator/analysis_exhibits.html"
+    exhibits_cache_timeout = 60 * 60 * 24
+    exhibits_version = 1
     context_object_name = "analysis"
 
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        self.fingerprint = self.object.inputs_fingerprint()
+        etag = quote_etag(f"{self.exhibits_version}-{self.fingerprint}")
+        last_modified = int(self.object.updated_at.timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.render_to_response(self.get_context_data(object=self.object))
+        response.headers.setdefault("ETag", etag)
+        response.headers.setdefault("Last-Modified", http_date(last_modified))
+        return response
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        analysis = self.get_object()
+        cache_key = f"analysis-exhibits:v{self.exhibits_version}:{self.object.pk}:{self.fingerprint}"
+        exhibits = cache.get(cache_key)
+        if exhibits is None:
+            exhibits = render_to_string(self.exhibits_template_name, self.get_exhibits_context(self.object))
+            cache.set(cache_key, exhibits, self.exhibits_cache_timeout)
+        context["exhibits"] = exhibits
+        return context
 
-        # Calculate Pre-Injury Results
-        pre_injury_results = []
-        pre_total = Decimal("0.0")
+    def get_exhibits_context(self, analysis):
+        # Periods are computed lazily in fixed-point money units; every exhibit
+        # and total is accumulated in a single pass and converted for display
+        to_decimal = money.to_decimal
+        pre_total = post_total = post_injury_present_total = 0
+        hi_future_total = hi_present_total = 0
 
+        pre_injury_results = []
         for period in analysis.get_pre_injury_periods():
-            gross_earnings = period["portion_of_year"] * period["wage_base_years"]
-            adjusted_earnings = gross_earnings * (analysis.pre_aif / Decimal("100.0"))
-            pre_total += adjusted_earnings
-
+            pre_total += period.adjusted_earnings
             pre_injury_results.append(
                 {
-                    "year": period["year"],
-                    "portion": period["portion_of_year"] * 100,  # Convert to percentage
-                    "age": period["age"],
-                    "wage_base": period["wage_base_years"],
-                    "gross_earnings": gross_earnings,
-                    "adjusted_earnings": adjusted_earnings,
+                    "year": period.year,
+                    "portion": period.portion * 100,  # Convert to percentage
+                    "age": period.age,
+                    "wage_base": to_decimal(period.wage_base),
+                    "gross_earnings": to_decimal(period.gross_earnings),
+                    "adjusted_earnings": to_decimal(period.adjusted_earnings),
                 }
             )
 
-        # Calculate Post-Injury Results
+        # Post-injury and health insurance periods cover the same years
         post_injury_results = []
-        post_total = Decimal("0.0")
-        post_injury_present_total = Decimal("0.0")
-
-        for period in analysis.get_post_injury_periods():
-            gross_earnings = period["portion_of_year"] * period["wage_base_years"]
-            adjusted_earnings = gross_earnings * (analysis.post_aif / Decimal("100.0"))
-            post_total += adjusted_earnings
-            post_injury_present_total += period["present_value"]
-
+        hi_periods = analysis.get_health_insurance_periods()
+        hi_results = [] if hi_periods is not None else None
+        for period, hi_period in zip_longest(analysis.get_post_injury_periods(), hi_periods or ()):
+            post_total += period.adjusted_earnings
+            post_injury_present_total += period.present_value
             post_injury_results.append(
                 {
-                    "year": period["year"],
-                    "portion": period["portion_of_year"] * 100,  # Convert to percentage
-                    "age": period["age"],
-                    "wage_base": period["wage_base_years"],
-                    "gross_earnings": gross_earnings,
-                    "adjusted_earnings": adjusted_earnings,
-                    "present_value": period["present_value"],
+                    "year": period.year,
+                    "portion": period.portion * 100,  # Convert to percentage
+                    "age": period.age,
+                    "wage_base": to_decimal(period.wage_base),
+                    "gross_earnings": to_decimal(period.gross_earnings),
+                    "adjusted_earnings": to_decimal(period.adjusted_earnings),
+                    "present_value": to_decimal(period.present_value),
                 }
             )
 
-        # Calculate Health Insurance Results if included
-        hi_results = None
-        hi_future_total = None
-        hi_present_total = None
-
-        if analysis.include_health_insurance:
-            hi_results = []
-            hi_future_total = Decimal("0.0")
-            hi_present_total = Decimal("0.0")
-
-            for period in analysis.get_health_insurance_periods():
-                hi_future_total += period["yearly_value"]
-                hi_present_total += period["present_value"]
-
+            if hi_period is not None:
+                hi_future_total += hi_period.yearly_value
+                hi_present_total += hi_period.present_value
                 hi_results.append(
                     {
-                        "year": period["year"],
-                        "portion": period["portion"] * 100,  # Convert to percentage
-                        "premium": period["premium"],
-                        "yearly_value": period["yearly_value"],
-                        "present_value": period["present_value"],
+                        "year": hi_period.year,
+                        "portion": hi_period.portion * 100,  # Convert to percentage
+                        "premium": to_decimal(hi_period.premium),
+                        "yearly_value": to_decimal(hi_period.yearly_value),
+                        "present_value": to_decimal(hi_period.present_value),
                     }
                 )
 
-        context.update(
-            {
-                "pre_injury_results": pre_injury_results,
-                "pre_injury_total": pre_total,
-                "post_injury_results": post_injury_results,
-                "post_injury_total": post_total,
-                "post_injury_present_total": post_injury_present_total,
-                "health_insurance_results": hi_results,
-                "hi_future_total": hi_future_total,
-                "hi_present_total": hi_present_total,
-            }
-        )
-
-        return context
+        return {
+            "analysis": analysis,
+            "pre_injury_results": pre_injury_results,
+            "pre_injury_total": to_decimal(pre_total),
+            "post_injury_results": post_injury_results,
+            "post_injury_total": to_decimal(post_total),
+            "post_injury_present_total": to_decimal(post_injury_present_total),
+            "health_insurance_results": hi_results,
+            "hi_future_total": to_decimal(hi_future_total) if hi_results is not None else None,
+            "hi_present_total": to_decimal(hi_present_total) if hi_results is not None else None,
+        }
@@ -0,0 +1,23 @@
+"""
+Memoized growth and discount factors for healthcare plans.
+
+Plans share a handful of rates and year ranges, so the ``Decimal`` factor
+for each year offset is computed once per ``(rate, years)`` and kept in a
+bounded LRU; ``cache_info()`` on either function reports its hit rate.
+"""
+from decimal import Decimal
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def growth_factors(rate, years):
+    """``(1 + rate) ** k`` for ``k`` in ``range(years)``"""
+    return tuple((1 + rate) ** offset for offset in range(years))
+
+
+@lru_cache(maxsize=256)
+def discount_factors(rate, years):
+    """``1 / (1 + rate) ** k`` for ``k`` in ``range(years)``; all ones at a zero rate"""
+    if rate == 0:
+        return (Decimal('1.0'),) * years
+    return tuple(Decimal('1.0') / growth for growth in growth_factors(rate, years))
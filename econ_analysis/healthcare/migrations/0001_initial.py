@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:11
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HealthcarePlan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('start_year', models.IntegerField()),
+                ('end_year', models.IntegerField()),
+                ('growth_rate', models.DecimalField(decimal_places=3, max_digits=5, validators=[django.core.validators.MinValueValidator(-1), django.core.validators.MaxValueValidator(1)])),
+                ('discount_rate', models.DecimalField(decimal_places=3, max_digits=5, validators=[django.core.validators.MinValueValidator(-1), django.core.validators.MaxValueValidator(1)])),
+                ('start_age', models.DecimalField(decimal_places=2, max_digits=5, validators=[django.core.validators.MinValueValidator(0)])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='HealthcareCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('base_cost', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('plan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='categories', to='healthcare.healthcareplan')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='YearlyPortion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('portion', models.DecimalField(decimal_places=3, max_digits=5, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(1)])),
+                ('plan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='yearly_portions', to='healthcare.healthcareplan')),
+            ],
+            options={
+                'unique_together': {('plan', 'year')},
+            },
+        ),
+    ]
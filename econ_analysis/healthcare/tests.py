@@ -1,3 +1,89 @@
+from decimal import Decimal
+
 from django.test import TestCase
+from django.urls import reverse
+
+from .models import HealthcarePlan, YearlyPortion
+
+
+def legacy_yearly_results(plan):
+    """Per-year costs from the previous one-query-per-lookup loop"""
+    results = []
+    for year in range(plan.start_year, plan.end_year + 1):
+        year_offset = year - plan.start_year
+        try:
+            portion = plan.yearly_portions.get(year=year).portion
+        except YearlyPortion.DoesNotExist:
+            portion = Decimal('1.0')
+
+        year_categories = {}
+        total_cost = Decimal('0.0')
+        for category in plan.categories.all():
+            yearly_cost = category.base_cost * (1 + plan.growth_rate) ** year_offset * portion
+            year_categories[category.name] = float(yearly_cost)
+            total_cost += yearly_cost
+
+        if plan.discount_rate != 0:
+            discount_factor = Decimal('1.0') / ((1 + plan.discount_rate) ** year_offset)
+        else:
+            discount_factor = Decimal('1.0')
+        results.append({
+            'year': year,
+            'age': float(plan.start_age + year_offset),
+            'portion_of_year': float(portion),
+            'categories': year_categories,
+            'total_cost': float(total_cost),
+            'present_value': float(total_cost * discount_factor),
+        })
+    return results
+
+
+class HealthcarePlanCalculateTest(TestCase):
+    def setUp(self):
+        self.plan = HealthcarePlan.objects.create(
+            name='Life care plan',
+            start_year=2024,
+            end_year=2063,
+            growth_rate=Decimal('0.035'),
+            discount_rate=Decimal('0.042'),
+            start_age=Decimal('41.50'),
+        )
+        for name, base_cost in (('Therapy', '4800.00'), ('Medication', '1250.75'), ('Equipment', '310.10')):
+            self.plan.categories.create(name=name, base_cost=Decimal(base_cost))
+        self.plan.yearly_portions.create(year=2024, portion=Decimal('0.375'))
+        self.plan.yearly_portions.create(year=2063, portion=Decimal('0.5'))
+        self.url = reverse('healthcareplan-calculate', kwargs={'pk': self.plan.pk})
+
+    def test_results_match_previous_loop(self):
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        expected = legacy_yearly_results(self.plan)
+        self.assertEqual(response.data['yearly_results'], expected)
+        self.assertEqual(
+            response.data['summary'],
+            {
+                'total_future_value': sum(row['total_cost'] for row in expected),
+                'total_present_value': sum(row['present_value'] for row in expected),
+            },
+        )
+
+    def test_zero_discount_rate(self):
+        self.plan.discount_rate = Decimal('0')
+        self.plan.save()
+        results = self.client.post(self.url).data['yearly_results']
+        self.assertEqual([row['present_value'] for row in results], [row['total_cost'] for row in results])
+
+    def test_query_count_is_independent_of_plan_size(self):
+        # Plan, portions and categories
+        with self.assertNumQueries(3):
+            self.client.post(self.url)
 
-# Create your tests here.
+        self.plan.end_year = 2123
+        self.plan.save()
+        for index in range(20):
+            self.plan.categories.create(name=f'Item {index}', base_cost=Decimal('100.00'))
+        with self.assertNumQueries(3):
+            response = self.client.post(self.url)
+        self.assertEqual(len(response.data['yearly_results']), 100)
+        self.assertEqual(len(response.data['yearly_results'][0]['categories']), 23)
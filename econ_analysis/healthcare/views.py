@@ -3,6 +3,7 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from decimal import Decimal
+from .factors import discount_factors, growth_factors
 from .models import HealthcarePlan, HealthcareCategory, YearlyPortion
 from .serializers import HealthcarePlanSerializer, HealthcareCategorySerializer, YearlyPortionSerializer
 
@@ -15,48 +16,32 @@ class HealthcarePlanViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def calculate(self, request, pk=None):
         plan = self.get_object()
+        years = range(plan.start_year, plan.end_year + 1)
+
+        # Load portions and categories once; years without a portion count in full
+        portions = dict(plan.yearly_portions.filter(year__in=years).values_list('year', 'portion'))
+        categories = list(plan.categories.values_list('name', 'base_cost'))
+
+        # Growth and discount factors depend only on the rate and year offset
+        growth = growth_factors(plan.growth_rate, len(years))
+        discount = discount_factors(plan.discount_rate, len(years))
+
+        # The queries above are the only database work; each year is one pass
+        # over the loaded categories in Decimal
         results = []
-        
-        for year in range(plan.start_year, plan.end_year + 1):
-            year_offset = year - plan.start_year
-            age = Decimal(str(plan.start_age)) + year_offset
-            
-            # Get portion for this year, default to 1.0 if not specified
-            try:
-                portion = plan.yearly_portions.get(year=year).portion
-            except YearlyPortion.DoesNotExist:
-                portion = Decimal('1.0')
-            
-            # Calculate costs for each category
-            year_categories = {}
-            total_cost = Decimal('0.0')
-            
-            for category in plan.categories.all():
-                # Calculate grown cost: base_cost * (1 + growth_rate)^year_offset
-                growth_factor = (1 + plan.growth_rate) ** year_offset
-                grown_cost = category.base_cost * growth_factor
-                yearly_cost = grown_cost * portion
-                
-                year_categories[category.name] = float(yearly_cost)
-                total_cost += yearly_cost
-            
-            # Calculate present value using discount rate
-            if plan.discount_rate != 0:
-                discount_factor = Decimal('1.0') / ((1 + plan.discount_rate) ** year_offset)
-            else:
-                discount_factor = Decimal('1.0')
-                
-            present_value = total_cost * discount_factor
-            
+        for offset, year in enumerate(years):
+            portion = portions.get(year, Decimal('1.0'))
+            year_costs = [base_cost * growth[offset] * portion for _, base_cost in categories]
+            total_cost = sum(year_costs, Decimal('0.0'))
             results.append({
                 'year': year,
-                'age': float(age),
+                'age': float(Decimal(str(plan.start_age)) + offset),
                 'portion_of_year': float(portion),
-                'categories': year_categories,
+                'categories': {name: float(cost) for (name, _), cost in zip(categories, year_costs)},
                 'total_cost': float(total_cost),
-                'present_value': float(present_value)
+                'present_value': float(total_cost * discount[offset])
             })
-        
+
         # Calculate summary values
         total_future_value = sum(row['total_cost'] for row in results)
         total_present_value = sum(row['present_value'] for row in results)
@@ -29,6 +29,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'calculator.profiling.RequestProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -75,3 +76,21 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
+
+# Rendered reports from the run_report_worker command
+REPORT_JOB_ROOT = BASE_DIR / 'report_jobs'
+
+# Worker processes rendering bulk-export documents; 0 renders in the web process
+BULK_EXPORT_PROCESSES = 4
+
+# Growth/discount factor tables kept in each process' LRU (calculator.factor_tables)
+FACTOR_TABLE_MAXSIZE = 256
+
+# Per-request profiling (calculator.profiling). Off by default; staff users can
+# still profile a single request by sending the X-Profile header
+REQUEST_PROFILING = False
+REQUEST_PROFILING_HEADER = 'X-Profile'
+REQUEST_PROFILING_WINDOW = 1000
+# cProfile dumps of the slowest profiled requests; 0 disables cProfile
+REQUEST_PROFILE_KEEP = 0
+REQUEST_PROFILE_ROOT = BASE_DIR / 'request_profiles'
@@ -1,18 +1,30 @@
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import DefaultRouter, SimpleRouter
 from calculator.views import (
+    AEFViewSet,
     EconomicAnalysisViewSet, 
+    FactorTableViewSet,
     HealthcareCategoryViewSet, 
-    HealthcarePlanViewSet
+    HealthcarePlanViewSet,
+    ProfilingViewSet,
+    ReportJobViewSet
 )
 
 router = DefaultRouter()
 router.register(r'analyses', EconomicAnalysisViewSet, basename='analysis')
 router.register(r'healthcare-categories', HealthcareCategoryViewSet, basename='healthcarecategory')
-router.register(r'healthcare-plans', HealthcarePlanViewSet, basename='healthcareplan')
+router.register(r'report-jobs', ReportJobViewSet, basename='reportjob')
+router.register(r'aef', AEFViewSet, basename='aef')
+router.register(r'factor-tables', FactorTableViewSet, basename='factortable')
+router.register(r'profiling', ProfilingViewSet, basename='profiling')
+
+# Healthcare plans are scoped to an analysis: /api/analyses/<analysis_pk>/healthcare-plans/
+analysis_router = SimpleRouter()
+analysis_router.register(r'healthcare-plans', HealthcarePlanViewSet, basename='analysis-healthcare-plans')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include(router.urls)),
+    path('api/analyses/<int:analysis_pk>/', include(analysis_router.urls)),
 ]
@@ -1,4 +1,11 @@
+import argparse
+import csv
+import json
+import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from typing import Dict, List, Any
 from dataclasses import dataclass
 from decimal import Decimal, ROUND_HALF_UP
@@ -28,16 +35,273 @@ class HealthInsuranceRow:
     # Column (5) = Column (4) / (1 + discount_rate)^year_index
 
 
+@dataclass
+class PrePostExhibit:
+    """Computed Pre-Injury or Post-Injury exhibit"""
+
+    rows: List[PrePostRow]
+    aif: float
+    gross_earnings: List[float]  # Column (5)
+    adjusted_earnings: List[float]  # Column (6)
+    total_future_value: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": [
+                {
+                    "year": row.year,
+                    "portion_of_year": row.portion_of_year,
+                    "age": row.age,
+                    "wage_base_years": row.wage_base_years,
+                    "gross_earnings": gross,
+                    "adjusted_earnings": adjusted,
+                }
+                for row, gross, adjusted in zip(
+                    self.rows, self.gross_earnings, self.adjusted_earnings
+                )
+            ],
+            "total_future_value": self.total_future_value,
+        }
+
+
+@dataclass
+class HealthInsuranceExhibit:
+    """Computed Health Insurance exhibit"""
+
+    rows: List[HealthInsuranceRow]
+    discount_rate: float
+    yearly_values: List[float]  # Column (4)
+    present_values: List[float]  # Column (5)
+    total_future_value: float
+    total_present_value: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": [
+                {
+                    "year": row.year,
+                    "portion_of_year": row.portion_of_year,
+                    "premium": row.premium,
+                    "yearly_value": yearly_value,
+                    "present_value": present_value,
+                }
+                for row, yearly_value, present_value in zip(
+                    self.rows, self.yearly_values, self.present_values
+                )
+            ],
+            "total_future_value": self.total_future_value,
+            "total_present_value": self.total_present_value,
+        }
+
+
+@dataclass
+class Exhibits:
+    """All three exhibits of one analysis"""
+
+    pre_injury: PrePostExhibit
+    post_injury: PrePostExhibit
+    health_insurance: HealthInsuranceExhibit
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "pre_injury": self.pre_injury.as_dict(),
+            "post_injury": self.post_injury.as_dict(),
+            "health_insurance": self.health_insurance.as_dict(),
+        }
+
+
+# Computation: no I/O and no formatting
+
+
+def _running_total(values: List[float]) -> float:
+    """Sum in row order, as the printed totals always have been"""
+    total = 0.0
+    for value in values:
+        total += value
+    return total
+
+
+def build_health_insurance_rows(user_data: Dict[str, Any]) -> List[HealthInsuranceRow]:
+    """
+    Generate the Health Insurance rows from the start year to the earliest
+    of the end year, worklife expectancy and years to final separation.
+    The last year is prorated by the fractional worklife or separation.
+    """
+    start_year = user_data["hi_start_year"]
+    # Use statistical parameters to adjust end dates if needed
+    adjusted_end_year = min(
+        user_data["hi_end_year"],
+        start_year + int(user_data["worklife_expectancy"]),
+        start_year + int(user_data["years_to_final_separation"]),
+    )
+    # Use the fractional part of the final year if it exists
+    final_year_fraction = (
+        user_data["worklife_expectancy"] % 1
+        or user_data["years_to_final_separation"] % 1
+        or 0.47  # default if no fractional part exists
+    )
+    base_premium = user_data["hi_base_premium"]
+    growth = 1 + user_data["hi_growth_rate"]
+
+    return [
+        HealthInsuranceRow(
+            y,
+            final_year_fraction if y == adjusted_end_year else 1.0,
+            base_premium * (growth ** (y - start_year)),
+            y - start_year,
+        )
+        for y in range(start_year, adjusted_end_year + 1)
+    ]
+
+
+def compute_pre_post_exhibit(rows: List[PrePostRow], aif: float) -> PrePostExhibit:
+    """Columns (5) Gross Earnings and (6) Adjusted Earnings, and their total"""
+    gross_earnings = [row.portion_of_year * row.wage_base_years for row in rows]
+    adjusted_earnings = [gross * aif for gross in gross_earnings]
+    return PrePostExhibit(
+        rows, aif, gross_earnings, adjusted_earnings, _running_total(adjusted_earnings)
+    )
+
+
+def compute_health_insurance_exhibit(
+    rows: List[HealthInsuranceRow], discount_rate: float
+) -> HealthInsuranceExhibit:
+    """Columns (4) Yearly Value and (5) Present Value, and their totals"""
+    yearly_values = [row.portion_of_year * row.premium for row in rows]
+    present_values = [
+        yearly_value * (1.0 / ((1 + discount_rate) ** row.year_index))
+        for row, yearly_value in zip(rows, yearly_values)
+    ]
+    return HealthInsuranceExhibit(
+        rows,
+        discount_rate,
+        yearly_values,
+        present_values,
+        _running_total(yearly_values),
+        _running_total(present_values),
+    )
+
+
+def compute_exhibits(user_data: Dict[str, Any]) -> Exhibits:
+    """All three exhibits for one set of inputs"""
+    return Exhibits(
+        compute_pre_post_exhibit(user_data["pre_table_rows"], user_data["pre_aif"]),
+        compute_pre_post_exhibit(user_data["post_table_rows"], user_data["post_aif"]),
+        compute_health_insurance_exhibit(
+            build_health_insurance_rows(user_data), user_data["hi_discount_rate"]
+        ),
+    )
+
+
+# Rendering
+
+
+CENT = Decimal("0.01")
+
+
+def format_currency(amount: float) -> str:
+    """Format a number as currency with 2 decimal places, rounding half up"""
+    return f"${Decimal(str(amount)).quantize(CENT, ROUND_HALF_UP):,.2f}"
+
+
+def render_pre_post_table(
+    exhibit_num: int, exhibit: PrePostExhibit, growth_rate: float, table_type: str
+) -> str:
+    """
+    Render a Pre-Injury or Post-Injury exhibit with columns:
+    (1) Year
+    (2) Portion of Year (as percentage)
+    (3) Age
+    (4) Wage Base Years
+    (5) Gross Earnings = (2) × (4)
+    (6) Adjusted Earnings = (5) × AIF
+    """
+    growth_rate_pct = growth_rate * 100
+    aif_pct = exhibit.aif * 100
+
+    lines = [
+        f"\nExhibit {exhibit_num}",
+        f"Future Growth Rate: {growth_rate_pct:.2f}%",
+        f"{table_type} Earnings\n",
+        (
+            "   (1) Year   (2) Portion of Year   (3) Age   "
+            "(4) Wage Base Years   (5) Gross Earnings   "
+            f"(6) Adjusted Earnings [(5) x {aif_pct:.2f}%]"
+        ),
+        "-" * 120,
+    ]
+    for row, gross, adjusted in zip(
+        exhibit.rows, exhibit.gross_earnings, exhibit.adjusted_earnings
+    ):
+        lines.append(
+            f"{row.year:>10} "
+            f" {row.portion_of_year * 100:6.2f}% "
+            f"    {row.age:>5.2f} "
+            f"        {format_currency(row.wage_base_years):>12} "
+            f"       {format_currency(gross):>12} "
+            f"               {format_currency(adjusted):>12}"
+        )
+    lines.append(
+        f"\n                           Total Future Value        {format_currency(exhibit.total_future_value)}\n"
+    )
+    return "\n".join(lines)
+
+
+def render_health_insurance_table(
+    exhibit: HealthInsuranceExhibit, growth_rate: float
+) -> str:
+    """
+    Render the Health Insurance exhibit with columns:
+    (1) Year
+    (2) Portion of Year (as percentage)
+    (3) Health Insurance @ X% (premium grown by growth_rate)
+    (4) Yearly Value = (2) × (3)
+    (5) Present Value = (4) / (1 + discount_rate)^year_index
+
+    followed by Total Future Value (sum of Column 4) and Total Present
+    Value (sum of Column 5).
+    """
+    growth_rate_pct = growth_rate * 100
+    discount_rate_pct = exhibit.discount_rate * 100
+
+    lines = [
+        "\nExhibit 3",
+        f"Health Insurance @ {growth_rate_pct:.2f}% Growth",
+        f"Discount Rate: {discount_rate_pct:.2f}%\n",
+        (
+            "   (1) Year   (2) Portion of Year   "
+            f"(3) Health Ins @ {growth_rate_pct:.2f}%   "
+            "(4) Yearly Value [(2) x (3)]   "
+            f"(5) Present Value [@ {discount_rate_pct:.2f}%]"
+        ),
+        "-" * 120,
+    ]
+    for row, yearly_value, present_value in zip(
+        exhibit.rows, exhibit.yearly_values, exhibit.present_values
+    ):
+        lines.append(
+            f"{row.year:>10} "
+            f" {row.portion_of_year * 100:6.2f}% "
+            f"      {format_currency(row.premium):>12} "
+            f"             {format_currency(yearly_value):>12} "
+            f"                     {format_currency(present_value):>12}"
+        )
+    lines.append(
+        f"\n                          Total Future Value       {format_currency(exhibit.total_future_value)}"
+    )
+    lines.append(
+        f"                          Total Present Value      {format_currency(exhibit.total_present_value)}\n"
+    )
+    return "\n".join(lines)
+
+
 class EconomicAnalysis:
     def __init__(self):
         self.user_data = {}
 
     def format_currency(self, amount: float) -> str:
         """Format a number as currency with 2 decimal places"""
-        decimal_amount = Decimal(str(amount)).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        )
-        return f"${decimal_amount:,.2f}"
+        return format_currency(amount)
 
     def get_user_inputs(self) -> Dict[str, Any]:
         """
@@ -326,13 +590,7 @@ class EconomicAnalysis:
         table_type: str,
     ):
         """
-        Print either Pre-Injury or Post-Injury table with columns:
-        (1) Year
-        (2) Portion of Year (as percentage)
-        (3) Age
-        (4) Wage Base Years
-        (5) Gross Earnings = (2) × (4)
-        (6) Adjusted Earnings = (5) × AIF
+        Print either Pre-Injury or Post-Injury table; see ``render_pre_post_table``.
 
         Args:
             exhibit_num: The exhibit number (1 or 2)
@@ -341,39 +599,8 @@ class EconomicAnalysis:
             aif: Adjustment Impact Factor (e.g., 0.754 for 75.4%)
             table_type: "Pre-Injury" or "Post-Injury"
         """
-        growth_rate_pct = growth_rate * 100
-        aif_pct = aif * 100
-
-        print(f"\nExhibit {exhibit_num}")
-        print(f"Future Growth Rate: {growth_rate_pct:.2f}%")
-        print(f"{table_type} Earnings\n")
-
-        header = (
-            "   (1) Year   (2) Portion of Year   (3) Age   "
-            "(4) Wage Base Years   (5) Gross Earnings   "
-            f"(6) Adjusted Earnings [(5) x {aif_pct:.2f}%]"
-        )
-        print(header)
-        print("-" * 120)
-
-        total_future_value = 0.0
-        for row in rows:
-            gross = row.portion_of_year * row.wage_base_years
-            adjusted = gross * aif
-            total_future_value += adjusted
-
-            print(
-                f"{row.year:>10} "
-                f" {row.portion_of_year * 100:6.2f}% "
-                f"    {row.age:>5.2f} "
-                f"        {self.format_currency(row.wage_base_years):>12} "
-                f"       {self.format_currency(gross):>12} "
-                f"               {self.format_currency(adjusted):>12}"
-            )
-
-        print(
-            f"\n                           Total Future Value        {self.format_currency(total_future_value)}\n"
-        )
+        exhibit = compute_pre_post_exhibit(rows, aif)
+        print(render_pre_post_table(exhibit_num, exhibit, growth_rate, table_type))
 
     def print_health_insurance_table(
         self,
@@ -382,62 +609,15 @@ class EconomicAnalysis:
         discount_rate: float,
     ):
         """
-        Print Health Insurance table with columns:
-        (1) Year
-        (2) Portion of Year (as percentage)
-        (3) Health Insurance @ X% (premium grown by growth_rate)
-        (4) Yearly Value = (2) × (3)
-        (5) Present Value = (4) / (1 + discount_rate)^year_index
-
-        Shows both Total Future Value (sum of Column 4) and
-        Total Present Value (sum of Column 5).
+        Print Health Insurance table; see ``render_health_insurance_table``.
 
         Args:
             hi_data: List of HealthInsuranceRow objects
             growth_rate: Annual growth rate for premiums (e.g., 0.07 for 7%)
             discount_rate: Annual discount rate (e.g., 0.03 for 3%)
         """
-        growth_rate_pct = growth_rate * 100
-        discount_rate_pct = discount_rate * 100
-
-        print(f"\nExhibit 3")
-        print(f"Health Insurance @ {growth_rate_pct:.2f}% Growth")
-        print(f"Discount Rate: {discount_rate_pct:.2f}%\n")
-
-        header = (
-            "   (1) Year   (2) Portion of Year   "
-            f"(3) Health Ins @ {growth_rate_pct:.2f}%   "
-            "(4) Yearly Value [(2) x (3)]   "
-            f"(5) Present Value [@ {discount_rate_pct:.2f}%]"
-        )
-        print(header)
-        print("-" * 120)
-
-        total_future_value = 0.0
-        total_present_value = 0.0
-
-        for row in hi_data:
-            yearly_value = row.portion_of_year * row.premium
-            discount_factor = 1.0 / ((1 + discount_rate) ** row.year_index)
-            present_value = yearly_value * discount_factor
-
-            total_future_value += yearly_value
-            total_present_value += present_value
-
-            print(
-                f"{row.year:>10} "
-                f" {row.portion_of_year * 100:6.2f}% "
-                f"      {self.format_currency(row.premium):>12} "
-                f"             {self.format_currency(yearly_value):>12} "
-                f"                     {self.format_currency(present_value):>12}"
-            )
-
-        print(
-            f"\n                          Total Future Value       {self.format_currency(total_future_value)}"
-        )
-        print(
-            f"                          Total Present Value      {self.format_currency(total_present_value)}\n"
-        )
+        exhibit = compute_health_insurance_exhibit(hi_data, discount_rate)
+        print(render_health_insurance_table(exhibit, growth_rate))
 
     def run(self):
         """
@@ -491,40 +671,7 @@ class EconomicAnalysis:
             )
 
             # Generate Health Insurance rows
-            # Use statistical parameters to adjust end dates if needed
-            adjusted_end_year = min(
-                self.user_data["hi_end_year"],
-                self.user_data["hi_start_year"]
-                + int(self.user_data["worklife_expectancy"]),
-                self.user_data["hi_start_year"]
-                + int(self.user_data["years_to_final_separation"]),
-            )
-
-            health_rows = []
-            for y in range(self.user_data["hi_start_year"], adjusted_end_year + 1):
-                year_index = y - self.user_data["hi_start_year"]
-
-                # Calculate grown premium with compound growth
-                grown_premium = self.user_data["hi_base_premium"] * (
-                    (1 + self.user_data["hi_growth_rate"]) ** year_index
-                )
-
-                # Determine portion of year
-                # Last year might be partial based on retirement/separation
-                if y == adjusted_end_year:
-                    # Use the fractional part of the final year if it exists
-                    final_year_fraction = (
-                        self.user_data["worklife_expectancy"] % 1
-                        or self.user_data["years_to_final_separation"] % 1
-                        or 0.47  # default if no fractional part exists
-                    )
-                    portion = final_year_fraction
-                else:
-                    portion = 1.0
-
-                health_rows.append(
-                    HealthInsuranceRow(y, portion, grown_premium, year_index)
-                )
+            health_rows = build_health_insurance_rows(self.user_data)
 
             # Print Health Insurance table (Exhibit 3)
             print("\n=== Health Insurance Analysis ===")
@@ -542,6 +689,192 @@ class EconomicAnalysis:
             sys.exit(1)
 
 
+# Batch mode
+#
+# Cases are read from a JSON-lines file (one object per line) or a CSV file
+# (one case per line). Every parameter defaults to the interactive prompt's
+# default. Table rows are lists of [year, portion_of_year, age,
+# wage_base_years] or objects with those keys; in CSV they are JSON strings
+# in the pre_table_rows and post_table_rows columns.
+
+CASE_DEFAULTS: Dict[str, Any] = {
+    "pre_growth_rate": 0.04,
+    "pre_aif": 0.754,
+    "post_growth_rate": 0.042,
+    "post_aif": 0.75,
+    "hi_start_year": 2024,
+    "hi_end_year": 2044,
+    "hi_base_premium": 7001.05,
+    "hi_growth_rate": 0.07,
+    "hi_discount_rate": 0.03,
+    "worklife_expectancy": 15.5,
+    "years_to_final_separation": 10.0,
+    "life_expectancy": 78.3,
+    "statistical_death": 80.0,
+    "statistical_retirement": 65.0,
+    "statistical_separation": 10.0,
+}
+ROW_FIELDS = ("year", "portion_of_year", "age", "wage_base_years")
+TOTAL_FIELDS = (
+    "pre_injury_total_future_value",
+    "post_injury_total_future_value",
+    "health_insurance_total_future_value",
+    "health_insurance_total_present_value",
+)
+
+
+def parse_table_rows(value: Any) -> List[PrePostRow]:
+    """Build ``PrePostRow`` objects from a list (or JSON string) of rows"""
+    if isinstance(value, str):
+        value = json.loads(value) if value.strip() else []
+    rows = []
+    for row in value or []:
+        if isinstance(row, dict):
+            row = [row[field] for field in ROW_FIELDS]
+        year, portion, age, wage_base = row
+        rows.append(PrePostRow(int(year), float(portion), float(age), float(wage_base)))
+    return rows
+
+
+def parse_case(record: Dict[str, Any]) -> Dict[str, Any]:
+    """The ``get_user_inputs`` dictionary for one batch record"""
+    case = {}
+    for key, default in CASE_DEFAULTS.items():
+        value = record.get(key)
+        case[key] = default if value in (None, "") else type(default)(value)
+    case["pre_table_rows"] = parse_table_rows(record.get("pre_table_rows"))
+    case["post_table_rows"] = parse_table_rows(record.get("post_table_rows"))
+    return case
+
+
+def read_cases(path: str, input_format: str):
+    """Yield ``(case_id, record)`` for each case in a CSV or JSON-lines file"""
+    with open(path, newline="") as f:
+        if input_format == "csv":
+            records = csv.DictReader(f)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        for number, record in enumerate(records, 1):
+            yield record.get("case_id") or str(number), record
+
+
+def run_case(item) -> Dict[str, Any]:
+    """Compute one case; errors are reported in the result, not raised"""
+    case_id, record = item
+    try:
+        exhibits = compute_exhibits(parse_case(record))
+    except Exception as e:
+        return {"case_id": case_id, "error": str(e)}
+    return {"case_id": case_id, "exhibits": exhibits.as_dict()}
+
+
+def case_totals(result: Dict[str, Any]) -> Dict[str, Any]:
+    """One flat output line: the case id, the exhibit totals and any error"""
+    line = {"case_id": result["case_id"], "error": result.get("error", "")}
+    exhibits = result.get("exhibits")
+    if exhibits:
+        line["pre_injury_total_future_value"] = exhibits["pre_injury"]["total_future_value"]
+        line["post_injury_total_future_value"] = exhibits["post_injury"]["total_future_value"]
+        line["health_insurance_total_future_value"] = exhibits["health_insurance"]["total_future_value"]
+        line["health_insurance_total_present_value"] = exhibits["health_insurance"]["total_present_value"]
+    return line
+
+
+def _run_chunk(chunk) -> List[Dict[str, Any]]:
+    return [run_case(item) for item in chunk]
+
+
+def _pooled_results(cases, processes: int, chunksize: int = 64):
+    """
+    ``run_case`` over a process pool, in input order.
+
+    Cases are read and submitted a chunk at a time, and at most
+    ``2 * processes`` chunks are in flight or waiting to be written, so
+    memory stays bounded however long the input is.
+    """
+    cases = iter(cases)
+    chunks = iter(lambda: list(islice(cases, chunksize)), [])
+    with ProcessPoolExecutor(processes) as executor:
+        pending = deque(executor.submit(_run_chunk, chunk) for chunk in islice(chunks, 2 * processes))
+        while pending:
+            results = pending.popleft().result()
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(_run_chunk, chunk))
+            yield from results
+
+
+def run_batch(cases, output, output_format: str, processes: int = 0) -> Dict[str, int]:
+    """
+    Compute every case and stream one result per line to ``output``.
+
+    ``processes=0`` computes cases in this process; otherwise they are
+    spread over a process pool. Results keep the input order either way.
+    JSON-lines output carries every exhibit row; CSV output has the totals.
+    """
+    if output_format == "csv":
+        writer = csv.DictWriter(output, fieldnames=["case_id", *TOTAL_FIELDS, "error"])
+        writer.writeheader()
+
+        def write(result):
+            writer.writerow(case_totals(result))
+    else:
+
+        def write(result):
+            output.write(json.dumps(result) + "\n")
+
+    counts = {"cases": 0, "failed": 0}
+    if processes == 0:
+        results = map(run_case, cases)
+    else:
+        results = _pooled_results(cases, processes)
+    for result in results:
+        counts["cases"] += 1
+        counts["failed"] += "error" in result
+        write(result)
+    return counts
+
+
+def _file_format(path: str, default: str) -> str:
+    return "csv" if path and path.lower().endswith(".csv") else default
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Economic analysis exhibits; interactive unless --batch is given"
+    )
+    parser.add_argument("--batch", metavar="FILE", help="CSV or JSON-lines file of cases")
+    parser.add_argument("--output", metavar="FILE", help="Results file (default: stdout)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Output format")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=os.cpu_count(),
+        help="Worker processes for batch mode; 0 computes in this process",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.batch:
+        EconomicAnalysis().run()
+        return
+
+    input_format = args.input_format or _file_format(args.batch, "jsonl")
+    output_format = args.format or _file_format(args.output, "jsonl")
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        counts = run_batch(
+            read_cases(args.batch, input_format), output, output_format, args.processes
+        )
+    finally:
+        if args.output:
+            output.close()
+    print(
+        f"Processed {counts['cases']} cases ({counts['failed']} failed)",
+        file=sys.stderr,
+    )
+    if counts["failed"]:
+        sys.exit(1)
+
+
 if __name__ == "__main__":
-    analysis = EconomicAnalysis()
-    analysis.run()
+    main()